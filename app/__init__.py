@@ -1,31 +1,89 @@
 """Flask application factory."""
 
+import atexit
+
 from dotenv import load_dotenv
 from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
 
 from app.application.controllers.admin_controller import admin_bp
 from app.application.controllers.favorites_controller import favorites_bp
 from app.application.controllers.home_controller import create_home_blueprint
-from app.application.controllers.movie_controller import create_movie_blueprint
-from app.application.controllers.user_favorites_controller import user_favorites_bp
+from app.application.controllers.movie_controller import (
+    create_async_movie_blueprint,
+    create_movie_blueprint,
+)
+from app.application.controllers.user_favorites_controller import (
+    use_async_views,
+    user_favorites_bp,
+)
+from app.application.services.catalog_service import CatalogService
+from app.application.services.favorites_service import FavoritesService
 from app.application.services.movie_service import MovieService
+from app.infrastructure.api.async_tmdb_client import AsyncTMDBClient
+from app.infrastructure.api.cache_headers import register_cache_headers
+from app.infrastructure.api.circuit_breaker import create_breakers
+from app.infrastructure.api.compression import ResponseCompressor, register_compression
 from app.infrastructure.api.error_handlers import register_error_handlers
+from app.infrastructure.api.json_provider import FastJSONProvider
+from app.infrastructure.api.rate_limiter import create_rate_limiter
+from app.infrastructure.api.retry_policy import RetryBudget, RetryPolicy
+from app.infrastructure.api.tmdb_client import TMDBClient
+from app.infrastructure.cache.cache_warmer import CacheWarmer, create_lease
+from app.infrastructure.cache.memory_cache import MemoryCache
+from app.infrastructure.cache.negative_cache import NegativeCache
+from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.catalog.in_memory_catalog import InMemoryMovieCatalog
+from app.infrastructure.catalog.mapped_catalog import MappedMovieCatalog
+from app.infrastructure.database import db, init_db_command
+from app.infrastructure.metrics import MetricsRegistry
+from app.infrastructure.repositories.async_tmdb_repository import AsyncTMDBRepository
+from app.infrastructure.repositories.cached_movie_repository import (
+    CachedMovieRepository,
+)
+from app.infrastructure.repositories.catalog_movie_repository import (
+    CatalogMovieRepository,
+)
+from app.infrastructure.repositories.sqlalchemy_favorites_repository import (
+    SQLAlchemyFavoritesRepository,
+)
 from app.infrastructure.repositories.tmdb_repository import TMDBRepository
 
 load_dotenv()
 
-db = SQLAlchemy()
-
 
 def create_app():
     """Create and configure the app."""
     app = Flask(__name__)
     app.config.from_object("app.config.Config")
+    app.json = FastJSONProvider(app, use_orjson=app.config["JSON_ENCODER"] == "orjson")
 
     db.init_app(app)
 
+    app.cli.add_command(init_db_command)
+
+    # Favorites are kept in process memory unless the database store is selected;
+    # its tables are created by ``flask init-db``
+    app.favorites_repository = None
+    if app.config["FAVORITES_STORE"] == "database":
+        app.favorites_repository = SQLAlchemyFavoritesRepository()
+
+    metrics = MetricsRegistry()
+    app.extensions["metrics"] = metrics
+
     register_error_handlers(app)
+    # Registered first so it runs last, after ETags and 304s are settled
+    compressor = ResponseCompressor(
+        min_size=app.config["COMPRESSION_MIN_SIZE"],
+        gzip_level=app.config["COMPRESSION_GZIP_LEVEL"],
+        brotli_quality=app.config["COMPRESSION_BROTLI_QUALITY"],
+        cache=MemoryCache(max_entries=app.config["COMPRESSION_CACHE_MAX_ENTRIES"]),
+    )
+    register_compression(app, compressor)
+    metrics.register("compression", compressor.stats)
+    metrics.register("favorites_snapshots", FavoritesService.snapshot_stats)
+    # Finish queued snapshot captures and stop the favorites thread pools on shutdown
+    atexit.register(FavoritesService.shutdown)
+    register_cache_headers(app)
 
     # Register blueprints
     app.register_blueprint(create_home_blueprint())
@@ -34,8 +92,139 @@ def create_app():
     app.register_blueprint(user_favorites_bp)
 
     # Create and register movie service
-    movie_repository = TMDBRepository()
-    app.movie_service = MovieService(movie_repository=movie_repository)
-    app.register_blueprint(create_movie_blueprint(), url_prefix="/api/movies")
+    retry_policy = RetryPolicy(
+        max_attempts=app.config["TMDB_RETRY_MAX_ATTEMPTS"],
+        base_delay=app.config["TMDB_RETRY_BASE_DELAY_SECONDS"],
+        max_delay=app.config["TMDB_RETRY_MAX_DELAY_SECONDS"],
+        deadline=app.config["TMDB_REQUEST_DEADLINE_SECONDS"],
+        budget=RetryBudget(
+            ratio=app.config["TMDB_RETRY_BUDGET_RATIO"],
+            min_retries_per_second=app.config["TMDB_RETRY_BUDGET_MIN_PER_SECOND"],
+        ),
+    )
+    circuit_breakers = create_breakers(
+        failure_threshold=app.config["TMDB_CIRCUIT_FAILURE_THRESHOLD"],
+        recovery_timeout=app.config["TMDB_CIRCUIT_RECOVERY_SECONDS"],
+    )
+    rate_limiter = create_rate_limiter(
+        app.config["TMDB_RATE_LIMIT_PER_SECOND"],
+        capacity=app.config["TMDB_RATE_LIMIT_BURST"],
+        shared=app.config["TMDB_RATE_LIMIT_SHARED"],
+        redis_url=app.config["REDIS_URL"],
+        path=app.config["TMDB_RATE_LIMIT_FILE"],
+        socket_timeout=app.config["REDIS_SOCKET_TIMEOUT"],
+    )
+    use_async = app.config["TMDB_CLIENT"] == "async"
+    if use_async:
+        tmdb_client = AsyncTMDBClient(
+            api_key=app.config["TMDB_API_KEY"],
+            pool_maxsize=app.config["TMDB_ASYNC_POOL_MAXSIZE"],
+            retry_policy=retry_policy,
+            circuit_breakers=circuit_breakers,
+            rate_limiter=rate_limiter,
+            rate_limit_max_wait=app.config["TMDB_RATE_LIMIT_MAX_WAIT_SECONDS"],
+        )
+        tmdb_repository = AsyncTMDBRepository(client=tmdb_client)
+    else:
+        tmdb_client = TMDBClient(
+            api_key=app.config["TMDB_API_KEY"],
+            pool_connections=app.config["TMDB_POOL_CONNECTIONS"],
+            pool_maxsize=app.config["TMDB_POOL_MAXSIZE"],
+            pool_block=app.config["TMDB_POOL_BLOCK"],
+            retry_policy=retry_policy,
+            circuit_breakers=circuit_breakers,
+            rate_limiter=rate_limiter,
+            rate_limit_max_wait=app.config["TMDB_RATE_LIMIT_MAX_WAIT_SECONDS"],
+            max_retry_sleep=app.config["TMDB_SYNC_MAX_RETRY_SLEEP_SECONDS"],
+        )
+        tmdb_repository = TMDBRepository(
+            client=tmdb_client, batch_concurrency=app.config["TMDB_BATCH_CONCURRENCY"]
+        )
+    app.extensions["tmdb_client"] = tmdb_client
+    metrics.register("tmdb_client", tmdb_client.stats)
+    # Release pooled upstream connections when the process shuts down
+    atexit.register(tmdb_client.close)
+
+    movie_repository = CachedMovieRepository(
+        tmdb_repository,
+        local_cache=MemoryCache(max_entries=app.config["CACHE_LOCAL_MAX_ENTRIES"]),
+        remote_cache=RedisCache.from_url(
+            app.config["REDIS_URL"], socket_timeout=app.config["REDIS_SOCKET_TIMEOUT"]
+        ),
+        ttls={
+            CachedMovieRepository.POPULAR: app.config["CACHE_POPULAR_TTL_SECONDS"],
+            CachedMovieRepository.DETAILS: app.config["CACHE_DETAILS_TTL_SECONDS"],
+        },
+        default_ttl=app.config["CACHE_DURATION_SECONDS"],
+        hard_ttl=app.config["CACHE_HARD_TTL_SECONDS"],
+        prefetch_next_page=app.config["CACHE_PREFETCH_NEXT_PAGE"],
+        negative_cache=(
+            NegativeCache(
+                max_entries=app.config["NEGATIVE_CACHE_MAX_ENTRIES"],
+                ttl=app.config["NEGATIVE_CACHE_TTL_SECONDS"],
+                bloom=app.config["NEGATIVE_CACHE_BLOOM"],
+            )
+            if app.config["NEGATIVE_CACHE_TTL_SECONDS"] > 0
+            else None
+        ),
+    )
+    metrics.register("movie_cache", movie_repository.stats)
+    if app.config["CACHE_WARMER_PAGES"] > 0:
+        interval = app.config["CACHE_WARMER_INTERVAL_SECONDS"]
+        warmer = CacheWarmer(
+            movie_repository,
+            pages=app.config["CACHE_WARMER_PAGES"],
+            interval=interval,
+            lead=app.config["CACHE_WARMER_LEAD_SECONDS"],
+            concurrency=app.config["CACHE_WARMER_CONCURRENCY"],
+            lease=create_lease(
+                app.config["CACHE_WARMER_LEADER"],
+                path=app.config["CACHE_WARMER_LOCK_FILE"],
+                redis_url=app.config["REDIS_URL"],
+                ttl=interval * 3,
+                socket_timeout=app.config["REDIS_SOCKET_TIMEOUT"],
+            ),
+        )
+        app.extensions["cache_warmer"] = warmer
+        metrics.register("cache_warmer", warmer.stats)
+        warmer.start()
+        atexit.register(warmer.stop)
+    catalog_options = {
+        "pages": app.config["CATALOG_PAGES"],
+        "interval": app.config["CATALOG_REFRESH_SECONDS"],
+        "load_timeout": app.config["CATALOG_LOAD_TIMEOUT_SECONDS"],
+    }
+    service_repository = movie_repository
+    if app.config["CATALOG_FILE"]:
+        # One worker per host writes the file; every worker maps it and reads movie details from it
+        catalog = MappedMovieCatalog(
+            movie_repository,
+            app.config["CATALOG_FILE"],
+            lease=create_lease("file", path=f"{app.config['CATALOG_FILE']}.lock"),
+            **catalog_options,
+        )
+        catalog.start()
+        service_repository = CatalogMovieRepository(
+            movie_repository, catalog, max_age=app.config["CATALOG_DETAILS_MAX_AGE_SECONDS"]
+        )
+        metrics.register("catalog_details", service_repository.stats)
+    else:
+        # Built from the cached popular pages on the first search, then rebuilt in the background
+        catalog = InMemoryMovieCatalog(movie_repository, **catalog_options)
+    app.extensions["movie_catalog"] = catalog
+    metrics.register("movie_catalog", catalog.stats)
+    atexit.register(catalog.stop)
+    app.catalog_service = CatalogService(catalog)
+
+    app.movie_service = MovieService(
+        movie_repository=service_repository,
+        projection_cache=MemoryCache(max_entries=app.config["CACHE_PROJECTION_MAX_ENTRIES"]),
+    )
+    metrics.register("movie_projections", app.movie_service.projection_stats)
+    if use_async:
+        app.register_blueprint(create_async_movie_blueprint(), url_prefix="/api/movies")
+        use_async_views(app)
+    else:
+        app.register_blueprint(create_movie_blueprint(), url_prefix="/api/movies")
 
     return app
@@ -1,6 +1,6 @@
 from http import HTTPStatus
 
-from flask import Blueprint
+from flask import Blueprint, current_app, jsonify
 
 from ..services.favorites_service import FavoritesService
 
@@ -12,3 +12,9 @@ def delete_user_favorites(user_id: int):
     """Delete all favorites for a specific user."""
     FavoritesService.remove_all_user_favorites(user_id)
     return "", HTTPStatus.NO_CONTENT
+
+
+@admin_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Get runtime metrics for caches and upstream clients."""
+    return jsonify(current_app.extensions["metrics"].snapshot()), HTTPStatus.OK
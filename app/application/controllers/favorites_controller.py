@@ -57,14 +57,13 @@ def add_favorite():
 @favorites_bp.route("/favorites/<int:id>", methods=["DELETE"])
 def remove_favorite(id: int):
     """Remove a movie from favorites"""
-    favorites = FavoritesService.get_favorites()
-    if id <= 0 or id > len(favorites):
+    movie_id = FavoritesService.get_favorite_at(id)
+    if movie_id is None:
         return (
             jsonify({"error": {"code": "NOT_FOUND", "message": "Favorite not found"}}),
             HTTPStatus.NOT_FOUND,
         )
 
-    movie_id = list(favorites)[id - 1]  # Convert to list to get by index
     if FavoritesService.remove_favorite(movie_id):
         return "", HTTPStatus.NO_CONTENT
 
@@ -1,35 +1,259 @@
 """Movie endpoints controller."""
 
+from datetime import date
+
 from flask import Blueprint, current_app, jsonify, request
 
-from app.domain.exceptions import TMDBError
+from app.application.services.movie_service import MovieService
+from app.domain.entities.raw_json import embed_raw
+from app.domain.exceptions import (
+    CatalogUnavailableError,
+    InvalidFieldsError,
+    MovieAPIConnectionError,
+    TMDBError,
+)
+from app.domain.ports.movie_catalog import MovieCatalog
+
+MAX_BATCH_IDS = 50
+MAX_CATALOG_LIMIT = 100
+
+
+def _parse_movie_ids():
+    """Parse and validate the ``ids`` query parameter.
+
+    Returns:
+        Tuple of the de-duplicated movie IDs and an error response, one of which is None
+    """
+    try:
+        movie_ids = [int(movie_id) for movie_id in request.args.get("ids", "").split(",") if movie_id.strip()]
+    except ValueError:
+        return None, (jsonify({"error": "Invalid movie ids"}), 400)
+    movie_ids = list(dict.fromkeys(movie_ids))
+    if not movie_ids:
+        return None, (jsonify({"error": "ids is required"}), 400)
+    if any(movie_id < 1 for movie_id in movie_ids):
+        return None, (jsonify({"error": "Movie ids must be positive"}), 400)
+    if len(movie_ids) > MAX_BATCH_IDS:
+        return None, (jsonify({"error": f"At most {MAX_BATCH_IDS} ids can be requested"}), 400)
+    return movie_ids, None
+
+
+def _parse_page():
+    """Parse and validate the ``page`` query parameter.
+
+    Returns:
+        Tuple of the page number and an error response, one of which is None
+    """
+    try:
+        page = int(request.args.get("page", 1))
+    except ValueError:
+        return None, (jsonify({"error": "Invalid page number"}), 400)
+    if page < 1:
+        return None, (jsonify({"error": "Page number must be positive"}), 400)
+    return page, None
+
+
+def _parse_fields():
+    """Parse and validate the ``fields`` query parameter.
+
+    Returns:
+        Tuple of the selected fields (None for all of them) and an error response, one of which is None
+    """
+    try:
+        return MovieService.parse_fields(request.args.get("fields")), None
+    except InvalidFieldsError as e:
+        return None, (jsonify({"error": str(e)}), 400)
+
+
+def _parse_window():
+    """Parse and validate the ``limit`` and ``offset`` query parameters.
+
+    Returns:
+        Tuple of the (limit, offset) pair and an error response, one of which is None
+    """
+    try:
+        limit = int(request.args.get("limit", 20))
+        offset = int(request.args.get("offset", 0))
+    except ValueError:
+        return None, (jsonify({"error": "Invalid limit or offset"}), 400)
+    if not 1 <= limit <= MAX_CATALOG_LIMIT:
+        return None, (jsonify({"error": f"limit must be between 1 and {MAX_CATALOG_LIMIT}"}), 400)
+    if offset < 0:
+        return None, (jsonify({"error": "offset must not be negative"}), 400)
+    return (limit, offset), None
+
+
+def _parse_discover_filters():
+    """Parse and validate the sort order and filters of ``/discover``.
+
+    Returns:
+        Tuple of the keyword arguments for ``discover_movies`` and an error response, one of which is None
+    """
+    sort = request.args.get("sort", "popularity")
+    if sort not in MovieCatalog.SORT_KEYS:
+        return None, (jsonify({"error": f"sort must be one of: {', '.join(MovieCatalog.SORT_KEYS)}"}), 400)
+    order = request.args.get("order", "desc")
+    if order not in ("asc", "desc"):
+        return None, (jsonify({"error": "order must be asc or desc"}), 400)
+    filters = {"sort": sort, "descending": order == "desc"}
+    try:
+        if "min_vote_average" in request.args:
+            filters["min_vote_average"] = float(request.args["min_vote_average"])
+        if "genre" in request.args:
+            filters["genre_id"] = int(request.args["genre"])
+    except ValueError:
+        return None, (jsonify({"error": "Invalid min_vote_average or genre"}), 400)
+    for name in ("released_from", "released_to"):
+        if name in request.args:
+            try:
+                filters[name] = date.fromisoformat(request.args[name]).isoformat()
+            except ValueError:
+                return None, (jsonify({"error": f"{name} must be a date (YYYY-MM-DD)"}), 400)
+    return filters, None
+
+
+def _not_modified():
+    """Return a 304 response if the client's copy of the data loaded so far is current, else None.
+
+    The check is registered by the app factory along with the cache headers;
+    without it every response is built in full.
+    """
+    check = current_app.extensions.get("not_modified")
+    return check() if check is not None else None
+
+
+def _batch_response(movie_ids, movies):
+    """Build the batch response with found movies in request order.
+
+    IDs whose lookup failed are listed under ``failed``, apart from those
+    TheMovieDB does not know, so clients can retry just them. Movies given as
+    encoded JSON are embedded as they are.
+    """
+    failed = set(getattr(movies, "failed", ()))
+    return _not_modified() or jsonify(
+        {
+            "movies": [embed_raw(movies[movie_id]) for movie_id in movie_ids if movie_id in movies],
+            "not_found": [
+                movie_id for movie_id in movie_ids if movie_id not in movies and movie_id not in failed
+            ],
+            "failed": [movie_id for movie_id in movie_ids if movie_id in failed],
+        }
+    )
+
+
+def _passthrough() -> bool:
+    """Whether movie details are served as the encoded JSON held by the cache."""
+    return current_app.config.get("MOVIE_DETAILS_PASSTHROUGH", False)
+
+
+def _details_response(movie):
+    """Build the movie details response; encoded JSON bytes are sent as they are."""
+    if movie is None:
+        return jsonify({"error": "Movie not found"}), 404
+    if isinstance(movie, bytes):
+        return _not_modified() or current_app.response_class(movie, mimetype="application/json")
+    return _not_modified() or jsonify(movie)
+
+
+def _error_response(error: Exception, action: str):
+    """Map an exception raised while ``action`` to an error response."""
+    if isinstance(error, MovieAPIConnectionError):
+        current_app.logger.error(f"TheMovieDB unavailable {action}: {str(error)}")
+        return jsonify({"error": "Movie service unavailable"}), 503
+    if isinstance(error, TMDBError):
+        current_app.logger.error(f"Error {action}: {str(error)}")
+        return jsonify({"error": str(error)}), 500
+    current_app.logger.error(f"Unexpected error {action}: {str(error)}")
+    return jsonify({"error": "Internal server error"}), 500
+
+
+def _catalog_error_response(error: Exception, action: str):
+    """Map an exception raised while ``action`` on the catalog to an error response."""
+    if isinstance(error, CatalogUnavailableError):
+        current_app.logger.warning(f"Movie catalog unavailable {action}: {str(error)}")
+        return jsonify({"error": "Movie catalog is loading, try again shortly"}), 503
+    return _error_response(error, action)
+
+
+def _register_catalog_routes(blueprint: Blueprint):
+    """Add the catalog routes, which answer from process memory, so both blueprints share sync views."""
+
+    @blueprint.route("/search", methods=["GET"])
+    def search_movies():
+        """Search popular movies by title and overview, e.g. ``/api/movies/search?q=dark+kni``."""
+        query = request.args.get("q", "").strip()
+        if not query:
+            return jsonify({"error": "q is required"}), 400
+        window, error = _parse_window()
+        if error:
+            return error
+
+        try:
+            limit, offset = window
+            movies = current_app.catalog_service.search_movies(query, limit=limit, offset=offset)
+            return jsonify(movies)
+        except Exception as e:
+            return _catalog_error_response(e, "searching movies")
+
+    @blueprint.route("/discover", methods=["GET"])
+    def discover_movies():
+        """List popular movies matching filters, e.g. ``/api/movies/discover?sort=vote_average&genre=28``."""
+        window, error = _parse_window()
+        if error:
+            return error
+        filters, error = _parse_discover_filters()
+        if error:
+            return error
+
+        try:
+            limit, offset = window
+            movies = current_app.catalog_service.discover_movies(limit=limit, offset=offset, **filters)
+            return jsonify(movies)
+        except Exception as e:
+            return _catalog_error_response(e, "discovering movies")
 
 
 def create_movie_blueprint():
     """Create blueprint for movie endpoints."""
     blueprint = Blueprint("movies", __name__)
 
+    @blueprint.route("", methods=["GET"])
+    def get_movies():
+        """Get details for several movies, e.g. ``/api/movies?ids=1,2,3``.
+
+        Returns:
+            JSON response with the found movies in request order and the IDs that were not found
+        """
+        movie_ids, error = _parse_movie_ids()
+        if error:
+            return error
+
+        try:
+            movie_service = current_app.movie_service
+            if _passthrough():
+                movies = movie_service.get_movie_details_raw_many(movie_ids)
+            else:
+                movies = movie_service.get_movie_details_many(movie_ids)
+            return _batch_response(movie_ids, movies)
+        except Exception as e:
+            return _error_response(e, "getting movies")
+
     @blueprint.route("/popular", methods=["GET"])
     def get_popular_movies():
-        """Get popular movies with pagination."""
+        """Get popular movies with pagination, optionally trimmed to ``fields``."""
         try:
-            page = request.args.get("page", 1)
-            try:
-                page = int(page)
-                if page < 1:
-                    return jsonify({"error": "Page number must be positive"}), 400
-            except ValueError:
-                return jsonify({"error": "Invalid page number"}), 400
+            page, error = _parse_page()
+            if error:
+                return error
+            fields, error = _parse_fields()
+            if error:
+                return error
 
             movie_service = current_app.movie_service
-            movies = movie_service.get_popular_movies(page=page)
-            return jsonify(movies)
-        except TMDBError as e:
-            current_app.logger.error(f"Error getting popular movies: {str(e)}")
-            return jsonify({"error": str(e)}), 500
+            movies = movie_service.get_popular_movies(page=page, fields=fields)
+            return _not_modified() or jsonify(movies)
         except Exception as e:
-            current_app.logger.error(f"Unexpected error getting popular movies: {str(e)}")
-            return jsonify({"error": "Internal server error"}), 500
+            return _error_response(e, "getting popular movies")
 
     @blueprint.route("/<int:movie_id>", methods=["GET"])
     def get_movie_details(movie_id: int):
@@ -39,19 +263,83 @@ def create_movie_blueprint():
             movie_id: The ID of the movie to retrieve
 
         Returns:
-            JSON response with movie details
+            JSON response with movie details, trimmed to ``fields`` if given
         """
+        fields, error = _parse_fields()
+        if error:
+            return error
+
         try:
             movie_service = current_app.movie_service
-            movie = movie_service.get_movie_details(movie_id=movie_id)
-            if movie is None:
-                return jsonify({"error": "Movie not found"}), 404
-            return jsonify(movie)
-        except TMDBError as e:
-            current_app.logger.error(f"Error getting movie details: {str(e)}")
-            return jsonify({"error": str(e)}), 500
+            if fields is None and _passthrough():
+                movie = movie_service.get_movie_details_raw(movie_id=movie_id)
+            else:
+                movie = movie_service.get_movie_details(movie_id=movie_id, fields=fields)
+            return _details_response(movie)
+        except Exception as e:
+            return _error_response(e, "getting movie details")
+
+    _register_catalog_routes(blueprint)
+    return blueprint
+
+
+def create_async_movie_blueprint():
+    """Create blueprint for movie endpoints served by async views.
+
+    The routes and responses match ``create_movie_blueprint``, but upstream
+    lookups are awaited, so batch requests fan out over the event loop.
+    """
+    blueprint = Blueprint("movies", __name__)
+
+    @blueprint.route("", methods=["GET"])
+    async def get_movies():
+        """Get details for several movies, e.g. ``/api/movies?ids=1,2,3``."""
+        movie_ids, error = _parse_movie_ids()
+        if error:
+            return error
+
+        try:
+            movie_service = current_app.movie_service
+            if _passthrough():
+                movies = await movie_service.get_movie_details_raw_many_async(movie_ids)
+            else:
+                movies = await movie_service.get_movie_details_many_async(movie_ids)
+            return _batch_response(movie_ids, movies)
+        except Exception as e:
+            return _error_response(e, "getting movies")
+
+    @blueprint.route("/popular", methods=["GET"])
+    async def get_popular_movies():
+        """Get popular movies with pagination, optionally trimmed to ``fields``."""
+        page, error = _parse_page()
+        if error:
+            return error
+        fields, error = _parse_fields()
+        if error:
+            return error
+
+        try:
+            movies = await current_app.movie_service.get_popular_movies_async(page=page, fields=fields)
+            return _not_modified() or jsonify(movies)
+        except Exception as e:
+            return _error_response(e, "getting popular movies")
+
+    @blueprint.route("/<int:movie_id>", methods=["GET"])
+    async def get_movie_details(movie_id: int):
+        """Get detailed information for a specific movie, optionally trimmed to ``fields``."""
+        fields, error = _parse_fields()
+        if error:
+            return error
+
+        movie_service = current_app.movie_service
+        try:
+            if fields is None and _passthrough():
+                movie = await movie_service.get_movie_details_raw_async(movie_id=movie_id)
+            else:
+                movie = await movie_service.get_movie_details_async(movie_id=movie_id, fields=fields)
         except Exception as e:
-            current_app.logger.error(f"Unexpected error getting movie details: {str(e)}")
-            return jsonify({"error": "Internal server error"}), 500
+            return _error_response(e, "getting movie details")
+        return _details_response(movie)
 
+    _register_catalog_routes(blueprint)
     return blueprint
@@ -2,10 +2,16 @@ from http import HTTPStatus
 
 from flask import Blueprint, current_app, g, jsonify, request
 
+from app.domain.exceptions import InvalidCursorError, InvalidFieldsError
+
 from ..services.favorites_service import FavoritesService
+from ..services.movie_service import MovieService
 
 user_favorites_bp = Blueprint("user_favorites", __name__, url_prefix="/api")
 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
 _service_initialized = False
 
 
@@ -14,27 +20,105 @@ def initialize_service():
     """Initialize FavoritesService with MovieService dependency"""
     global _service_initialized
     if not _service_initialized and not hasattr(g, "favorites_service_initialized"):
-        FavoritesService.initialize(current_app.movie_service)
+        FavoritesService.initialize(
+            current_app.movie_service,
+            repository=current_app.favorites_repository,
+            pool_size=current_app.config["FAVORITES_FANOUT_POOL_SIZE"],
+            max_concurrency=current_app.config["FAVORITES_FANOUT_CONCURRENCY"],
+            deadline=current_app.config["FAVORITES_FANOUT_DEADLINE_SECONDS"],
+            snapshot_max_age=current_app.config["FAVORITES_SNAPSHOT_MAX_AGE_SECONDS"],
+            # Background snapshot refreshes may write to the database
+            snapshot_context=current_app._get_current_object().app_context,
+            passthrough=current_app.config.get("MOVIE_DETAILS_PASSTHROUGH", False),
+        )
         g.favorites_service_initialized = True
         _service_initialized = True
 
 
+def _parse_page_size():
+    """Return the requested page size, None for an unpaginated request, or an error response"""
+    if "limit" not in request.args and "cursor" not in request.args:
+        return None, None
+    limit = request.args.get("limit", str(DEFAULT_PAGE_SIZE))
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+        return None, (
+            jsonify(
+                {
+                    "error": {
+                        "code": "INVALID_REQUEST",
+                        "message": f"limit must be an integer between 1 and {MAX_PAGE_SIZE}",
+                    }
+                }
+            ),
+            HTTPStatus.BAD_REQUEST,
+        )
+    return int(limit), None
+
+
+def _favorites_error_response(error: Exception):
+    """Map an exception raised while listing favorites to an error response"""
+    if isinstance(error, (InvalidCursorError, InvalidFieldsError)):
+        return jsonify({"error": {"code": "INVALID_REQUEST", "message": str(error)}}), HTTPStatus.BAD_REQUEST
+    if isinstance(error, RuntimeError):
+        return (
+            jsonify({"error": {"code": "SERVICE_ERROR", "message": str(error)}}),
+            HTTPStatus.INTERNAL_SERVER_ERROR,
+        )
+    return (
+        jsonify({"error": {"code": "INTERNAL_ERROR", "message": f"An unexpected error occurred: {error}"}}),
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+    )
+
+
 @user_favorites_bp.route("/users/<int:user_id>/favorites", methods=["GET"])
 def get_user_favorites(user_id: int):
-    """Get all favorites for a specific user"""
+    """Get all favorites for a specific user, or one page of them when limit or cursor is given
+
+    Movies are trimmed to the comma-separated ``fields`` query parameter when it is given,
+    and come from the snapshots stored with the favorites unless ``hydrate=1`` asks for
+    full details.
+    """
+    limit, error = _parse_page_size()
+    if error:
+        return error
+
     try:
-        favorites = FavoritesService.get_user_favorites(user_id)
+        fields = MovieService.parse_fields(request.args.get("fields"))
+        hydrate = request.args.get("hydrate") == "1"
+        if limit:
+            page = FavoritesService.get_user_favorites_page(
+                user_id, limit, request.args.get("cursor"), fields=fields, hydrate=hydrate
+            )
+            return jsonify(page), HTTPStatus.OK
+        favorites = FavoritesService.get_user_favorites(user_id, fields=fields, hydrate=hydrate)
         return jsonify({"favorites": favorites}), HTTPStatus.OK
-    except RuntimeError as e:
-        return (
-            jsonify({"error": {"code": "SERVICE_ERROR", "message": str(e)}}),
-            HTTPStatus.INTERNAL_SERVER_ERROR,
-        )
     except Exception as e:
-        return (
-            jsonify({"error": {"code": "INTERNAL_ERROR", "message": f"An unexpected error occurred: {e}"}}),
-            HTTPStatus.INTERNAL_SERVER_ERROR,
-        )
+        return _favorites_error_response(e)
+
+
+async def get_user_favorites_async(user_id: int):
+    """Get favorites for a specific user like get_user_favorites, awaiting the movie lookups"""
+    limit, error = _parse_page_size()
+    if error:
+        return error
+
+    try:
+        fields = MovieService.parse_fields(request.args.get("fields"))
+        hydrate = request.args.get("hydrate") == "1"
+        if limit:
+            page = await FavoritesService.get_user_favorites_page_async(
+                user_id, limit, request.args.get("cursor"), fields=fields, hydrate=hydrate
+            )
+            return jsonify(page), HTTPStatus.OK
+        favorites = await FavoritesService.get_user_favorites_async(user_id, fields=fields, hydrate=hydrate)
+        return jsonify({"favorites": favorites}), HTTPStatus.OK
+    except Exception as e:
+        return _favorites_error_response(e)
+
+
+def use_async_views(app):
+    """Serve the favorites listing with its async view"""
+    app.view_functions[f"{user_favorites_bp.name}.get_user_favorites"] = get_user_favorites_async
 
 
 @user_favorites_bp.route("/users/<int:user_id>/favorites", methods=["POST"])
@@ -0,0 +1,46 @@
+from typing import Dict, Optional
+
+from app.domain.ports.movie_catalog import MovieCatalog
+
+
+class CatalogService:
+    """Service for searching and filtering the local catalog of popular movies."""
+
+    def __init__(self, catalog: MovieCatalog):
+        """Initialize the service with a catalog dependency"""
+        self.catalog = catalog
+
+    def search_movies(self, query: str, limit: int = 20, offset: int = 0) -> Dict:
+        """Search catalog movies by title and overview"""
+        result = self.catalog.search(query, limit=limit, offset=offset)
+        return {
+            "movies": result.movies,
+            "total": result.total,
+            "query": query,
+            "limit": limit,
+            "offset": offset,
+        }
+
+    def discover_movies(
+        self,
+        sort: str = "popularity",
+        descending: bool = True,
+        min_vote_average: Optional[float] = None,
+        released_from: Optional[str] = None,
+        released_to: Optional[str] = None,
+        genre_id: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Dict:
+        """List catalog movies matching filters, in sort order"""
+        result = self.catalog.discover(
+            sort=sort,
+            descending=descending,
+            min_vote_average=min_vote_average,
+            released_from=released_from,
+            released_to=released_to,
+            genre_id=genre_id,
+            limit=limit,
+            offset=offset,
+        )
+        return {"movies": result.movies, "total": result.total, "limit": limit, "offset": offset}
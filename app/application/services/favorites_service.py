@@ -1,46 +1,123 @@
-from dataclasses import dataclass
+import asyncio
+import base64
+import json
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from datetime import datetime, timezone
-from typing import Dict, List, Set
+from itertools import islice
+from typing import Dict, FrozenSet, List, Optional, Set
 
+from app.application.services.movie_service import project_movie
+from app.domain.entities.favorite import Favorite
+from app.domain.entities.movie_snapshot import MovieSnapshot
+from app.domain.entities.raw_json import embed_raw
+from app.domain.exceptions import InvalidCursorError
+from app.domain.ports.favorites_repository import FavoritesRepository
+from app.infrastructure.repositories.in_memory_favorites_repository import (
+    InMemoryFavoritesRepository,
+)
 
-@dataclass
-class Favorite:
-    id: int
-    movie_id: int
-    created_at: datetime
+logger = logging.getLogger(__name__)
+
+CURSOR_VERSION = "v1"
 
 
 class FavoritesService:
-    _favorites: Set[int] = set()  # In-memory storage for favorites
-    _user_favorites: Dict[int, List[Favorite]] = {}  # User-specific favorites
-    _next_id: int = 1
+    _favorites: Dict[int, None] = {}  # In-memory storage for favorites, in insertion order
+    _favorites_lock = threading.Lock()
+    _repository: FavoritesRepository = InMemoryFavoritesRepository()  # User-specific favorites
     _movie_service = None
+    _executor: ThreadPoolExecutor = None
+    _pool_size: int = 0
+    _max_concurrency: int = 8  # Detail lookups in flight per request
+    _deadline: float = 5.0  # Seconds to wait for detail lookups per request
+    _snapshot_max_age: float = 3600.0  # Seconds before a listed movie snapshot is refreshed, 0 never
+    _snapshot_context = nullcontext  # Context background refreshes run in, e.g. the Flask app context
+    _passthrough: bool = False  # Hydrate listings with the encoded details held by the cache
+    _refresh_executor: ThreadPoolExecutor = None  # Background snapshot captures and refreshes
+    _refreshing: Set[int] = set()  # Users with a snapshot refresh queued or running
+    _snapshot_lock = threading.Lock()
+    _snapshot_counts = {"served": 0, "fetched": 0, "refreshed": 0, "refresh_errors": 0}
 
     @classmethod
-    def initialize(cls, movie_service):
-        """Initialize the service with movie service dependency"""
+    def initialize(
+        cls,
+        movie_service,
+        repository: FavoritesRepository = None,
+        pool_size: int = 32,
+        max_concurrency: int = None,
+        deadline: float = None,
+        snapshot_max_age: float = None,
+        snapshot_context=None,
+        passthrough: bool = None,
+    ):
+        """Initialize the service with movie service and favorites storage dependencies"""
         cls._movie_service = movie_service
+        if repository is not None:
+            cls._repository = repository
+        if max_concurrency is not None:
+            cls._max_concurrency = max_concurrency
+        if deadline is not None:
+            cls._deadline = deadline
+        if snapshot_max_age is not None:
+            cls._snapshot_max_age = snapshot_max_age
+        if snapshot_context is not None:
+            cls._snapshot_context = snapshot_context
+        if passthrough is not None:
+            cls._passthrough = passthrough
+        if cls._pool_size != pool_size:
+            cls._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="favorites-fanout")
+            cls._pool_size = pool_size
+        if cls._refresh_executor is None:
+            cls._refresh_executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="favorites-snapshots"
+            )
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Shut down the fan-out and snapshot thread pools, waiting for queued snapshot work"""
+        if cls._refresh_executor is not None:
+            cls._refresh_executor.shutdown(wait=True)
+            cls._refresh_executor = None
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=True)
+            cls._executor = None
+            cls._pool_size = 0
 
     @classmethod
     def add_favorite(cls, movie_id: int) -> bool:
         """Add a movie to favorites"""
-        if movie_id in cls._favorites:
-            return False
-        cls._favorites.add(movie_id)
-        return True
+        with cls._favorites_lock:
+            if movie_id in cls._favorites:
+                return False
+            cls._favorites[movie_id] = None
+            return True
 
     @classmethod
     def remove_favorite(cls, movie_id: int) -> bool:
         """Remove a movie from favorites"""
-        if movie_id not in cls._favorites:
-            return False
-        cls._favorites.remove(movie_id)
-        return True
+        with cls._favorites_lock:
+            if movie_id not in cls._favorites:
+                return False
+            del cls._favorites[movie_id]
+            return True
 
     @classmethod
     def get_favorites(cls) -> List[int]:
         """Get all favorite movies"""
-        return list(cls._favorites)
+        with cls._favorites_lock:
+            return list(cls._favorites)
+
+    @classmethod
+    def get_favorite_at(cls, position: int) -> Optional[int]:
+        """Get the movie at a 1-based position in favorites order"""
+        if position <= 0:
+            return None
+        with cls._favorites_lock:
+            return next(islice(cls._favorites, position - 1, None), None)
 
     @classmethod
     def is_favorite(cls, movie_id: int) -> bool:
@@ -48,61 +125,418 @@ class FavoritesService:
         return movie_id in cls._favorites
 
     @classmethod
-    def get_user_favorites(cls, user_id: int) -> List[Dict]:
-        """Get all favorites for a specific user with movie details"""
+    def get_user_favorites(
+        cls, user_id: int, fields: Optional[FrozenSet[str]] = None, hydrate: bool = False
+    ) -> List[Dict]:
+        """Get all favorites for a specific user, newest release first, trimmed to fields if given.
+
+        Movies are served from the snapshots stored with the favorites, so the
+        listing makes no upstream calls once every snapshot was captured. Full
+        movie details are fetched instead with ``hydrate``, or when ``fields``
+        selects a field snapshots do not hold; in passthrough mode untrimmed
+        details are embedded as the encoded JSON held by the cache.
+        """
+        favorites = cls._list_user_favorites(user_id)
+        if cls._needs_details(fields, hydrate):
+            movie_ids = [favorite.movie_id for favorite in favorites]
+            details = cls._fetch_movie_details(movie_ids, raw=cls._raw_details(fields))
+            return cls._project(
+                cls._with_details(cls._sort_by_release_date(favorites, details), details), fields
+            )
+        fetched = cls._fetch_movie_details(cls._without_snapshot(favorites))
+        movies = cls._snapshot_movies(user_id, favorites, fetched)
+        return cls._project_snapshots(
+            cls._with_details(cls._sort_by_release_date(favorites, movies), movies), fields
+        )
+
+    @classmethod
+    async def get_user_favorites_async(
+        cls, user_id: int, fields: Optional[FrozenSet[str]] = None, hydrate: bool = False
+    ) -> List[Dict]:
+        """Get all favorites for a specific user like get_user_favorites, awaiting the lookups"""
+        favorites = cls._list_user_favorites(user_id)
+        if cls._needs_details(fields, hydrate):
+            movie_ids = [favorite.movie_id for favorite in favorites]
+            details = await cls._fetch_movie_details_async(movie_ids, raw=cls._raw_details(fields))
+            return cls._project(
+                cls._with_details(cls._sort_by_release_date(favorites, details), details), fields
+            )
+        fetched = await cls._fetch_movie_details_async(cls._without_snapshot(favorites))
+        movies = cls._snapshot_movies(user_id, favorites, fetched)
+        return cls._project_snapshots(
+            cls._with_details(cls._sort_by_release_date(favorites, movies), movies), fields
+        )
+
+    @classmethod
+    def _list_user_favorites(cls, user_id: int) -> List[Favorite]:
         if not cls._movie_service:
             raise RuntimeError("Movie service not initialized")
+        return cls._repository.list_by_user(user_id)
 
-        favorites = cls._user_favorites.get(user_id, [])
-        result = []
+    @staticmethod
+    def _with_details(favorites: List[Favorite], details: Dict[int, Dict]) -> List[Dict]:
+        """Pair favorites with their movie details, leaving out movies without details"""
+        return [
+            {
+                "id": favorite.id,
+                "movie": embed_raw(details[favorite.movie_id]),
+                "created_at": favorite.created_at.isoformat(),
+            }
+            for favorite in favorites
+            if details.get(favorite.movie_id) is not None
+        ]
+
+    @classmethod
+    def _project(cls, favorites: List[Dict], fields: Optional[FrozenSet[str]]) -> List[Dict]:
+        """Trim the movie of each favorite to fields; applied after sorting, which reads release_date"""
+        if fields is not None:
+            for favorite in favorites:
+                favorite["movie"] = cls._movie_service.project_movie(favorite["movie"], fields)
+        return favorites
+
+    @staticmethod
+    def _project_snapshots(favorites: List[Dict], fields: Optional[FrozenSet[str]]) -> List[Dict]:
+        """Trim snapshot movies to fields; they are built per request, so the projection cache is skipped"""
+        if fields is not None:
+            for favorite in favorites:
+                favorite["movie"] = project_movie(favorite["movie"], fields)
+        return favorites
+
+    @classmethod
+    def _sort_by_release_date(cls, favorites: List[Favorite], details: Dict[int, Dict]) -> List[Favorite]:
+        return sorted(
+            favorites,
+            key=lambda favorite: cls._release_date(favorite, details.get(favorite.movie_id)),
+            reverse=True,
+        )
 
+    @staticmethod
+    def _release_date(favorite: Favorite, movie) -> str:
+        """Release date to sort a favorite by; encoded details are only decoded without a snapshot"""
+        if isinstance(movie, bytes):
+            if favorite.movie is not None:
+                return favorite.movie.release_date or ""
+            movie = json.loads(movie)
+        return (movie or {}).get("release_date") or ""
+
+    @classmethod
+    def _raw_details(cls, fields: Optional[FrozenSet[str]]) -> bool:
+        """Whether details can be fetched as encoded JSON, which is only embedded untrimmed"""
+        return cls._passthrough and fields is None
+
+    @staticmethod
+    def _needs_details(fields: Optional[FrozenSet[str]], hydrate: bool) -> bool:
+        """Whether a listing needs full movie details rather than the stored snapshots"""
+        return hydrate or (fields is not None and not fields <= MovieSnapshot.FIELDS)
+
+    @staticmethod
+    def _without_snapshot(favorites: List[Favorite]) -> List[int]:
+        return [favorite.movie_id for favorite in favorites if favorite.movie is None]
+
+    @classmethod
+    def _snapshot_movies(
+        cls, user_id: int, favorites: List[Favorite], fetched: Dict[int, Dict]
+    ) -> Dict[int, Dict]:
+        """Return each favorite's movie from its snapshot, keyed by movie ID.
+
+        Snapshots are captured and stored for the ``fetched`` details of
+        favorites that had none; favorites still without one are left out.
+        Snapshots older than the maximum age are served as they are and
+        refreshed in the background.
+        """
+        now = datetime.now(timezone.utc)
+        captured = {
+            movie_id: MovieSnapshot.from_movie(movie, now) for movie_id, movie in fetched.items() if movie
+        }
+        if captured:
+            cls._repository.update_movie_snapshots(user_id, captured)
+
+        movies = {}
+        stale = []
         for favorite in favorites:
+            snapshot = favorite.movie or captured.get(favorite.movie_id)
+            if snapshot is None:
+                continue
+            movies[favorite.movie_id] = snapshot.to_dict(favorite.movie_id)
+            age = (now - snapshot.captured_at).total_seconds()
+            if 0 < cls._snapshot_max_age <= age:
+                stale.append(favorite.movie_id)
+
+        cls._count_snapshots(served=len(movies), fetched=len(captured))
+        if stale:
+            cls._refresh_snapshots(user_id, stale)
+        return movies
+
+    @classmethod
+    def _count_snapshots(cls, **counts: int) -> None:
+        with cls._snapshot_lock:
+            for name, count in counts.items():
+                cls._snapshot_counts[name] += count
+
+    @classmethod
+    def _submit_snapshot_work(cls, fn, *args) -> bool:
+        """Run ``fn`` on the snapshot pool, returning False if no pool is running to take it.
+
+        Snapshot work skipped this way is redone on a later listing.
+        """
+        executor = cls._refresh_executor
+        if executor is None:
+            return False
+        try:
+            executor.submit(fn, *args)
+        except RuntimeError:
+            # The pool was shut down after it was read
+            return False
+        return True
+
+    @classmethod
+    def _refresh_snapshots(cls, user_id: int, movie_ids: List[int]) -> bool:
+        """Queue a background refresh of a user's movie snapshots, unless one is already queued"""
+        with cls._snapshot_lock:
+            if user_id in cls._refreshing:
+                return False
+            cls._refreshing.add(user_id)
+        queued = False
+        try:
+            queued = cls._submit_snapshot_work(cls._run_snapshot_refresh, cls._repository, user_id, movie_ids)
+        finally:
+            if not queued:
+                with cls._snapshot_lock:
+                    cls._refreshing.discard(user_id)
+        return queued
+
+    @classmethod
+    def _capture_snapshots(cls, repository: FavoritesRepository, user_id: int, movie_ids: List[int]) -> int:
+        """Fetch and store snapshots of a user's movies, returning how many were stored"""
+        with cls._snapshot_context():
+            details = cls._fetch_movie_details(movie_ids)
+            now = datetime.now(timezone.utc)
+            snapshots = {
+                movie_id: MovieSnapshot.from_movie(movie, now) for movie_id, movie in details.items() if movie
+            }
+            if snapshots:
+                repository.update_movie_snapshots(user_id, snapshots)
+        return len(snapshots)
+
+    @classmethod
+    def _run_snapshot_capture(cls, repository: FavoritesRepository, user_id: int, movie_id) -> None:
+        try:
+            cls._count_snapshots(fetched=cls._capture_snapshots(repository, user_id, [movie_id]))
+        except Exception as e:
+            logger.error("Error capturing movie snapshot %s for user %s: %s", movie_id, user_id, e)
+
+    @classmethod
+    def _run_snapshot_refresh(
+        cls, repository: FavoritesRepository, user_id: int, movie_ids: List[int]
+    ) -> None:
+        try:
+            cls._count_snapshots(refreshed=cls._capture_snapshots(repository, user_id, movie_ids))
+        except Exception as e:
+            logger.error("Error refreshing movie snapshots for user %s: %s", user_id, e)
+            cls._count_snapshots(refresh_errors=1)
+        finally:
+            with cls._snapshot_lock:
+                cls._refreshing.discard(user_id)
+
+    @classmethod
+    def snapshot_stats(cls) -> Dict:
+        """Return how many listed movies were served from snapshots, fetched and refreshed"""
+        with cls._snapshot_lock:
+            return {
+                **cls._snapshot_counts,
+                "refreshing": len(cls._refreshing),
+                "max_age_seconds": cls._snapshot_max_age,
+            }
+
+    @staticmethod
+    def encode_cursor(favorite_id: int) -> str:
+        """Encode the last favorite ID of a page as an opaque cursor"""
+        return base64.urlsafe_b64encode(f"{CURSOR_VERSION}:{favorite_id}".encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> int:
+        """Decode a cursor produced by encode_cursor back into a favorite ID"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            version, favorite_id = raw.split(":")
+            if version != CURSOR_VERSION:
+                raise ValueError(version)
+            favorite_id = int(favorite_id)
+        except ValueError as e:
+            raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+        if favorite_id <= 0:
+            raise InvalidCursorError(f"Invalid cursor: {cursor}")
+        return favorite_id
+
+    @classmethod
+    def get_user_favorites_page(
+        cls,
+        user_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        fields: Optional[FrozenSet[str]] = None,
+        hydrate: bool = False,
+    ) -> Dict:
+        """Get one page of a user's favorites, newest first.
+
+        Pages are keyed on the favorite ID rather than an offset, so favorites
+        added or removed between requests never shift items across pages.
+        Movies come from snapshots as in get_user_favorites; when details are
+        needed they are only fetched for the favorites on the requested page.
+        """
+        favorites, next_cursor = cls._list_page(user_id, limit, cursor)
+        if cls._needs_details(fields, hydrate):
+            movie_ids = [favorite.movie_id for favorite in favorites]
+            details = cls._fetch_movie_details(movie_ids, raw=cls._raw_details(fields))
+            page = cls._project(cls._with_details(favorites, details), fields)
+        else:
+            fetched = cls._fetch_movie_details(cls._without_snapshot(favorites))
+            movies = cls._snapshot_movies(user_id, favorites, fetched)
+            page = cls._project_snapshots(cls._with_details(favorites, movies), fields)
+        return {"favorites": page, "next_cursor": next_cursor}
+
+    @classmethod
+    async def get_user_favorites_page_async(
+        cls,
+        user_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        fields: Optional[FrozenSet[str]] = None,
+        hydrate: bool = False,
+    ) -> Dict:
+        """Get one page of a user's favorites like get_user_favorites_page, awaiting the lookups"""
+        favorites, next_cursor = cls._list_page(user_id, limit, cursor)
+        if cls._needs_details(fields, hydrate):
+            movie_ids = [favorite.movie_id for favorite in favorites]
+            details = await cls._fetch_movie_details_async(movie_ids, raw=cls._raw_details(fields))
+            page = cls._project(cls._with_details(favorites, details), fields)
+        else:
+            fetched = await cls._fetch_movie_details_async(cls._without_snapshot(favorites))
+            movies = cls._snapshot_movies(user_id, favorites, fetched)
+            page = cls._project_snapshots(cls._with_details(favorites, movies), fields)
+        return {"favorites": page, "next_cursor": next_cursor}
+
+    @classmethod
+    def _list_page(cls, user_id: int, limit: int, cursor: Optional[str]):
+        if not cls._movie_service:
+            raise RuntimeError("Movie service not initialized")
+
+        before_id = cls.decode_cursor(cursor) if cursor else None
+        favorites = cls._repository.list_page(user_id, limit + 1, before_id)
+        if len(favorites) > limit:
+            favorites = favorites[:limit]
+            return favorites, cls.encode_cursor(favorites[-1].id)
+        return favorites, None
+
+    @classmethod
+    def _batches(cls, movie_ids: List[int]) -> List[List[int]]:
+        """Split movie IDs into at most the per-request concurrency cap of batches"""
+        movie_ids = list(dict.fromkeys(movie_ids))
+        size = max(1, -(-len(movie_ids) // cls._max_concurrency))
+        return [movie_ids[start:][:size] for start in range(0, len(movie_ids), size)]
+
+    @staticmethod
+    def _collect(details: Dict[int, Dict], found: Dict[int, Dict]) -> None:
+        for movie_id in getattr(found, "failed", ()):
+            logger.error("Error fetching movie details for %s", movie_id)
+        details.update(found)
+
+    @classmethod
+    def _fetch_movie_details(cls, movie_ids: List[int], raw: bool = False) -> Dict[int, Dict]:
+        """Fetch movie details in concurrent batches, bounded per request and by the deadline.
+
+        Each batch goes through the movie service's batch lookup, so cached
+        movies are found with one bulk cache read per batch; with ``raw`` they
+        are returned as encoded JSON. Lookups that fail or do not finish before
+        the deadline are left out, so callers get partial results instead of
+        waiting on a slow upstream.
+        """
+        deadline = time.monotonic() + cls._deadline
+        lookup = (
+            cls._movie_service.get_movie_details_raw_many
+            if raw
+            else cls._movie_service.get_movie_details_many
+        )
+        in_flight = {cls._executor.submit(lookup, batch): batch for batch in cls._batches(movie_ids)}
+        details = {}
+
+        while in_flight:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(in_flight, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = in_flight.pop(future)
+                try:
+                    cls._collect(details, future.result())
+                except Exception as e:
+                    # Log error but continue with the other batches
+                    logger.error("Error fetching movie details for %s: %s", batch, e)
+
+        if in_flight:
+            dropped = sum(len(batch) for batch in in_flight.values())
+            logger.warning("Deadline exceeded fetching movie details, %d lookups dropped", dropped)
+            for future in in_flight:
+                future.cancel()
+        return details
+
+    @classmethod
+    async def _fetch_movie_details_async(cls, movie_ids: List[int], raw: bool = False) -> Dict[int, Dict]:
+        """Fetch movie details in concurrent batches on the event loop, bounded by the deadline.
+
+        Batches are the same as in the threaded fan-out, but each batch's
+        lookups wait without holding a thread, so the client's connection pool
+        rather than the concurrency cap bounds how many requests are on the
+        wire. Failed and late lookups are left out.
+        """
+        movie_service = cls._movie_service
+        lookup = (
+            movie_service.get_movie_details_raw_many_async
+            if raw
+            else movie_service.get_movie_details_many_async
+        )
+        tasks = {asyncio.ensure_future(lookup(batch)): batch for batch in cls._batches(movie_ids)}
+        if not tasks:
+            return {}
+
+        done, pending = await asyncio.wait(tasks, timeout=cls._deadline)
+        details = {}
+        for task in done:
+            batch = tasks[task]
             try:
-                movie_details = cls._movie_service.get_movie_details(favorite.movie_id)
-                result.append(
-                    {"id": favorite.id, "movie": movie_details, "created_at": favorite.created_at.isoformat()}
-                )
+                cls._collect(details, task.result())
             except Exception as e:
-                # Log error but continue with next favorite
-                print(f"Error fetching movie details for {favorite.movie_id}: {str(e)}")
-                continue
+                logger.error("Error fetching movie details for %s: %s", batch, e)
 
-        # Sort by release date
-        return sorted(result, key=lambda x: x["movie"].get("release_date", ""), reverse=True)
+        if pending:
+            dropped = sum(len(tasks[task]) for task in pending)
+            logger.warning("Deadline exceeded fetching movie details, %d lookups dropped", dropped)
+            for task in pending:
+                task.cancel()
+        return details
 
     @classmethod
     def add_user_favorite(cls, user_id: int, movie_id: int) -> Favorite:
-        """Add a movie to user's favorites"""
-        if user_id not in cls._user_favorites:
-            cls._user_favorites[user_id] = []
+        """Add a movie to user's favorites, returning None if it is already there.
 
-        # Check if movie is already in favorites
-        if any(f.movie_id == movie_id for f in cls._user_favorites[user_id]):
-            return None
-
-        favorite = Favorite(id=cls._next_id, movie_id=movie_id, created_at=datetime.now(timezone.utc))
-        cls._next_id += 1
-        cls._user_favorites[user_id].append(favorite)
+        The favorite is added without waiting on TheMovieDB: its snapshot is
+        captured in the background, or on its first listing if that comes
+        first or the capture fails.
+        """
+        favorite = cls._repository.add(user_id, movie_id)
+        if favorite is not None and cls._movie_service:
+            cls._submit_snapshot_work(cls._run_snapshot_capture, cls._repository, user_id, movie_id)
         return favorite
 
     @classmethod
     def remove_user_favorite(cls, user_id: int, favorite_id: int) -> bool:
         """Remove a specific favorite from user's favorites"""
-        if user_id not in cls._user_favorites:
-            return False
-
-        favorites = cls._user_favorites[user_id]
-        for i, favorite in enumerate(favorites):
-            if favorite.id == favorite_id:
-                favorites.pop(i)
-                return True
-        return False
+        return cls._repository.remove(user_id, favorite_id)
 
     @classmethod
     def remove_all_user_favorites(cls, user_id: int) -> None:
         """Remove all favorites for a user"""
-        if user_id in cls._user_favorites:
-            cls._user_favorites[user_id] = []
+        cls._repository.remove_all(user_id)
 
     @classmethod
     def is_admin(cls, user_id: int) -> bool:
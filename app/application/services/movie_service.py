@@ -1,38 +1,219 @@
 """Movie service implementation."""
 
-from typing import Dict
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
 
+from app.domain.exceptions import InvalidFieldsError
 from app.domain.ports.movie_repository import MovieRepository
 
+# Fields of TheMovieDB movie objects that clients may select with ``fields=``
+MOVIE_FIELDS = frozenset(
+    {
+        "adult",
+        "backdrop_path",
+        "belongs_to_collection",
+        "budget",
+        "genre_ids",
+        "genres",
+        "homepage",
+        "id",
+        "imdb_id",
+        "original_language",
+        "original_title",
+        "overview",
+        "popularity",
+        "poster_path",
+        "production_companies",
+        "production_countries",
+        "release_date",
+        "revenue",
+        "runtime",
+        "spoken_languages",
+        "status",
+        "tagline",
+        "title",
+        "video",
+        "vote_average",
+        "vote_count",
+    }
+)
+
+Fields = Optional[FrozenSet[str]]
+
+
+def project_movie(movie: Dict, fields: FrozenSet[str]) -> Dict:
+    """Return the ``fields`` of ``movie``, in their original order."""
+    return {key: value for key, value in movie.items() if key in fields}
+
 
 class MovieService:
-    """Service for movie-related operations."""
+    """Service for movie-related operations.
+
+    Lookups accept an optional field set, parsed with ``parse_fields``, that
+    trims the returned movies to the selected fields. With a projection cache,
+    projections are keyed by the version the repository reports for the copy
+    it served and by the field set, so a cached movie is projected once per
+    field set rather than on every request, whichever worker or tier the copy
+    came from. A refreshed movie has a new version and is projected again.
+    Values served without a version are projected on every request.
+    """
+
+    PROJECTION_TTL = 3600
 
-    def __init__(self, movie_repository: MovieRepository):
-        """Initialize service with repository."""
+    def __init__(self, movie_repository: MovieRepository, projection_cache=None):
+        """Initialize service with repository.
+
+        Args:
+            movie_repository: Repository providing movie data
+            projection_cache: Cache with ``get``, ``set`` and ``stats`` for projected
+                movies, or None to project on every request
+        """
         self._repository = movie_repository
+        self._projections = projection_cache
+
+    @staticmethod
+    def parse_fields(value: Optional[str]) -> Fields:
+        """Parse a comma-separated ``fields`` parameter.
+
+        Args:
+            value: Raw parameter value, e.g. ``"id,title,poster_path"``
 
-    def get_popular_movies(self, page: int = 1) -> Dict:
+        Returns:
+            The selected fields, or None to return whole movies
+
+        Raises:
+            InvalidFieldsError: If a field is not in MOVIE_FIELDS
+        """
+        if value is None:
+            return None
+        fields = frozenset(field.strip() for field in value.split(",") if field.strip())
+        if not fields:
+            raise InvalidFieldsError("fields must name at least one field")
+        unknown = fields - MOVIE_FIELDS
+        if unknown:
+            raise InvalidFieldsError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return fields
+
+    def _projected(self, source, fields: FrozenSet[str], project: Callable, version: Optional[str]):
+        if self._projections is None or version is None:
+            return project(source, fields)
+        key = f"{version}:{','.join(sorted(fields))}"
+        projection = self._projections.get(key)
+        if projection is None:
+            projection = project(source, fields)
+            self._projections.set(key, projection, self.PROJECTION_TTL)
+        return projection
+
+    def project_movie(
+        self, movie: Optional[Dict], fields: Fields, version: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Trim ``movie`` to ``fields``; None selects every field.
+
+        ``version`` is the version the repository reported for ``movie``; only
+        versioned movies have their projection cached.
+        """
+        if movie is None or fields is None:
+            return movie
+        return self._projected(movie, fields, project_movie, version)
+
+    def project_movies(self, movies: List[Dict], fields: Fields, version: Optional[str] = None) -> List[Dict]:
+        """Trim every movie of a list to ``fields``; None selects every field."""
+        if movies is None or fields is None:
+            return movies
+        return self._projected(
+            movies, fields, lambda source, fields: [project_movie(movie, fields) for movie in source], version
+        )
+
+    def projection_stats(self) -> Dict:
+        """Return projection cache counters."""
+        return self._projections.stats() if self._projections is not None else {}
+
+    def get_popular_movies(self, page: int = 1, fields: Fields = None) -> Dict:
         """Get popular movies with pagination.
 
         Args:
             page: Page number for pagination (default: 1)
+            fields: Fields to return for each movie, or None for all of them
 
         Returns:
             Dict containing:
                 - movies: List of movie dictionaries
                 - page: Current page number
         """
-        movies = self._repository.get_popular(page=page)
-        return {"movies": movies, "page": page}
+        if fields is None:
+            return {"movies": self._repository.get_popular(page=page), "page": page}
+        result = self._repository.get_popular_versioned(page=page)
+        return {"movies": self.project_movies(result.value, fields, result.version), "page": page}
 
-    def get_movie_details(self, movie_id: int) -> Dict:
+    def get_movie_details(self, movie_id: int, fields: Fields = None) -> Dict:
         """Get detailed information for a specific movie.
 
         Args:
             movie_id: The ID of the movie to retrieve
+            fields: Fields to return, or None for all of them
 
         Returns:
             Dictionary containing movie details
         """
-        return self._repository.get_movie_details(movie_id=movie_id)
+        if fields is None:
+            return self._repository.get_movie_details(movie_id=movie_id)
+        result = self._repository.get_movie_details_versioned(movie_id=movie_id)
+        return self.project_movie(result.value, fields, result.version)
+
+    def get_movie_details_raw(self, movie_id: int) -> Optional[bytes]:
+        """Get the details of a movie as encoded JSON, for responses that pass them through unchanged.
+
+        Args:
+            movie_id: The ID of the movie to retrieve
+
+        Returns:
+            UTF-8 JSON document of the movie details, or None if not found
+        """
+        return self._repository.get_movie_details_raw(movie_id=movie_id)
+
+    def get_movie_details_many(self, movie_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Get detailed information for several movies.
+
+        Args:
+            movie_ids: IDs of the movies to retrieve; duplicates are ignored
+
+        Returns:
+            Dictionary mapping each found movie ID to its details
+        """
+        return self._repository.get_movie_details_many(movie_ids=movie_ids)
+
+    def get_movie_details_raw_many(self, movie_ids: Iterable[int]) -> Dict[int, bytes]:
+        """Get the details of several movies as encoded JSON, for responses that embed them unchanged.
+
+        Args:
+            movie_ids: IDs of the movies to retrieve; duplicates are ignored
+
+        Returns:
+            Dictionary mapping each found movie ID to its UTF-8 JSON document
+        """
+        return self._repository.get_movie_details_raw_many(movie_ids=movie_ids)
+
+    async def get_popular_movies_async(self, page: int = 1, fields: Fields = None) -> Dict:
+        """Get popular movies with pagination without blocking the event loop."""
+        if fields is None:
+            return {"movies": await self._repository.get_popular_async(page=page), "page": page}
+        result = await self._repository.get_popular_versioned_async(page=page)
+        return {"movies": self.project_movies(result.value, fields, result.version), "page": page}
+
+    async def get_movie_details_async(self, movie_id: int, fields: Fields = None) -> Dict:
+        """Get detailed information for a specific movie without blocking the event loop."""
+        if fields is None:
+            return await self._repository.get_movie_details_async(movie_id=movie_id)
+        result = await self._repository.get_movie_details_versioned_async(movie_id=movie_id)
+        return self.project_movie(result.value, fields, result.version)
+
+    async def get_movie_details_raw_async(self, movie_id: int) -> Optional[bytes]:
+        """Get the details of a movie as encoded JSON without blocking the event loop."""
+        return await self._repository.get_movie_details_raw_async(movie_id=movie_id)
+
+    async def get_movie_details_many_async(self, movie_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Get detailed information for several movies without blocking the event loop."""
+        return await self._repository.get_movie_details_many_async(movie_ids=movie_ids)
+
+    async def get_movie_details_raw_many_async(self, movie_ids: Iterable[int]) -> Dict[int, bytes]:
+        """Get the details of several movies as encoded JSON without blocking the event loop."""
+        return await self._repository.get_movie_details_raw_many_async(movie_ids=movie_ids)
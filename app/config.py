@@ -12,9 +12,85 @@ class Config:
     TESTING = os.getenv("FLASK_ENV") == "test"
     DEBUG = os.getenv("FLASK_DEBUG", "0") == "1"
 
+    # JSON encoder for responses: "orjson" (falls back to "json" when not installed) or "json"
+    JSON_ENCODER = os.getenv("JSON_ENCODER", "orjson")
+
+    # Serve movie details as the JSON bytes cached from TheMovieDB, without decoding and re-encoding them
+    MOVIE_DETAILS_PASSTHROUGH = os.getenv("MOVIE_DETAILS_PASSTHROUGH", "1") == "1"
+
+    # Response compression (gzip, plus brotli when installed)
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_CACHE_MAX_ENTRIES = int(os.getenv("COMPRESSION_CACHE_MAX_ENTRIES", "256"))
+
+    # Favorites configuration
+    FAVORITES_STORE = os.getenv("FAVORITES_STORE", "memory")  # "memory" or "database"
+    FAVORITES_FANOUT_POOL_SIZE = int(os.getenv("FAVORITES_FANOUT_POOL_SIZE", "32"))
+    FAVORITES_FANOUT_CONCURRENCY = int(os.getenv("FAVORITES_FANOUT_CONCURRENCY", "8"))
+    FAVORITES_FANOUT_DEADLINE_SECONDS = float(os.getenv("FAVORITES_FANOUT_DEADLINE_SECONDS", "5"))
+    # Age at which a listed favorite's movie snapshot is refreshed in the background (0 never)
+    FAVORITES_SNAPSHOT_MAX_AGE_SECONDS = float(os.getenv("FAVORITES_SNAPSHOT_MAX_AGE_SECONDS", "3600"))
+
     # Redis configuration
     REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
     CACHE_DURATION_SECONDS = int(os.getenv("CACHE_DURATION_SECONDS", "30"))
+    CACHE_POPULAR_TTL_SECONDS = int(os.getenv("CACHE_POPULAR_TTL_SECONDS", CACHE_DURATION_SECONDS))
+    CACHE_DETAILS_TTL_SECONDS = int(os.getenv("CACHE_DETAILS_TTL_SECONDS", CACHE_DURATION_SECONDS))
+    CACHE_HARD_TTL_SECONDS = int(os.getenv("CACHE_HARD_TTL_SECONDS", "3600"))
+    CACHE_LOCAL_MAX_ENTRIES = int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", "1024"))
+    # Movies projected with ``fields=`` kept per process, per field set
+    CACHE_PROJECTION_MAX_ENTRIES = int(os.getenv("CACHE_PROJECTION_MAX_ENTRIES", "1024"))
+    REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.25"))
+    # Movie IDs TheMovieDB does not know, answered locally for a while (0 seconds disables it)
+    NEGATIVE_CACHE_TTL_SECONDS = float(os.getenv("NEGATIVE_CACHE_TTL_SECONDS", "60"))
+    NEGATIVE_CACHE_MAX_ENTRIES = int(os.getenv("NEGATIVE_CACHE_MAX_ENTRIES", "10000"))
+    NEGATIVE_CACHE_BLOOM = os.getenv("NEGATIVE_CACHE_BLOOM", "0") == "1"
+    # Fetch popular page p + 1 in the background when page p is served
+    CACHE_PREFETCH_NEXT_PAGE = os.getenv("CACHE_PREFETCH_NEXT_PAGE", "0") == "1"
+    # Background warmer for the first popular pages and their movies (0 pages disables it)
+    CACHE_WARMER_PAGES = int(os.getenv("CACHE_WARMER_PAGES", "0"))
+    CACHE_WARMER_INTERVAL_SECONDS = float(os.getenv("CACHE_WARMER_INTERVAL_SECONDS", "10"))
+    CACHE_WARMER_LEAD_SECONDS = float(os.getenv("CACHE_WARMER_LEAD_SECONDS", "15"))
+    CACHE_WARMER_CONCURRENCY = int(os.getenv("CACHE_WARMER_CONCURRENCY", "4"))
+    # Which workers warm: "none" (every worker), "file" (one per host) or "redis" (one per deployment)
+    CACHE_WARMER_LEADER = os.getenv("CACHE_WARMER_LEADER", "file")
+    CACHE_WARMER_LOCK_FILE = os.getenv("CACHE_WARMER_LOCK_FILE", "/tmp/movies-cache-warmer.lock")
+
+    # Local catalog of the first popular pages behind /api/movies/search and /api/movies/discover
+    CATALOG_PAGES = int(os.getenv("CATALOG_PAGES", "5"))
+    CATALOG_REFRESH_SECONDS = float(os.getenv("CATALOG_REFRESH_SECONDS", "300"))
+    CATALOG_LOAD_TIMEOUT_SECONDS = float(os.getenv("CATALOG_LOAD_TIMEOUT_SECONDS", "5"))
+    # Memory-mapped catalog file shared by the workers of a host, with the details of its movies;
+    # empty keeps a catalog per worker
+    CATALOG_FILE = os.getenv("CATALOG_FILE", "")
+    CATALOG_DETAILS_MAX_AGE_SECONDS = float(os.getenv("CATALOG_DETAILS_MAX_AGE_SECONDS", "600"))
 
     # TheMovieDB configuration
     TMDB_API_KEY = os.getenv("TMDB_API_KEY")
+    TMDB_POOL_CONNECTIONS = int(os.getenv("TMDB_POOL_CONNECTIONS", "10"))
+    TMDB_POOL_MAXSIZE = int(os.getenv("TMDB_POOL_MAXSIZE", "10"))
+    TMDB_POOL_BLOCK = os.getenv("TMDB_POOL_BLOCK", "0") == "1"
+    # Concurrent detail lookups per batch with the sync client
+    TMDB_BATCH_CONCURRENCY = int(os.getenv("TMDB_BATCH_CONCURRENCY", "8"))
+    # Retries: exponential backoff with full jitter, a per-request deadline and a process-wide budget
+    TMDB_RETRY_MAX_ATTEMPTS = int(os.getenv("TMDB_RETRY_MAX_ATTEMPTS", "3"))
+    TMDB_RETRY_BASE_DELAY_SECONDS = float(os.getenv("TMDB_RETRY_BASE_DELAY_SECONDS", "0.2"))
+    TMDB_RETRY_MAX_DELAY_SECONDS = float(os.getenv("TMDB_RETRY_MAX_DELAY_SECONDS", "5"))
+    TMDB_RETRY_BUDGET_RATIO = float(os.getenv("TMDB_RETRY_BUDGET_RATIO", "0.2"))
+    TMDB_RETRY_BUDGET_MIN_PER_SECOND = float(os.getenv("TMDB_RETRY_BUDGET_MIN_PER_SECOND", "1"))
+    TMDB_REQUEST_DEADLINE_SECONDS = float(os.getenv("TMDB_REQUEST_DEADLINE_SECONDS", "15"))
+    # Longest backoff the sync client sleeps on its worker thread; longer retries give up
+    TMDB_SYNC_MAX_RETRY_SLEEP_SECONDS = float(os.getenv("TMDB_SYNC_MAX_RETRY_SLEEP_SECONDS", "2"))
+    # Circuit breakers per endpoint family (popular, details)
+    TMDB_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("TMDB_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    TMDB_CIRCUIT_RECOVERY_SECONDS = float(os.getenv("TMDB_CIRCUIT_RECOVERY_SECONDS", "30"))
+    # Client-side token bucket (0 disables it); shared across workers through "file" or "redis"
+    TMDB_RATE_LIMIT_PER_SECOND = float(os.getenv("TMDB_RATE_LIMIT_PER_SECOND", "40"))
+    TMDB_RATE_LIMIT_BURST = float(os.getenv("TMDB_RATE_LIMIT_BURST", "20"))
+    TMDB_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("TMDB_RATE_LIMIT_MAX_WAIT_SECONDS", "2"))
+    TMDB_RATE_LIMIT_SHARED = os.getenv("TMDB_RATE_LIMIT_SHARED", "none")
+    TMDB_RATE_LIMIT_FILE = os.getenv("TMDB_RATE_LIMIT_FILE", "/tmp/tmdb-rate-limit")
+    # "sync" (requests, one worker thread per upstream call) or "async" (aiohttp on an event loop)
+    TMDB_CLIENT = os.getenv("TMDB_CLIENT", "sync")
+    TMDB_ASYNC_POOL_MAXSIZE = int(os.getenv("TMDB_ASYNC_POOL_MAXSIZE", "100"))
@@ -0,0 +1,17 @@
+"""Favorite entity."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.domain.entities.movie_snapshot import MovieSnapshot
+
+
+@dataclass
+class Favorite:
+    __slots__ = ("id", "movie_id", "created_at", "movie")
+
+    id: int
+    movie_id: int
+    created_at: datetime
+    movie: Optional[MovieSnapshot]  # None until the movie's fields were captured
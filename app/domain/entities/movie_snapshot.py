@@ -0,0 +1,47 @@
+"""Movie snapshot entity."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class MovieSnapshot:
+    """The movie fields a favorites listing renders, copied when they were captured."""
+
+    __slots__ = ("id", "title", "release_date", "poster_path", "vote_average", "captured_at")
+
+    FIELDS = frozenset({"id", "title", "release_date", "poster_path", "vote_average"})
+
+    id: Optional[int]
+    title: Optional[str]
+    release_date: Optional[str]
+    poster_path: Optional[str]
+    vote_average: Optional[float]
+    captured_at: datetime
+
+    @classmethod
+    def from_movie(cls, movie: Dict, captured_at: datetime) -> "MovieSnapshot":
+        """Copy the snapshot fields of a movie's details."""
+        return cls(
+            id=movie.get("id"),
+            title=movie.get("title"),
+            release_date=movie.get("release_date"),
+            poster_path=movie.get("poster_path"),
+            vote_average=movie.get("vote_average"),
+            captured_at=captured_at,
+        )
+
+    def to_dict(self, movie_id) -> Dict:
+        """Return the snapshot as a movie with only the snapshot fields.
+
+        The ID is the one TheMovieDB returned, as in full details; ``movie_id``,
+        the ID the favorite was added with, is used if none was captured.
+        """
+        return {
+            "id": self.id if self.id is not None else movie_id,
+            "title": self.title,
+            "release_date": self.release_date,
+            "poster_path": self.poster_path,
+            "vote_average": self.vote_average,
+        }
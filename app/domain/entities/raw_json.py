@@ -0,0 +1,19 @@
+"""Raw JSON value type."""
+
+from typing import Any
+
+
+class RawJSON(bytes):
+    """Already-encoded JSON that response encoders embed verbatim.
+
+    Wrapping cached upstream bytes in ``RawJSON`` lets them reach the client
+    without being decoded and encoded again, at the top level of a response
+    or nested inside other values.
+    """
+
+
+def embed_raw(value: Any) -> Any:
+    """Wrap encoded JSON bytes in ``RawJSON``; other values are returned unchanged."""
+    if isinstance(value, bytes) and not isinstance(value, RawJSON):
+        return RawJSON(value)
+    return value
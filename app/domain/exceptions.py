@@ -13,6 +13,24 @@ class MovieAPIConnectionError(MovieAPIError):
     pass
 
 
+class CircuitOpenError(MovieAPIConnectionError):
+    """Raised without calling the movie API while its circuit breaker is open."""
+
+    pass
+
+
+class RateLimitExceededError(MovieAPIConnectionError):
+    """Raised when a movie API call cannot get a rate limit token before its deadline."""
+
+    pass
+
+
+class UpstreamRateLimitError(RateLimitExceededError):
+    """Raised when the movie API rejects a call for exceeding its rate limit."""
+
+    pass
+
+
 class MovieAPIResponseError(MovieAPIError):
     """Raised when the movie API returns an error response."""
 
@@ -23,3 +41,27 @@ class TMDBError(Exception):
     """Raised when there is an error with TheMovieDB API."""
 
     pass
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    pass
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when a field projection names fields that are not allowed."""
+
+    pass
+
+
+class CatalogUnavailableError(Exception):
+    """Raised when the local movie catalog has not been loaded."""
+
+    pass
+
+
+class InvalidCatalogFileError(ValueError):
+    """Raised when a catalog file is not in a format this version can map."""
+
+    pass
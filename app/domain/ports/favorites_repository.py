@@ -0,0 +1,89 @@
+"""Favorites repository interface definition."""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from app.domain.entities.favorite import Favorite
+from app.domain.entities.movie_snapshot import MovieSnapshot
+
+
+class FavoritesRepository(ABC):
+    """Port for user favorites storage."""
+
+    @abstractmethod
+    def add(self, user_id: int, movie_id: int, movie: Optional[MovieSnapshot] = None) -> Optional[Favorite]:
+        """Add a movie to a user's favorites.
+
+        Args:
+            user_id: The ID of the user
+            movie_id: The ID of the movie
+            movie: Snapshot of the movie's fields, if they were captured
+
+        Returns:
+            The created favorite, or None if the movie is already a favorite
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, user_id: int, favorite_id: int) -> bool:
+        """Remove a favorite from a user's favorites.
+
+        Args:
+            user_id: The ID of the user
+            favorite_id: The ID of the favorite
+
+        Returns:
+            True if the favorite existed and was removed
+        """
+        pass
+
+    @abstractmethod
+    def remove_all(self, user_id: int) -> int:
+        """Remove all favorites of a user.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            Number of favorites removed
+        """
+        pass
+
+    @abstractmethod
+    def list_by_user(self, user_id: int) -> List[Favorite]:
+        """List a user's favorites in the order they were added.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            List of favorites
+        """
+        pass
+
+    @abstractmethod
+    def list_page(self, user_id: int, limit: int, before_id: Optional[int] = None) -> List[Favorite]:
+        """List a page of a user's favorites, newest first.
+
+        Args:
+            user_id: The ID of the user
+            limit: Maximum number of favorites to return
+            before_id: Only return favorites with an ID lower than this one
+
+        Returns:
+            List of favorites in descending ID order
+        """
+        pass
+
+    @abstractmethod
+    def update_movie_snapshots(self, user_id: int, snapshots: Dict[int, MovieSnapshot]) -> int:
+        """Replace the movie snapshots of a user's favorites.
+
+        Args:
+            user_id: The ID of the user
+            snapshots: New snapshot for each movie ID; movies not in the user's favorites are ignored
+
+        Returns:
+            Number of favorites updated
+        """
+        pass
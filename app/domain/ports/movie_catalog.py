@@ -0,0 +1,70 @@
+"""Movie catalog interface definition."""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional
+
+
+class CatalogPage(NamedTuple):
+    """One page of catalog results and the number of movies matching in total."""
+
+    movies: List[Dict]
+    total: int
+
+
+class MovieCatalog(ABC):
+    """Port for searching and listing a local snapshot of popular movies."""
+
+    SORT_KEYS = ("popularity", "vote_average", "release_date")
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> CatalogPage:
+        """Search movies by title and overview.
+
+        Every word of ``query`` must appear in the title or overview; the last
+        one may be a prefix. Movies matching more words in their title rank
+        first, then more popular ones.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of movies to return
+            offset: Number of matching movies to skip
+
+        Returns:
+            CatalogPage of matching movies
+
+        Raises:
+            CatalogUnavailableError: If the catalog has not been loaded
+        """
+        pass
+
+    @abstractmethod
+    def discover(
+        self,
+        sort: str = "popularity",
+        descending: bool = True,
+        min_vote_average: Optional[float] = None,
+        released_from: Optional[str] = None,
+        released_to: Optional[str] = None,
+        genre_id: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> CatalogPage:
+        """List movies matching filters, ordered by one of SORT_KEYS.
+
+        Args:
+            sort: Field to order by, one of SORT_KEYS
+            descending: Order from the highest value down
+            min_vote_average: Lowest vote average to include
+            released_from: Earliest release date to include (YYYY-MM-DD)
+            released_to: Latest release date to include (YYYY-MM-DD)
+            genre_id: Only include movies of this genre
+            limit: Maximum number of movies to return
+            offset: Number of matching movies to skip
+
+        Returns:
+            CatalogPage of matching movies
+
+        Raises:
+            CatalogUnavailableError: If the catalog has not been loaded
+        """
+        pass
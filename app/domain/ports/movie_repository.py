@@ -1,7 +1,69 @@
 """Movie repository interface definition."""
 
+import asyncio
+import json
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from app.domain.entities.raw_json import RawJSON
+
+
+class ConditionalResult(NamedTuple):
+    """Outcome of a lookup made with the validators of a cached copy.
+
+    ``not_modified`` means the cached copy is still current and ``value`` is
+    None. Otherwise ``value`` is the lookup result (None if not found) and
+    ``validators`` the opaque validators to send on the next revalidation.
+    """
+
+    value: Optional[Any]
+    validators: Optional[Dict[str, str]] = None
+    not_modified: bool = False
+
+
+class VersionedResult(NamedTuple):
+    """A lookup result with an identifier of the cached copy it was served from.
+
+    ``version`` names the cache entry and the version of its content, so two
+    results with the same version hold equal values. It is None when the value
+    was not served from a versioned copy.
+    """
+
+    value: Optional[Any]
+    version: Optional[str] = None
+
+
+class MovieDetailsBatch(dict):
+    """Movie details by ID from a batch lookup, with the IDs whose lookup failed.
+
+    One failed lookup does not fail the batch: its ID is listed in ``failed``
+    and the movies found are returned. Only when every lookup failed is the
+    first error raised, since there is nothing to return.
+    """
+
+    def __init__(self, details: Dict = (), failed: Iterable = ()):
+        """Initialize the batch with the details found and the IDs that failed."""
+        super().__init__(details)
+        self.failed = list(failed)
+
+    @classmethod
+    def from_results(cls, movie_ids: List, results: Iterable) -> "MovieDetailsBatch":
+        """Build a batch from one result per ID: its details, None if not found, or the exception raised.
+
+        Raises:
+            Exception: The first error, if every lookup failed
+        """
+        batch = cls()
+        errors = []
+        for movie_id, result in zip(movie_ids, results):
+            if isinstance(result, BaseException):
+                batch.failed.append(movie_id)
+                errors.append(result)
+            elif result is not None:
+                batch[movie_id] = result
+        if errors and len(errors) == len(movie_ids):
+            raise errors[0]
+        return batch
 
 
 class MovieRepository(ABC):
@@ -30,3 +92,134 @@ class MovieRepository(ABC):
             Dictionary containing movie details
         """
         pass
+
+    def get_movie_details_many(self, movie_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Get detailed information for several movies.
+
+        Adapters that can fetch in bulk should override this; the default looks
+        movies up one at a time.
+
+        Args:
+            movie_ids: IDs of the movies to retrieve; duplicates are ignored
+
+        Returns:
+            MovieDetailsBatch mapping each found movie ID to its details
+        """
+        movie_ids = list(dict.fromkeys(movie_ids))
+        results = []
+        for movie_id in movie_ids:
+            try:
+                results.append(self.get_movie_details(movie_id=movie_id))
+            except Exception as e:
+                results.append(e)
+        return MovieDetailsBatch.from_results(movie_ids, results)
+
+    def get_movie_details_raw_many(self, movie_ids: Iterable[int]) -> MovieDetailsBatch:
+        """Get the details of several movies as encoded JSON bytes.
+
+        Adapters that hold encoded details should override this; the default
+        encodes the results of ``get_movie_details_many``.
+
+        Args:
+            movie_ids: IDs of the movies to retrieve; duplicates are ignored
+
+        Returns:
+            MovieDetailsBatch mapping each found movie ID to its details as ``RawJSON``
+        """
+        details = self.get_movie_details_many(movie_ids=movie_ids)
+        return MovieDetailsBatch(
+            {movie_id: RawJSON(json.dumps(movie).encode()) for movie_id, movie in details.items()},
+            failed=getattr(details, "failed", []),
+        )
+
+    def get_popular_conditional(self, page: int = 1, validators: Dict[str, str] = None) -> ConditionalResult:
+        """Get popular movies unless they are unchanged since ``validators`` were issued.
+
+        Adapters whose upstream supports conditional requests should override
+        the ``*_conditional`` methods; the defaults always fetch the full value.
+
+        Args:
+            page: Page number for pagination
+            validators: Validators returned with the cached copy, if any
+
+        Returns:
+            ConditionalResult holding the list of movie dictionaries
+        """
+        return ConditionalResult(self.get_popular(page=page))
+
+    def get_movie_details_conditional(
+        self, movie_id: int, validators: Dict[str, str] = None, raw: bool = False
+    ) -> ConditionalResult:
+        """Get movie details unless they are unchanged since ``validators`` were issued.
+
+        With ``raw`` the details are returned as encoded JSON bytes.
+        """
+        movie = self.get_movie_details(movie_id=movie_id)
+        if raw and movie is not None:
+            movie = json.dumps(movie).encode()
+        return ConditionalResult(movie)
+
+    def get_movie_details_raw(self, movie_id: int) -> Optional[bytes]:
+        """Get the details of a movie as encoded JSON bytes.
+
+        Adapters that receive the details as JSON should override this to hand
+        the bytes on without decoding them; the default encodes the details.
+
+        Args:
+            movie_id: The ID of the movie to retrieve
+
+        Returns:
+            UTF-8 JSON document of the movie details, or None if not found
+        """
+        return self.get_movie_details_conditional(movie_id=movie_id, raw=True).value
+
+    def get_popular_versioned(self, page: int = 1) -> VersionedResult:
+        """Get popular movies with the version of the copy they were served from.
+
+        Adapters that cache should override the ``*_versioned`` methods so callers
+        can reuse work derived from an unchanged copy; the defaults return no
+        version.
+
+        Args:
+            page: Page number for pagination
+
+        Returns:
+            VersionedResult holding the list of movie dictionaries
+        """
+        return VersionedResult(self.get_popular(page=page))
+
+    def get_movie_details_versioned(self, movie_id: int) -> VersionedResult:
+        """Get movie details with the version of the copy they were served from."""
+        return VersionedResult(self.get_movie_details(movie_id=movie_id))
+
+    async def get_popular_async(self, page: int = 1) -> List[Dict]:
+        """Get popular movies without blocking the event loop.
+
+        Adapters with non-blocking I/O should override the ``*_async`` methods;
+        the defaults run the blocking method in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_popular, page=page)
+
+    async def get_movie_details_async(self, movie_id: int) -> Dict:
+        """Get detailed information for a specific movie without blocking the event loop."""
+        return await asyncio.to_thread(self.get_movie_details, movie_id=movie_id)
+
+    async def get_movie_details_raw_async(self, movie_id: int) -> Optional[bytes]:
+        """Get the details of a movie as encoded JSON bytes without blocking the event loop."""
+        return await asyncio.to_thread(self.get_movie_details_raw, movie_id=movie_id)
+
+    async def get_movie_details_many_async(self, movie_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Get detailed information for several movies without blocking the event loop."""
+        return await asyncio.to_thread(self.get_movie_details_many, movie_ids=movie_ids)
+
+    async def get_movie_details_raw_many_async(self, movie_ids: Iterable[int]) -> MovieDetailsBatch:
+        """Get the details of several movies as encoded JSON bytes without blocking the event loop."""
+        return await asyncio.to_thread(self.get_movie_details_raw_many, movie_ids=movie_ids)
+
+    async def get_popular_versioned_async(self, page: int = 1) -> VersionedResult:
+        """Get popular movies with the version of their copy without blocking the event loop."""
+        return VersionedResult(await self.get_popular_async(page=page))
+
+    async def get_movie_details_versioned_async(self, movie_id: int) -> VersionedResult:
+        """Get movie details with the version of their copy without blocking the event loop."""
+        return VersionedResult(await self.get_movie_details_async(movie_id=movie_id))
@@ -0,0 +1,304 @@
+"""Asynchronous TheMovieDB API client."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Coroutine, Dict, Hashable, Optional
+
+from app.config import Config
+from app.domain.exceptions import (
+    MovieAPIConnectionError,
+    MovieAPIResponseError,
+    RateLimitExceededError,
+    UpstreamRateLimitError,
+)
+from app.domain.ports.movie_repository import ConditionalResult
+from app.infrastructure.api.circuit_breaker import (
+    CircuitBreaker,
+    create_breakers,
+    endpoint_family,
+)
+from app.infrastructure.api.conditional import request_headers, response_validators
+from app.infrastructure.api.rate_limiter import TokenBucket
+from app.infrastructure.api.retry_policy import RetryPolicy, parse_retry_after
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - aiohttp is only needed for TMDB_CLIENT=async
+    aiohttp = None
+
+
+class AsyncTMDBClient:
+    """asyncio client for TheMovieDB API.
+
+    All upstream I/O runs on one event loop in a background thread, sharing a
+    single ``aiohttp.ClientSession`` and its keep-alive connection pool. Any
+    number of requests can wait on the loop without holding a thread each;
+    the pool size bounds how many are on the wire at once. Callers on other
+    event loops (e.g. Flask async views) await the result through a bridged
+    future, and blocking callers can use ``run``.
+
+    Concurrent identical requests are coalesced into a single upstream call,
+    and failed calls are retried according to a ``RetryPolicy`` without
+    blocking the loop between attempts. Each endpoint family sits behind a
+    ``CircuitBreaker``, and an optional ``TokenBucket`` queues calls on the
+    loop to stay within the request quota. ``get_conditional`` revalidates a
+    cached copy so an unchanged body is not downloaded again.
+    """
+
+    BASE_URL = "https://api.themoviedb.org/3"
+    MAX_RETRIES = 3
+    TIMEOUT = 10
+    POOL_MAXSIZE = 100
+    RATE_LIMIT_MAX_WAIT = 2  # seconds
+
+    def __init__(
+        self,
+        api_key: str = None,
+        pool_maxsize: int = None,
+        base_url: str = None,
+        retry_policy: RetryPolicy = None,
+        circuit_breakers: Dict[str, CircuitBreaker] = None,
+        rate_limiter: TokenBucket = None,
+        rate_limit_max_wait: float = None,
+    ):
+        """Initialize the client and start its event loop.
+
+        Args:
+            api_key: TheMovieDB API key
+            pool_maxsize: Maximum number of concurrent upstream connections
+            base_url: Override of the API base URL (e.g. for a local stub)
+            retry_policy: Backoff, deadline and retry budget for failed calls
+            circuit_breakers: Breakers keyed by endpoint family ("popular", "details")
+            rate_limiter: Token bucket every upstream attempt takes a token from, or None
+            rate_limit_max_wait: Seconds a call may queue for a token
+        """
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for the async TMDB client")
+
+        self.api_key = api_key or Config.TMDB_API_KEY
+        if not self.api_key:
+            raise ValueError("TMDB_API_KEY is required")
+
+        self.base_url = base_url or self.BASE_URL
+        self.pool_maxsize = pool_maxsize or self.POOL_MAXSIZE
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=self.MAX_RETRIES)
+        self.circuit_breakers = circuit_breakers or create_breakers()
+        self.rate_limiter = rate_limiter
+        self.rate_limit_max_wait = rate_limit_max_wait or self.RATE_LIMIT_MAX_WAIT
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="tmdb-async", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the client's event loop."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Coroutine):
+        """Run a coroutine on the client's event loop and block until it finishes."""
+        return self.submit(coro).result()
+
+    def close(self) -> None:
+        """Close pooled connections and stop the event loop."""
+        if not self._loop.is_running():
+            return
+        if self._session is not None:
+            self.run(self._session.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def stats(self) -> Dict:
+        """Return upstream request, retry and circuit breaker counters."""
+        return {
+            "executed_requests": self.executed,
+            "coalesced_requests": self.coalesced,
+            **self.retry_policy.stats(),
+            "circuits": {family: breaker.stats() for family, breaker in self.circuit_breakers.items()},
+            "rate_limiter": self.rate_limiter.stats() if self.rate_limiter is not None else None,
+        }
+
+    async def _get(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        """Make a GET request to TheMovieDB API.
+
+        Can be awaited from any event loop. Only one request per endpoint and
+        query parameters is in flight at a time; concurrent callers share its
+        result or its exception.
+
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+
+        Returns:
+            Response data as dictionary or None if resource not found
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open; no request is made
+            RateLimitExceededError: If no rate limit token is available in time; no request is made
+            UpstreamRateLimitError: If TheMovieDB keeps answering 429 after the allowed retries
+            MovieAPIConnectionError: If the API request fails due to connection issues
+            MovieAPIResponseError: If the API request fails due to response errors
+        """
+        return (await self.get_conditional(endpoint, params)).value
+
+    async def get_conditional(
+        self, endpoint: str, params: Dict = None, validators: Dict[str, str] = None, raw: bool = False
+    ) -> ConditionalResult:
+        """Make a GET request, conditional on the validators of a cached copy.
+
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            validators: Validators returned with the cached copy, if any
+            raw: Return the response body as undecoded JSON bytes
+
+        Returns:
+            ConditionalResult with the response data and its validators, or
+            ``not_modified`` set if TheMovieDB answered 304
+
+        Raises:
+            The same errors as ``_get``
+        """
+        params = dict(params or {})
+        headers = request_headers(validators)
+        if asyncio.get_running_loop() is self._loop:
+            return await self._coalesced(endpoint, params, headers, raw)
+        return await asyncio.wrap_future(self.submit(self._coalesced(endpoint, params, headers, raw)))
+
+    async def _coalesced(
+        self, endpoint: str, params: Dict, headers: Dict[str, str], raw: bool = False
+    ) -> ConditionalResult:
+        key = (endpoint, tuple(sorted(params.items())), tuple(sorted(headers.items())), raw)
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executed += 1
+            task = self._in_flight[key] = self._loop.create_task(
+                self._request(endpoint, params, headers, raw)
+            )
+            task.add_done_callback(lambda _: self._forget(key))
+        else:
+            self.coalesced += 1
+        # A caller giving up (e.g. on its deadline) must not cancel the call for the others
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable) -> None:
+        task = self._in_flight.pop(key)
+        # Retrieve the outcome so a call whose callers all gave up is not reported as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize, limit_per_host=self.pool_maxsize),
+                timeout=aiohttp.ClientTimeout(total=self.TIMEOUT),
+                headers={"Accept": "application/json"},
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+        return self._session
+
+    def _rate_limit_wait(self, deadline: Optional[float]) -> Optional[float]:
+        """Reserve a rate limit token, returning the seconds to wait or None if it comes too late."""
+        if self.rate_limiter is None:
+            return 0.0
+        max_wait = self.rate_limit_max_wait
+        if deadline is not None:
+            max_wait = min(max_wait, deadline - time.monotonic())
+        return self.rate_limiter.reserve(max_wait)
+
+    async def _throttle(self, deadline: Optional[float]) -> bool:
+        """Wait on the loop for a rate limit token; return False if it would not arrive in time."""
+        wait = self._rate_limit_wait(deadline)
+        if wait is None:
+            return False
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+
+    async def _request(
+        self, endpoint: str, params: Dict, headers: Dict[str, str], raw: bool = False
+    ) -> ConditionalResult:
+        """Perform the GET request behind the rate limiter and the circuit breaker."""
+        params["api_key"] = self.api_key
+        url = f"{self.base_url}{endpoint}"
+        deadline = self.retry_policy.start()
+        breaker = self.circuit_breakers[endpoint_family(endpoint)]
+
+        # Fail fast on an open circuit before queueing for a token
+        if breaker.state == CircuitBreaker.OPEN:
+            breaker.before_call()
+        if not await self._throttle(deadline):
+            raise RateLimitExceededError("Timed out waiting for the TheMovieDB rate limit")
+
+        breaker.before_call()
+        try:
+            result = await self._send(url, params, headers, deadline, raw)
+        except Exception as e:
+            breaker.record_error(e)
+            raise
+        breaker.record_success()
+        return result
+
+    async def _send(
+        self, url: str, params: Dict, headers: Dict[str, str], deadline: Optional[float], raw: bool = False
+    ) -> ConditionalResult:
+        """Send the GET request, retrying per the retry policy."""
+        session = self._get_session()
+        policy = self.retry_policy
+
+        attempt = 0
+        while True:
+            retry_after = None
+            timeout = aiohttp.ClientTimeout(total=policy.remaining(deadline, self.TIMEOUT))
+            try:
+                async with session.get(url, params=params, headers=headers, timeout=timeout) as response:
+                    if response.status == 404:
+                        return ConditionalResult(None)
+                    if response.status == 304:
+                        return ConditionalResult(
+                            None, response_validators(response.headers), not_modified=True
+                        )
+                    if response.status < 400:
+                        body = await response.read() if raw else await response.json(content_type=None)
+                        return ConditionalResult(body, response_validators(response.headers))
+                    if response.status == 429:
+                        error = UpstreamRateLimitError("TheMovieDB API rate limit exceeded")
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    elif response.status >= 500:
+                        error = MovieAPIConnectionError(f"TheMovieDB API server error: {response.status}")
+                        if response.status == 503:
+                            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    else:
+                        # Error pages from proxies in front of TheMovieDB may not be JSON
+                        try:
+                            body = await response.json(content_type=None)
+                        except ValueError:
+                            body = None
+                        message = body.get("status_message") if isinstance(body, dict) else None
+                        raise MovieAPIResponseError(message or f"HTTP {response.status}")
+
+            except asyncio.TimeoutError:
+                error = MovieAPIConnectionError("Timeout connecting to TheMovieDB API")
+
+            except aiohttp.ClientConnectionError:
+                error = MovieAPIConnectionError("Failed to connect to TheMovieDB API")
+
+            except MovieAPIResponseError:
+                raise
+
+            except Exception as e:
+                raise MovieAPIConnectionError(f"Unexpected error: {str(e)}")
+
+            delay = policy.next_delay(attempt, deadline, retry_after)
+            if delay is None:
+                raise error
+            # The response is released before backing off, so the connection returns to the pool
+            await asyncio.sleep(delay)
+            if not await self._throttle(deadline):
+                raise error
+            attempt += 1
@@ -0,0 +1,99 @@
+"""HTTP cache headers and conditional GETs for responses built from cached data."""
+
+import hashlib
+
+from flask import current_app, g, request
+
+from app.infrastructure.cache import freshness
+
+WARNING_STALE = '110 - "Response is Stale"'
+WARNING_REVALIDATION_FAILED = '111 - "Revalidation Failed"'
+
+# Shared-cacheable endpoints and the setting holding their max-age
+PUBLIC_ENDPOINTS = {
+    "movies.get_movies": "CACHE_DETAILS_TTL_SECONDS",
+    "movies.get_popular_movies": "CACHE_POPULAR_TTL_SECONDS",
+    "movies.get_movie_details": "CACHE_DETAILS_TTL_SECONDS",
+    "movies.search_movies": "CACHE_POPULAR_TTL_SECONDS",
+    "movies.discover_movies": "CACHE_POPULAR_TTL_SECONDS",
+}
+# Per-user endpoints clients must revalidate on every use
+PRIVATE_ENDPOINTS = {"user_favorites.get_user_favorites"}
+
+
+def _etag(*parts: bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def not_modified():
+    """Return a 304 response if the client's copy matches the cached data served so far, else None.
+
+    Views call this once their data is loaded and before serialising it. The
+    ETag is derived from the request URL and the versions of the cache entries
+    the request was served, so an unchanged poll skips JSON encoding entirely.
+    Without recorded versions the ETag falls back to a hash of the body.
+    """
+    versions = freshness.versions()
+    if not versions:
+        return None
+    g.cache_etag = _etag(
+        request.full_path.encode(), *(f"{key}={version}".encode() for key, version in sorted(versions))
+    )
+    if request.if_none_match.contains_weak(g.cache_etag):
+        return current_app.response_class(status=304)
+    return None
+
+
+def _set_cache_control(response, endpoint: str) -> None:
+    if endpoint in PRIVATE_ENDPOINTS:
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return
+    response.cache_control.public = True
+    # Stale data must not be cached downstream beyond this response
+    stale = freshness.STALE in freshness.markers()
+    response.cache_control.max_age = (
+        0 if stale else int(current_app.config.get(PUBLIC_ENDPOINTS[endpoint], 0))
+    )
+
+
+def register_cache_headers(app):
+    """Register hooks adding validators, Cache-Control and staleness warnings to responses.
+
+    ``not_modified`` is registered as the ``not_modified`` extension for views
+    to call before serialising their data.
+    """
+    app.extensions["not_modified"] = not_modified
+
+    @app.before_request
+    def reset_freshness():
+        """Clear staleness and versions recorded by a previous request on this thread."""
+        freshness.reset()
+
+    @app.after_request
+    def add_validators(response):
+        """Add ETag, Cache-Control and Vary to cacheable GETs and answer If-None-Match with 304."""
+        endpoint = request.endpoint
+        if request.method not in ("GET", "HEAD") or response.status_code not in (200, 304):
+            return response
+        if endpoint not in PUBLIC_ENDPOINTS and endpoint not in PRIVATE_ENDPOINTS:
+            return response
+
+        response.set_etag(g.get("cache_etag") or _etag(response.get_data()))
+        _set_cache_control(response, endpoint)
+        response.vary.add("Accept-Encoding")
+        return response.make_conditional(request)
+
+    @app.after_request
+    def add_staleness_warning(response):
+        """Add Warning headers when stale data was served."""
+        markers = freshness.markers()
+        if freshness.STALE in markers:
+            response.headers.add("Warning", WARNING_STALE)
+        if freshness.REVALIDATION_FAILED in markers:
+            response.headers.add("Warning", WARNING_REVALIDATION_FAILED)
+        return response
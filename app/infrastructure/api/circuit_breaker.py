@@ -0,0 +1,151 @@
+"""Circuit breaker for upstream API calls."""
+
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from app.domain.exceptions import (
+    CircuitOpenError,
+    MovieAPIConnectionError,
+    RateLimitExceededError,
+)
+
+
+class CircuitBreaker:
+    """Fail fast while an upstream keeps failing.
+
+    The breaker starts closed and lets every call through. After
+    ``failure_threshold`` consecutive connection failures it opens and
+    rejects calls with ``CircuitOpenError`` without touching the upstream.
+    Once ``recovery_timeout`` has passed it goes half-open and lets up to
+    ``half_open_max_calls`` trial calls through: a success closes it again,
+    a failure re-opens it for another ``recovery_timeout``.
+
+    Only ``MovieAPIConnectionError`` counts as a failure; an upstream that
+    answers with a client error is healthy, and so is one rejecting calls over
+    its rate limit (``RateLimitExceededError``), which the retry policy backs
+    off from instead.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30,
+        half_open_max_calls: int = 1,
+    ):
+        """Initialize a closed breaker.
+
+        Args:
+            name: Name used in errors and metrics
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before allowing trial calls
+            half_open_max_calls: Trial calls allowed at once while half-open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Return the current state, moving from open to half-open once the timeout passed."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self.opened += 1
+
+    def before_call(self) -> None:
+        """Admit a call or raise CircuitOpenError."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and self._trials < self.half_open_max_calls:
+                self._trials += 1
+                return
+            self.rejected += 1
+        raise CircuitOpenError(f"TheMovieDB {self.name} circuit is open")
+
+    def record_success(self) -> None:
+        """Record a call that reached a healthy upstream."""
+        with self._lock:
+            self._failures = 0
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """Record a call that failed to reach the upstream."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._failures += 1
+            if self._state == self.CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    @staticmethod
+    def is_failure(error: Exception) -> bool:
+        """Whether ``error`` means the upstream could not be reached or failed to answer."""
+        return isinstance(error, MovieAPIConnectionError) and not isinstance(error, RateLimitExceededError)
+
+    def record_error(self, error: Exception) -> None:
+        """Record a call that raised ``error``, as a failure only if the upstream failed."""
+        if self.is_failure(error):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Return ``fn()`` if the circuit admits the call, recording its outcome."""
+        self.before_call()
+        try:
+            result = fn()
+        except Exception as e:
+            self.record_error(e)
+            raise
+        self.record_success()
+        return result
+
+    def stats(self) -> Dict:
+        """Return the state and counters of the breaker."""
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "opened": self.opened,
+                "rejected_calls": self.rejected,
+            }
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Return the circuit breaker family of a TheMovieDB endpoint."""
+    return "popular" if endpoint.startswith("/movie/popular") else "details"
+
+
+def create_breakers(failure_threshold: int = 5, recovery_timeout: float = 30) -> Dict[str, CircuitBreaker]:
+    """Create one breaker per TheMovieDB endpoint family."""
+    return {
+        family: CircuitBreaker(family, failure_threshold=failure_threshold, recovery_timeout=recovery_timeout)
+        for family in ("popular", "details")
+    }
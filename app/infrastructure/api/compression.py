@@ -0,0 +1,158 @@
+"""Response compression negotiated through Accept-Encoding."""
+
+import gzip
+import threading
+import time
+from typing import Dict, List, Optional
+
+from flask import request
+
+from app.infrastructure.cache.memory_cache import MemoryCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is an optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/html", "text/plain", "text/css", "application/javascript"}
+
+
+class ResponseCompressor:
+    """Compress responses with brotli or gzip.
+
+    Responses smaller than ``min_size`` are sent as they are: below about a
+    kilobyte the framing overhead eats most of the saving. Compressed bodies
+    of responses that carry an ETag are kept in a bounded LRU keyed by ETag
+    and encoding, so a hot page is compressed once rather than on every hit.
+    Compressing changes the bytes on the wire, so the ETag of a compressed
+    response is marked weak; ``If-None-Match`` still matches it.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cache: MemoryCache = None,
+        cache_ttl: float = 3600,
+    ):
+        """Initialize the compressor.
+
+        Args:
+            min_size: Smallest body in bytes worth compressing
+            gzip_level: gzip compression level (1-9)
+            brotli_quality: brotli quality (0-11); used when the brotli package is installed
+            cache: LRU of compressed bodies (a 256-entry MemoryCache by default)
+            cache_ttl: Seconds a compressed body is kept
+        """
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings: List[str] = ["br", "gzip"] if brotli is not None else ["gzip"]
+        self._cache = cache or MemoryCache(max_entries=256)
+        self.cache_ttl = cache_ttl
+        self._lock = threading.Lock()
+        self.compressed = 0
+        self.cache_hits = 0
+        self.skipped_small = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def negotiate(self, accept_encodings) -> Optional[str]:
+        """Return the best encoding accepted by the client, or None to send the body as is."""
+        return accept_encodings.best_match(self.encodings)
+
+    def encode(self, encoding: str, data: bytes) -> bytes:
+        """Compress ``data`` with ``encoding``."""
+        if encoding == "br":
+            return brotli.compress(data, quality=self.brotli_quality)
+        # mtime=0 keeps the output deterministic for identical bodies
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def _compressed_body(self, encoding: str, data: bytes, etag: Optional[str]) -> bytes:
+        key = f"{encoding}:{etag}" if etag else None
+        body = self._cache.get(key) if key else None
+        if body is not None:
+            with self._lock:
+                self.cache_hits += 1
+            return body
+
+        start = time.thread_time()
+        body = self.encode(encoding, data)
+        elapsed = time.thread_time() - start
+        with self._lock:
+            self.cpu_seconds += elapsed
+        if key:
+            self._cache.set(key, body, self.cache_ttl)
+        return body
+
+    def _compressible(self, response) -> bool:
+        return (
+            request.method != "HEAD"
+            and response.status_code == 200
+            and not response.direct_passthrough
+            and not response.is_streamed
+            and "Content-Encoding" not in response.headers
+            and response.mimetype in COMPRESSIBLE_MIMETYPES
+            and not response.cache_control.no_transform
+        )
+
+    def compress(self, response):
+        """Compress ``response`` in place if the client accepts it and it is large enough."""
+        if not self._compressible(response):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        data = response.get_data()
+        if len(data) < self.min_size:
+            with self._lock:
+                self.skipped_small += 1
+            return response
+        encoding = self.negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        etag, _ = response.get_etag()
+        body = self._compressed_body(encoding, data, etag)
+        if len(body) >= len(data):
+            return response
+
+        with self._lock:
+            self.compressed += 1
+            self.bytes_in += len(data)
+            self.bytes_out += len(body)
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def stats(self) -> Dict:
+        """Return compression counters, bytes saved and CPU time spent compressing."""
+        with self._lock:
+            return {
+                "encodings": list(self.encodings),
+                "compressed_responses": self.compressed,
+                "cache_hits": self.cache_hits,
+                "skipped_small": self.skipped_small,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "bytes_saved": self.bytes_in - self.bytes_out,
+                "cpu_seconds": round(self.cpu_seconds, 6),
+                "cache": self._cache.stats(),
+            }
+
+
+def register_compression(app, compressor: ResponseCompressor):
+    """Compress responses with ``compressor``.
+
+    Flask runs ``after_request`` hooks in reverse registration order, so this
+    must be registered before the hooks that set ETags and answer 304s; the
+    compressor then sees the final, uncompressed response.
+    """
+
+    @app.after_request
+    def compress_response(response):
+        """Compress the response body when the client accepts it."""
+        return compressor.compress(response)
@@ -0,0 +1,24 @@
+"""HTTP cache validators for conditional upstream requests."""
+
+from typing import Dict, Mapping, Optional
+
+
+def request_headers(validators: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Return the conditional request headers for validators from an earlier response."""
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def response_validators(headers: Mapping[str, str]) -> Optional[Dict[str, str]]:
+    """Return the ``ETag`` / ``Last-Modified`` validators of a response, or None if it has neither."""
+    validators = {}
+    if headers.get("ETag"):
+        validators["etag"] = headers["ETag"]
+    if headers.get("Last-Modified"):
+        validators["last_modified"] = headers["Last-Modified"]
+    return validators or None
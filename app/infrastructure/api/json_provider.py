@@ -0,0 +1,116 @@
+"""Fast JSON provider for the Flask app."""
+
+import json
+import os
+import re
+from typing import Any, List, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+from app.domain.entities.raw_json import RawJSON
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional dependency
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider encoding with orjson when it is installed.
+
+    orjson serialises TheMovieDB payloads several times faster than the
+    standard library and produces bytes, which go into the response without
+    an extra encode step. Keys are not sorted, as sorting is a large part of
+    the encoding cost; types orjson does not handle (including datetimes, so
+    they keep Flask's HTTP date format) go through Flask's default hook.
+    Without orjson the provider behaves like Flask's default one, plus
+    ``RawJSON`` support.
+    """
+
+    sort_keys = False
+
+    def __init__(self, app, use_orjson: bool = True):
+        """Initialize the provider for ``app``.
+
+        Args:
+            app: Flask application
+            use_orjson: Use orjson when it is installed; False forces the standard library
+        """
+        super().__init__(app)
+        self.use_orjson = use_orjson and orjson is not None
+
+    @property
+    def backend(self) -> str:
+        """Name of the encoder in use."""
+        return "orjson" if self.use_orjson else "json"
+
+    def _indent(self) -> bool:
+        return (self.compact is None and self._app.debug) or self.compact is False
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        """Serialize ``obj`` to UTF-8 JSON bytes, splicing ``RawJSON`` values in verbatim.
+
+        orjson releases with ``orjson.Fragment`` embed the bytes while encoding.
+        Otherwise each value is encoded as a placeholder string, and the
+        placeholders are replaced in one pass over the output.
+        """
+        if isinstance(obj, RawJSON):
+            return bytes(obj)
+
+        fragments: List[bytes] = []
+        marker = os.urandom(6).hex()
+        use_fragments = self.use_orjson and hasattr(orjson, "Fragment")
+
+        def default(value):
+            if isinstance(value, RawJSON):
+                if use_fragments:
+                    return orjson.Fragment(bytes(value))
+                fragments.append(bytes(value))
+                return f"\x00{marker}:{len(fragments) - 1}\x00"
+            return self.default(value)
+
+        if self.use_orjson:
+            option = (
+                orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            )
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            encoded = orjson.dumps(obj, default=default, option=option)
+        else:
+            encoded = json.dumps(
+                obj,
+                default=default,
+                ensure_ascii=False,
+                sort_keys=self.sort_keys,
+                indent=2 if indent else None,
+            ).encode()
+
+        if not fragments:
+            return encoded
+        # Both encoders escape NUL as \u0000; split leaves the fragment indexes at the odd positions
+        pieces = re.split(rf'"\\u0000{marker}:(\d+)\\u0000"'.encode(), encoded)
+        pieces[1::2] = [fragments[int(index)] for index in pieces[1::2]]
+        return b"".join(pieces)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize ``obj`` to a JSON string.
+
+        Keyword arguments specific to the standard library (``cls``,
+        ``separators``...) make the call fall back to Flask's default provider.
+        """
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize JSON from a string or bytes."""
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Serialize the arguments like ``jsonify`` into an ``application/json`` response."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self.dumps_bytes(obj, indent=self._indent()) + b"\n", mimetype=self.mimetype
+        )
@@ -0,0 +1,216 @@
+"""Token-bucket rate limiting for upstream API calls."""
+
+import fcntl
+import logging
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is an optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+def take_token(
+    tokens: float, updated: float, now: float, rate: float, capacity: float, max_wait: float
+) -> Tuple[float, Optional[float]]:
+    """Reserve one token from a bucket, allowing the balance to go into debt.
+
+    The bucket refills at ``rate`` tokens per second up to ``capacity``. A
+    caller that finds it empty still takes a token and is told how long to
+    wait for it, so queued callers are spaced ``1 / rate`` apart instead of
+    retrying in a burst. A reservation that would wait longer than
+    ``max_wait`` is refused and leaves the bucket untouched.
+
+    Returns:
+        Tuple of the new token balance and the seconds to wait, or None if refused
+    """
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    wait = max(0.0, (1 - tokens) / rate)
+    if wait > max_wait:
+        return tokens, None
+    return tokens - 1, wait
+
+
+class TokenBucket:
+    """Per-process token bucket.
+
+    ``reserve`` never sleeps itself: it returns the delay the caller has to
+    wait, so blocking and asyncio clients can share one limiter.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Sustained requests per second
+            capacity: Burst size in requests; defaults to one second of ``rate``
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.granted = 0
+        self.delayed = 0
+        self.rejected = 0
+
+    def _take(self, max_wait: float) -> Optional[float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, wait = take_token(self._tokens, self._updated, now, self.rate, self.capacity, max_wait)
+            if wait is not None:
+                self._tokens, self._updated = tokens, now
+            return wait
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Reserve a token, returning the seconds to wait for it or None if it takes longer than max_wait."""
+        wait = self._take(max_wait)
+        with self._lock:
+            if wait is None:
+                self.rejected += 1
+            else:
+                self.granted += 1
+                self.delayed += wait > 0
+        return wait
+
+    def stats(self) -> Dict:
+        """Return reservation counters."""
+        return {"granted": self.granted, "delayed": self.delayed, "rejected": self.rejected}
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket shared by the worker processes of one host.
+
+    The balance lives in a small file, updated under an exclusive ``flock``,
+    so the limit holds for all workers without a Redis server.
+    """
+
+    _STATE = struct.Struct("dd")
+
+    def __init__(self, path: str, rate: float, capacity: float = None):
+        """Initialize the bucket backed by ``path``, creating the file if needed."""
+        super().__init__(rate, capacity)
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    def _take(self, max_wait: float) -> Optional[float]:
+        # The file stores wall-clock time, which unlike the monotonic clock is shared across processes
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                raw = os.pread(self._fd, self._STATE.size, 0)
+                tokens, updated = (
+                    self._STATE.unpack(raw) if len(raw) == self._STATE.size else (self.capacity, now)
+                )
+                tokens, wait = take_token(tokens, min(updated, now), now, self.rate, self.capacity, max_wait)
+                if wait is not None:
+                    os.pwrite(self._fd, self._STATE.pack(tokens, now), 0)
+                return wait
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Close the state file."""
+        os.close(self._fd)
+
+
+class RedisTokenBucket(TokenBucket):
+    """Token bucket shared by every worker through Redis.
+
+    The reservation runs as one Lua script using the Redis server clock, so
+    it is atomic across processes and hosts. If Redis is unreachable the
+    bucket falls back to its per-process state for ``retry_interval``
+    seconds rather than blocking or rejecting upstream calls.
+    """
+
+    SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = math.max(0, (1 - tokens) / rate)
+if wait > max_wait then
+    return '-1'
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+    def __init__(
+        self, client, rate: float, capacity: float = None, key: str = "tmdb:rate-limit", retry_interval=5.0
+    ):
+        """Initialize the bucket around a redis-py compatible client."""
+        super().__init__(rate, capacity)
+        self.key = key
+        self.retry_interval = retry_interval
+        self._script = client.register_script(self.SCRIPT)
+        self._unavailable_until = 0.0
+        self.errors = 0
+
+    @classmethod
+    def from_url(
+        cls, url: str, rate: float, socket_timeout: float = 0.25, **kwargs
+    ) -> Optional["RedisTokenBucket"]:
+        """Create a bucket for ``url``, or None when redis-py is not installed."""
+        if redis is None or not url:
+            return None
+        client = redis.Redis.from_url(
+            url, socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout
+        )
+        return cls(client, rate, **kwargs)
+
+    def _take(self, max_wait: float) -> Optional[float]:
+        if time.monotonic() < self._unavailable_until:
+            return super()._take(max_wait)
+        try:
+            wait = float(self._script(keys=[self.key], args=[self.rate, self.capacity, max_wait]))
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+                self._unavailable_until = time.monotonic() + self.retry_interval
+            logger.warning(
+                "Redis rate limiter failed, limiting per process for %ss: %s", self.retry_interval, e
+            )
+            return super()._take(max_wait)
+        return None if wait < 0 else wait
+
+    def stats(self) -> Dict:
+        """Return reservation and Redis error counters."""
+        return {**super().stats(), "errors": self.errors}
+
+
+def create_rate_limiter(
+    rate: float,
+    capacity: float = None,
+    shared: str = "none",
+    redis_url: str = None,
+    path: str = None,
+    socket_timeout: float = 0.25,
+) -> Optional[TokenBucket]:
+    """Create the limiter for ``shared`` mode: "none", "file" or "redis".
+
+    Returns None when ``rate`` is not positive, which disables rate limiting.
+    The redis mode falls back to a per-process bucket when redis-py is not installed.
+    """
+    if not rate or rate <= 0:
+        return None
+    if shared == "redis":
+        bucket = RedisTokenBucket.from_url(redis_url, rate, socket_timeout, capacity=capacity)
+        if bucket is not None:
+            return bucket
+    if shared == "file":
+        return FileTokenBucket(path, rate, capacity)
+    return TokenBucket(rate, capacity)
@@ -0,0 +1,162 @@
+"""Retry timing and budgeting for upstream API calls."""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+
+class RetryBudget:
+    """Process-wide cap on retries as a fraction of requests.
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one, so
+    retries stay below ``ratio`` of the request rate once the upstream starts
+    failing. A small time-based allowance keeps retries possible at low
+    traffic. The balance starts full and is capped, so a quiet period cannot
+    bank more than ``max_tokens`` retries.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries_per_second: float = 1.0, max_tokens: float = 10.0):
+        """Initialize a full budget.
+
+        Args:
+            ratio: Retries allowed per request
+            min_retries_per_second: Retries allowed regardless of traffic
+            max_tokens: Maximum number of retries that can be saved up
+        """
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.denied = 0
+
+    def _deposit(self, amount: float) -> None:
+        now = time.monotonic()
+        refill = (now - self._updated) * self.min_retries_per_second
+        self._tokens = min(self.max_tokens, self._tokens + refill + amount)
+        self._updated = now
+
+    def record_request(self) -> None:
+        """Credit the budget for one upstream request."""
+        with self._lock:
+            self._deposit(self.ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraw one retry, returning False when the budget is exhausted."""
+        with self._lock:
+            self._deposit(0)
+            if self._tokens < 1:
+                self.denied += 1
+                return False
+            self._tokens -= 1
+            self.retries += 1
+            return True
+
+    def stats(self) -> Dict[str, int]:
+        """Return retry counters."""
+        return {"retries": self.retries, "retries_denied": self.denied}
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by a per-request deadline.
+
+    The delay before retry ``n`` (0-based) is uniform in
+    ``[0, min(max_delay, base_delay * 2 ** n)]``, which spreads out retries
+    from many clients instead of synchronising them. A ``Retry-After`` value
+    from the upstream replaces the computed delay. No retry is scheduled if
+    it would start after the request's deadline or the budget is exhausted.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 5.0,
+        deadline: Optional[float] = None,
+        budget: RetryBudget = None,
+        rng: Callable[[], float] = random.random,
+    ):
+        """Initialize the policy.
+
+        Args:
+            max_attempts: Total attempts per request, including the first
+            base_delay: Upper bound of the first backoff in seconds
+            max_delay: Upper bound of any computed backoff in seconds
+            deadline: Seconds a request may take including retries, or None for no limit
+            budget: Shared retry budget, or None for unlimited retries
+            rng: Source of uniform numbers in [0, 1) for the jitter
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.budget = budget
+        self._rng = rng
+
+    def start(self) -> Optional[float]:
+        """Record a new request and return its absolute monotonic deadline."""
+        if self.budget is not None:
+            self.budget.record_request()
+        return None if self.deadline is None else time.monotonic() + self.deadline
+
+    def backoff(self, attempt: int) -> float:
+        """Return the jittered delay before retrying after ``attempt`` (0-based)."""
+        return self._rng() * min(self.max_delay, self.base_delay * 2**attempt)
+
+    def next_delay(
+        self,
+        attempt: int,
+        deadline: Optional[float],
+        retry_after: Optional[float] = None,
+        max_wait: Optional[float] = None,
+    ):
+        """Return the seconds to wait before the next attempt, or None to give up.
+
+        Args:
+            attempt: The 0-based attempt that just failed
+            deadline: Absolute monotonic deadline returned by ``start``
+            retry_after: Delay requested by the upstream, if any
+            max_wait: Longest delay the caller is willing to wait; longer ones give up
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt) if retry_after is None else retry_after
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return None
+        if max_wait is not None and delay > max_wait:
+            return None
+        if self.budget is not None and not self.budget.try_spend():
+            return None
+        return delay
+
+    @staticmethod
+    def remaining(deadline: Optional[float], timeout: float) -> float:
+        """Return the per-attempt timeout, shortened to what is left of the deadline."""
+        if deadline is None:
+            return timeout
+        return max(0.01, min(timeout, deadline - time.monotonic()))
+
+    def stats(self) -> Dict[str, int]:
+        """Return retry budget counters."""
+        return self.budget.stats() if self.budget is not None else {}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -1,31 +1,136 @@
 """TheMovieDB API client."""
 
 import time
+from http.cookiejar import DefaultCookiePolicy
 from typing import Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from app.config import Config
-from app.domain.exceptions import MovieAPIConnectionError, MovieAPIResponseError
+from app.domain.exceptions import (
+    MovieAPIConnectionError,
+    MovieAPIResponseError,
+    RateLimitExceededError,
+    UpstreamRateLimitError,
+)
+from app.domain.ports.movie_repository import ConditionalResult
+from app.infrastructure.api.circuit_breaker import (
+    CircuitBreaker,
+    create_breakers,
+    endpoint_family,
+)
+from app.infrastructure.api.conditional import request_headers, response_validators
+from app.infrastructure.api.rate_limiter import TokenBucket
+from app.infrastructure.api.retry_policy import RetryPolicy, parse_retry_after
+from app.infrastructure.api.single_flight import SingleFlight
 
 
 class TMDBClient:
-    """Client for TheMovieDB API."""
+    """Client for TheMovieDB API.
+
+    The client owns a single ``requests.Session`` backed by a pooled
+    ``HTTPAdapter``, so TCP/TLS connections to TheMovieDB are kept alive and
+    reused across requests and worker threads instead of being opened per call.
+    Concurrent identical requests are coalesced into a single upstream call.
+    Failed calls are retried according to a ``RetryPolicy``, and each endpoint
+    family sits behind a ``CircuitBreaker`` that fails fast while TheMovieDB
+    keeps failing. An optional ``TokenBucket`` spaces out calls to stay within
+    TheMovieDB's request quota, queueing bursts instead of rejecting them.
+    ``get_conditional`` revalidates a cached copy with its ``ETag`` /
+    ``Last-Modified`` validators, so an unchanged body is not downloaded again.
+    """
 
     BASE_URL = "https://api.themoviedb.org/3"
     MAX_RETRIES = 3
-    RETRY_DELAY = 1  # seconds
     TIMEOUT = 10
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 10
+    RATE_LIMIT_MAX_WAIT = 2  # seconds
+    MAX_RETRY_SLEEP = 2  # seconds
+
+    def __init__(
+        self,
+        api_key: str = None,
+        pool_connections: int = None,
+        pool_maxsize: int = None,
+        pool_block: bool = False,
+        base_url: str = None,
+        retry_policy: RetryPolicy = None,
+        circuit_breakers: Dict[str, CircuitBreaker] = None,
+        rate_limiter: TokenBucket = None,
+        rate_limit_max_wait: float = None,
+        max_retry_sleep: float = None,
+    ):
+        """Initialize the client with API key and connection pool settings.
 
-    def __init__(self, api_key: str = None):
-        """Initialize the client with API key."""
+        Args:
+            api_key: TheMovieDB API key
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum number of kept-alive connections per host
+            pool_block: Block when the per-host pool is exhausted instead of
+                opening extra, non-pooled connections
+            base_url: Override of the API base URL (e.g. for a local stub)
+            retry_policy: Backoff, deadline and retry budget for failed calls
+            circuit_breakers: Breakers keyed by endpoint family ("popular", "details")
+            rate_limiter: Token bucket every upstream attempt takes a token from, or None
+            rate_limit_max_wait: Seconds a call may queue for a token
+            max_retry_sleep: Longest backoff a retry may sleep; a longer one gives up instead
+        """
         self.api_key = api_key or Config.TMDB_API_KEY
         if not self.api_key:
             raise ValueError("TMDB_API_KEY is required")
 
+        self.base_url = base_url or self.BASE_URL
+        self._session = self._create_session(
+            pool_connections=pool_connections or self.POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or self.POOL_MAXSIZE,
+            pool_block=pool_block,
+        )
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=self.MAX_RETRIES)
+        self.circuit_breakers = circuit_breakers or create_breakers()
+        self.rate_limiter = rate_limiter
+        self.rate_limit_max_wait = rate_limit_max_wait or self.RATE_LIMIT_MAX_WAIT
+        self.max_retry_sleep = max_retry_sleep or self.MAX_RETRY_SLEEP
+        self._single_flight = SingleFlight()
+
+    @staticmethod
+    def _create_session(pool_connections: int, pool_maxsize: int, pool_block: bool) -> requests.Session:
+        """Create the pooled, keep-alive session shared by all worker threads.
+
+        urllib3 connection pools are thread-safe. The only other piece of
+        mutable session state is the cookie jar, which is disabled so that
+        concurrent requests never write to it.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive", "Accept": "application/json"})
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._session.close()
+
+    def stats(self) -> Dict:
+        """Return upstream request, retry and circuit breaker counters."""
+        return {
+            **self._single_flight.stats(),
+            **self.retry_policy.stats(),
+            "circuits": {family: breaker.stats() for family, breaker in self.circuit_breakers.items()},
+            "rate_limiter": self.rate_limiter.stats() if self.rate_limiter is not None else None,
+        }
+
     def _get(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
         """Make a GET request to TheMovieDB API.
 
+        Only one request per endpoint and query parameters is in flight at a
+        time; concurrent callers share its result or its exception.
+
         Args:
             endpoint: API endpoint
             params: Query parameters
@@ -34,43 +139,134 @@ class TMDBClient:
             Response data as dictionary or None if resource not found
 
         Raises:
+            CircuitOpenError: If the endpoint's circuit is open; no request is made
+            RateLimitExceededError: If no rate limit token is available in time; no request is made
+            UpstreamRateLimitError: If TheMovieDB keeps answering 429 after the allowed retries
             MovieAPIConnectionError: If the API request fails due to connection issues
             MovieAPIResponseError: If the API request fails due to response errors
         """
-        if params is None:
-            params = {}
+        return self.get_conditional(endpoint, params).value
+
+    def get_conditional(
+        self, endpoint: str, params: Dict = None, validators: Dict[str, str] = None, raw: bool = False
+    ) -> ConditionalResult:
+        """Make a GET request, conditional on the validators of a cached copy.
+
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            validators: Validators returned with the cached copy, if any
+            raw: Return the response body as undecoded JSON bytes
+
+        Returns:
+            ConditionalResult with the response data and its validators, or
+            ``not_modified`` set if TheMovieDB answered 304
+
+        Raises:
+            The same errors as ``_get``
+        """
+        params = dict(params or {})
+        headers = request_headers(validators)
+        key = (endpoint, tuple(sorted(params.items())), tuple(sorted(headers.items())), raw)
+        return self._single_flight.do(key, lambda: self._request(endpoint, params, headers, raw))
+
+    def _rate_limit_wait(self, deadline: Optional[float]) -> Optional[float]:
+        """Reserve a rate limit token, returning the seconds to wait or None if it comes too late."""
+        if self.rate_limiter is None:
+            return 0.0
+        max_wait = self.rate_limit_max_wait
+        if deadline is not None:
+            max_wait = min(max_wait, deadline - time.monotonic())
+        return self.rate_limiter.reserve(max_wait)
+
+    def _throttle(self, deadline: Optional[float]) -> bool:
+        """Wait for a rate limit token, blocking the thread at most ``rate_limit_max_wait``.
 
+        Returns False if the token would not arrive in time.
+        """
+        wait = self._rate_limit_wait(deadline)
+        if wait is None:
+            return False
+        if wait:
+            time.sleep(wait)
+        return True
+
+    def _request(
+        self, endpoint: str, params: Dict, headers: Dict[str, str], raw: bool = False
+    ) -> ConditionalResult:
+        """Perform the GET request behind the rate limiter and the circuit breaker."""
         params["api_key"] = self.api_key
-        url = f"{self.BASE_URL}{endpoint}"
+        url = f"{self.base_url}{endpoint}"
+        deadline = self.retry_policy.start()
+        breaker = self.circuit_breakers[endpoint_family(endpoint)]
+
+        # Fail fast on an open circuit before queueing for a token
+        if breaker.state == CircuitBreaker.OPEN:
+            breaker.before_call()
+        if not self._throttle(deadline):
+            raise RateLimitExceededError("Timed out waiting for the TheMovieDB rate limit")
+        return breaker.call(lambda: self._send(url, params, headers, deadline, raw))
+
+    def _send(
+        self, url: str, params: Dict, headers: Dict[str, str], deadline: Optional[float], raw: bool = False
+    ) -> ConditionalResult:
+        """Send the GET request, retrying per the retry policy.
 
-        for attempt in range(self.MAX_RETRIES):
+        Backoff sleeps here block the calling worker thread. They are bounded by
+        the request deadline, and a retry that would sleep longer than
+        ``max_retry_sleep`` (e.g. a long ``Retry-After``) gives up instead, so
+        callers can fall back to cached data. ``AsyncTMDBClient`` is the
+        non-blocking path: it awaits its backoff on the event loop.
+        """
+        policy = self.retry_policy
+        attempt = 0
+        while True:
+            retry_after = None
             try:
-                response = requests.get(url, params=params, timeout=self.TIMEOUT)
+                response = self._session.get(
+                    url, params=params, headers=headers, timeout=policy.remaining(deadline, self.TIMEOUT)
+                )
 
                 if response.status_code == 404:
-                    return None
+                    return ConditionalResult(None)
+
+                if response.status_code == 304:
+                    return ConditionalResult(None, response_validators(response.headers), not_modified=True)
 
                 response.raise_for_status()
-                return response.json()
+                body = response.content if raw else response.json()
+                return ConditionalResult(body, response_validators(response.headers))
 
             except requests.Timeout:
-                if attempt == self.MAX_RETRIES - 1:
-                    raise MovieAPIConnectionError("Timeout connecting to TheMovieDB API")
-                time.sleep(self.RETRY_DELAY)
+                error = MovieAPIConnectionError("Timeout connecting to TheMovieDB API")
 
             except requests.ConnectionError:
-                if attempt == self.MAX_RETRIES - 1:
-                    raise MovieAPIConnectionError("Failed to connect to TheMovieDB API")
-                time.sleep(self.RETRY_DELAY)
+                error = MovieAPIConnectionError("Failed to connect to TheMovieDB API")
 
             except requests.HTTPError as e:
-                if response.status_code >= 500:
-                    if attempt == self.MAX_RETRIES - 1:
-                        raise MovieAPIConnectionError(f"TheMovieDB API server error: {response.status_code}")
-                    time.sleep(self.RETRY_DELAY)
+                if response.status_code == 429:
+                    error = UpstreamRateLimitError("TheMovieDB API rate limit exceeded")
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                elif response.status_code >= 500:
+                    error = MovieAPIConnectionError(f"TheMovieDB API server error: {response.status_code}")
+                    if response.status_code == 503:
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
                 else:
-                    error_message = response.json().get("status_message", str(e))
-                    raise MovieAPIResponseError(error_message)
+                    # Error pages from proxies in front of TheMovieDB may not be JSON
+                    try:
+                        body = response.json()
+                    except ValueError:
+                        body = None
+                    message = body.get("status_message") if isinstance(body, dict) else None
+                    raise MovieAPIResponseError(message or str(e))
 
             except Exception as e:
                 raise MovieAPIConnectionError(f"Unexpected error: {str(e)}")
+
+            delay = policy.next_delay(attempt, deadline, retry_after, max_wait=self.max_retry_sleep)
+            if delay is None:
+                raise error
+            time.sleep(delay)
+            if not self._throttle(deadline):
+                raise error
+            attempt += 1
@@ -0,0 +1,259 @@
+"""Background warming of the movie cache."""
+
+import fcntl
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from app.infrastructure.repositories.cached_movie_repository import (
+    CachedMovieRepository,
+    WarmResult,
+)
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is an optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class LocalLease:
+    """Lease every worker holds, so each one warms its own process."""
+
+    def acquire(self) -> bool:
+        """Return True; there is no one to compete with."""
+        return True
+
+    def release(self) -> None:
+        """Do nothing."""
+
+
+class FileLease:
+    """Lease held by one worker process per host through an exclusive ``flock``.
+
+    The lock is held until the holder releases it or exits; the next worker
+    trying to acquire it then takes over.
+    """
+
+    def __init__(self, path: str):
+        """Initialize a lease on the lock file ``path``, created if needed."""
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        """Take the lock if it is free; True while this process holds it."""
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        """Release the lock if this process holds it."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class RedisLease:
+    """Lease held by one worker across hosts, as a Redis key with a TTL.
+
+    The holder extends the TTL each time it acquires the lease. If it stops
+    (or Redis cannot be reached) the key expires and another worker takes
+    over, so ``ttl`` should span a few warming intervals.
+    """
+
+    def __init__(self, client, ttl: float, key: str = "movies:cache-warmer:leader"):
+        """Initialize the lease around a redis-py compatible client."""
+        self._client = client
+        self.ttl = ttl
+        self.key = key
+        self.token = uuid.uuid4().hex
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float, socket_timeout: float = 0.25) -> Optional["RedisLease"]:
+        """Create a lease for ``url``, or None when redis-py is not installed."""
+        if redis is None or not url:
+            return None
+        client = redis.Redis.from_url(
+            url, socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout
+        )
+        return cls(client, ttl)
+
+    def acquire(self) -> bool:
+        """Take the lease if it is free or extend it if it is ours."""
+        px = int(self.ttl * 1000)
+        try:
+            if self._client.set(self.key, self.token, nx=True, px=px):
+                return True
+            holder = self._client.get(self.key)
+            if holder is not None and holder.decode() == self.token:
+                self._client.pexpire(self.key, px)
+                return True
+        except Exception as e:
+            logger.warning("Cache warmer lease unavailable: %s", e)
+        return False
+
+    def release(self) -> None:
+        """Give the lease up if it is ours."""
+        try:
+            holder = self._client.get(self.key)
+            if holder is not None and holder.decode() == self.token:
+                self._client.delete(self.key)
+        except Exception as e:
+            logger.warning("Failed to release cache warmer lease: %s", e)
+
+
+def create_lease(
+    mode: str = "none", path: str = None, redis_url: str = None, ttl: float = 30, socket_timeout: float = 0.25
+):
+    """Create the leader lease for ``mode``: "none", "file" or "redis".
+
+    The redis mode falls back to a file lease when redis-py is not installed.
+    """
+    if mode == "redis":
+        lease = RedisLease.from_url(redis_url, ttl, socket_timeout)
+        if lease is not None:
+            return lease
+        mode = "file"
+    if mode == "file":
+        return FileLease(path)
+    return LocalLease()
+
+
+class CacheWarmer:
+    """Keeps the first popular pages, and the movies on them, refreshed ahead of expiry.
+
+    Every ``interval`` seconds the worker holding the lease refreshes each of
+    the first ``pages`` popular pages, then the details of every movie on
+    them, when they expire within ``lead`` seconds. Refreshes are
+    conditional, so unchanged entries cost a 304. With ``lead`` at least
+    ``interval`` entries are refreshed before they expire and users are not
+    the ones paying for a cache miss.
+
+    Each cycle records its refresh lag: how far past their soft TTL the
+    refreshed entries were (0 when warmed in time), and how many were not
+    cached at all.
+    """
+
+    def __init__(
+        self,
+        repository: CachedMovieRepository,
+        pages: int = 3,
+        interval: float = 10.0,
+        lead: float = 15.0,
+        concurrency: int = 4,
+        lease=None,
+    ):
+        """Initialize the warmer.
+
+        Args:
+            repository: Cache to warm
+            pages: Number of popular pages to keep warm, starting at page 1
+            interval: Seconds between warming cycles
+            lead: Refresh entries expiring within this many seconds
+            concurrency: Details refreshed in parallel
+            lease: Leader lease; only the worker holding it warms (every worker by default)
+        """
+        self._repository = repository
+        self.pages = pages
+        self.interval = interval
+        self.lead = lead
+        self._lease = lease or LocalLease()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cache-warmer")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.leader = False
+        self.cycles = 0
+        self.refreshed = 0
+        self.failed = 0
+        self.last_cycle: Optional[Dict] = None
+
+    def _record(self, results: List[WarmResult], started: float) -> None:
+        refreshed = [result for result in results if result.refreshed]
+        lags = [result.lag for result in refreshed if result.lag is not None]
+        with self._lock:
+            self.cycles += 1
+            self.refreshed += len(refreshed)
+            self.failed += sum(result.failed for result in refreshed)
+            self.last_cycle = {
+                "finished_at": time.time(),
+                "duration_seconds": round(time.monotonic() - started, 3),
+                "entries": len(results),
+                "refreshed": len(refreshed),
+                "failed": sum(result.failed for result in refreshed),
+                "cold": len(refreshed) - len(lags),
+                "max_lag_seconds": round(max(lags, default=0.0), 3),
+            }
+
+    def run_once(self) -> bool:
+        """Run one warming cycle if this worker holds the lease; return whether it did."""
+        self.leader = self._lease.acquire()
+        if not self.leader:
+            return False
+
+        started = time.monotonic()
+        results = []
+        movie_ids = []
+        for page in range(1, self.pages + 1):
+            result = self._repository.warm_popular(page, self.lead)
+            results.append(result)
+            movie_ids.extend(movie["id"] for movie in result.value or [] if "id" in movie)
+        results.extend(
+            self._executor.map(
+                lambda movie_id: self._repository.warm_movie_details(movie_id, self.lead),
+                dict.fromkeys(movie_ids),
+            )
+        )
+        self._record(results, started)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Cache warming cycle failed")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self) -> None:
+        """Start warming in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cache-warmer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop warming and give up the lease."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+        self._executor.shutdown(wait=False)
+        self._lease.release()
+
+    def stats(self) -> Dict:
+        """Return warming counters and the refresh lag of the last cycle."""
+        with self._lock:
+            last_cycle = dict(self.last_cycle) if self.last_cycle else None
+            return {
+                "leader": self.leader,
+                "pages": self.pages,
+                "cycles": self.cycles,
+                "refreshed": self.refreshed,
+                "failed": self.failed,
+                "last_cycle": last_cycle,
+                "seconds_since_last_cycle": (
+                    round(time.time() - last_cycle["finished_at"], 3) if last_cycle else None
+                ),
+            }
@@ -0,0 +1,36 @@
+"""Request-scoped record of the cached data a request was served."""
+
+from contextvars import ContextVar
+from typing import Set, Tuple
+
+STALE = "stale"
+REVALIDATION_FAILED = "revalidation-failed"
+
+_markers: ContextVar[frozenset] = ContextVar("cache_freshness_markers", default=frozenset())
+_versions: ContextVar[frozenset] = ContextVar("cache_entry_versions", default=frozenset())
+
+
+def mark(marker: str) -> None:
+    """Record that the current request was served ``marker`` data."""
+    _markers.set(_markers.get() | {marker})
+
+
+def markers() -> Set[str]:
+    """Return the markers recorded for the current request."""
+    return set(_markers.get())
+
+
+def record(key: str, version: str) -> None:
+    """Record that the current request was served ``version`` of the cache entry ``key``."""
+    _versions.set(_versions.get() | {(key, version)})
+
+
+def versions() -> Set[Tuple[str, str]]:
+    """Return the cache entry versions recorded for the current request."""
+    return set(_versions.get())
+
+
+def reset() -> None:
+    """Forget the markers and versions of a previous request on this thread."""
+    _markers.set(frozenset())
+    _versions.set(frozenset())
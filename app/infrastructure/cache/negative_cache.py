@@ -0,0 +1,128 @@
+"""Bounded cache of lookups known to have no result."""
+
+import hashlib
+import math
+import threading
+import time
+from typing import Dict, Iterable, List
+
+from app.infrastructure.cache.memory_cache import MemoryCache
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys.
+
+    Sized for ``capacity`` keys at a false positive rate of ``error_rate``;
+    bit positions are derived from one blake2b digest by double hashing.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """Initialize an empty filter."""
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        """Add ``key`` to the filter."""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class NegativeCache:
+    """Remembers keys whose lookup found nothing, for ``ttl`` seconds.
+
+    Entries live in a bounded LRU, so repeated lookups of missing movies
+    (scrapers walking IDs, favorites of deleted movies) are answered locally
+    instead of going upstream again. With ``bloom`` a Bloom filter sits in
+    front of the LRU: keys it has never seen, which are nearly all lookups,
+    are ruled out without touching the LRU. The filter is kept in two
+    generations, replaced every ``ttl`` seconds, so expired keys drop out of it.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 60.0, bloom: bool = False):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Most missing keys remembered
+            ttl: Seconds a missing key is remembered
+            bloom: Check a Bloom filter before the LRU
+        """
+        self.ttl = ttl
+        self._entries = MemoryCache(max_entries=max_entries)
+        self._bloom = bloom
+        self._generations = [BloomFilter(max_entries), BloomFilter(max_entries)] if bloom else []
+        self._rotated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.hits = 0
+        self.inserts = 0
+        self.bloom_skips = 0
+
+    def _rotate(self) -> None:
+        now = time.monotonic()
+        if now - self._rotated_at >= self.ttl:
+            self._generations = [BloomFilter(self._entries.max_entries), self._generations[0]]
+            self._rotated_at = now
+
+    def _count(self, checks: int, hits: int, bloom_skips: int = 0) -> None:
+        with self._lock:
+            self.checks += checks
+            self.hits += hits
+            self.bloom_skips += bloom_skips
+
+    def contains(self, key: str) -> bool:
+        """Whether ``key`` was recently found missing."""
+        return bool(self.missing([key]))
+
+    def missing(self, keys: Iterable[str]) -> List[str]:
+        """Return the ``keys`` that were recently found missing."""
+        keys = list(keys)
+        candidates = keys
+        if self._bloom:
+            generations = self._generations
+            candidates = [key for key in keys if any(key in generation for generation in generations)]
+        found = [key for key in candidates if self._entries.get(key) is not None]
+        self._count(len(keys), len(found), len(keys) - len(candidates))
+        return found
+
+    def add(self, key: str) -> None:
+        """Remember that ``key`` has no result."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self.inserts += 1
+            if self._bloom:
+                self._rotate()
+                self._generations[0].add(key)
+        self._entries.set(key, True, self.ttl)
+
+    def discard(self, key: str) -> None:
+        """Forget ``key``, e.g. once a value was found for it."""
+        self._entries.delete(key)
+
+    def stats(self) -> Dict:
+        """Return counters and the share of lookups that were for missing keys.
+
+        ``miss_rate`` counts both lookups answered here and those found
+        missing upstream, over every lookup checked.
+        """
+        with self._lock:
+            checks, hits, inserts, bloom_skips = self.checks, self.hits, self.inserts, self.bloom_skips
+        return {
+            "checks": checks,
+            "hits": hits,
+            "inserts": inserts,
+            "bloom_skips": bloom_skips if self._bloom else None,
+            "miss_rate": round((hits + inserts) / checks, 4) if checks else 0.0,
+            "size": len(self._entries),
+            "max_entries": self._entries.max_entries,
+            "ttl_seconds": self.ttl,
+        }
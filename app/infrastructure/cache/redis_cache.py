@@ -0,0 +1,117 @@
+"""Shared Redis cache tier."""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is an optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCache:
+    """JSON cache stored in Redis and shared by every worker process.
+
+    Redis failures never propagate to callers: they are logged, counted and
+    reported as cache misses. After a failure the tier is skipped for
+    ``retry_interval`` seconds so an unreachable Redis does not add latency to
+    every request.
+    """
+
+    def __init__(self, client, prefix: str = "movies:", retry_interval: float = 5.0):
+        """Initialize the cache around a redis-py compatible client."""
+        self._client = client
+        self.prefix = prefix
+        self.retry_interval = retry_interval
+        self._unavailable_until = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @classmethod
+    def from_url(cls, url: str, socket_timeout: float = 0.25, **kwargs) -> Optional["RedisCache"]:
+        """Create a cache for ``url``, or None when redis-py is not installed."""
+        if redis is None or not url:
+            return None
+        client = redis.Redis.from_url(
+            url, socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout
+        )
+        return cls(client, **kwargs)
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._unavailable_until
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        with self._lock:
+            self.errors += 1
+            self._unavailable_until = time.monotonic() + self.retry_interval
+        logger.warning(
+            "Redis %s failed, skipping cache tier for %ss: %s", operation, self.retry_interval, error
+        )
+
+    def _count(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the decoded value for ``key`` or None."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Fetch several keys with a single MGET round trip."""
+        if not keys:
+            return {}
+        if not self._available():
+            self._count(0, len(keys))
+            return {}
+        try:
+            raw_values = self._client.mget([self.prefix + key for key in keys])
+        except Exception as e:
+            self._failed("MGET", e)
+            self._count(0, len(keys))
+            return {}
+
+        found = {key: json.loads(raw) for key, raw in zip(keys, raw_values) if raw is not None}
+        self._count(len(found), len(keys) - len(found))
+        return found
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store ``value`` as JSON under ``key`` for ``ttl`` seconds."""
+        if ttl <= 0 or not self._available():
+            return
+        try:
+            self._client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000))
+        except Exception as e:
+            self._failed("SET", e)
+
+    def set_many(self, values: Dict[str, Any], ttl: float) -> None:
+        """Store several values for ``ttl`` seconds in one pipelined round trip."""
+        if not values or ttl <= 0 or not self._available():
+            return
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipeline.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000))
+            pipeline.execute()
+        except Exception as e:
+            self._failed("SET", e)
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` from Redis."""
+        if not self._available():
+            return
+        try:
+            self._client.delete(self.prefix + key)
+        except Exception as e:
+            self._failed("DEL", e)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/error counters."""
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
@@ -0,0 +1,238 @@
+"""Versioned binary file format for catalog snapshots, read through ``mmap``.
+
+A catalog file is a fixed header, a JSON table of contents and a sequence of
+8-byte aligned sections. Each section is a flat native-endian array: numeric
+columns, row orders and postings are stored as they are held in memory, and
+variable-length values (strings, genre lists, details documents) as an
+offsets array into a data section.
+
+Snapshots read from a file are views over a read-only shared mapping: every
+worker process mapping the same file shares its pages through the OS page
+cache, and values are only decoded for the rows a query returns. Files are
+written to a temporary file and renamed over the previous one, so readers
+see either the old or the new file, never a partial one; mappings of the old
+file stay valid until their last snapshot is released.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.domain.exceptions import InvalidCatalogFileError
+from app.infrastructure.catalog.snapshot import CatalogSnapshot
+
+MAGIC = b"MOVIECAT"
+FORMAT_VERSION = 1
+# Magic, format version, table of contents length, build time, row count
+HEADER = struct.Struct("<8sIIdQ")
+ALIGNMENT = 8
+OFFSET_CODE = "q"
+
+INDEXES = ("title_index", "text_index")
+
+
+def _align(position: int) -> int:
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+class _Strings:
+    """Read-only sequence of UTF-8 strings stored as offsets into a data section."""
+
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def _slice(self, index: int) -> memoryview:
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return self._data[start:end]
+
+    def __getitem__(self, index: int) -> str:
+        return str(self._slice(index), "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[index] for index in range(len(self)))
+
+
+class _Slices(_Strings):
+    """Read-only sequence of memoryview slices of a data section (bytes or integers)."""
+
+    def __getitem__(self, index: int) -> memoryview:
+        return self._slice(index)
+
+
+class _Tuples(_Slices):
+    """Read-only sequence of integer tuples, such as each movie's genre IDs."""
+
+    def __getitem__(self, index: int) -> Tuple[int, ...]:
+        return tuple(self._slice(index))
+
+
+class _Postings:
+    """Read-only word -> rows mapping over a sorted vocabulary and a postings section."""
+
+    def __init__(self, words: _Strings, postings: _Slices):
+        self.words = words
+        self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.words)
+
+    def get(self, word: str, default=None):
+        position = bisect_left(self.words, word)
+        if position < len(self.words) and self.words[position] == word:
+            return self._postings[position]
+        return default
+
+
+class _RowsById:
+    """Read-only movie ID -> row mapping, as a binary search over rows sorted by ID."""
+
+    def __init__(self, ids: memoryview, rows: memoryview):
+        self._ids = ids
+        self._rows = rows
+
+    def get(self, movie_id: int, default=None) -> Optional[int]:
+        low, high = 0, len(self._rows)
+        while low < high:
+            middle = (low + high) // 2
+            if self._ids[self._rows[middle]] < movie_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self._rows) and self._ids[self._rows[low]] == movie_id:
+            return self._rows[low]
+        return default
+
+
+def _variable(name: str, values: List[bytes], code: str = "B") -> List[Tuple[str, str, bytes]]:
+    offsets = array(OFFSET_CODE, [0])
+    for value in values:
+        offsets.append(offsets[-1] + len(value) // array(code).itemsize)
+    return [(f"{name}.offsets", OFFSET_CODE, offsets.tobytes()), (f"{name}.data", code, b"".join(values))]
+
+
+def _sections(snapshot: CatalogSnapshot) -> List[Tuple[str, str, bytes]]:
+    row_code = CatalogSnapshot.ROW_CODE
+    sections = []
+    for name, code in CatalogSnapshot.NUMBER_COLUMNS.items():
+        sections.append((f"column.{name}", code, array(code, snapshot.columns[name]).tobytes()))
+    for name in CatalogSnapshot.TEXT_COLUMNS:
+        sections += _variable(f"column.{name}", [value.encode() for value in snapshot.columns[name]])
+    sections += _variable("genre_ids", [array("q", genres).tobytes() for genres in snapshot.genre_ids], "q")
+    if snapshot.details is not None:
+        sections += _variable("details", [bytes(document) for document in snapshot.details])
+    for index_name in INDEXES:
+        index = getattr(snapshot, index_name)
+        words = sorted(index)
+        sections += _variable(f"{index_name}.words", [word.encode() for word in words])
+        sections += _variable(
+            f"{index_name}.postings", [array(row_code, index.get(word)).tobytes() for word in words], row_code
+        )
+    for key in CatalogSnapshot.SORT_KEYS:
+        sections.append((f"order.{key}", row_code, array(row_code, snapshot.orders[key]).tobytes()))
+    ids = snapshot.columns["id"]
+    by_id = sorted(range(len(snapshot)), key=ids.__getitem__)
+    sections.append(("rows_by_id", row_code, array(row_code, by_id).tobytes()))
+    return sections
+
+
+def write_catalog(snapshot: CatalogSnapshot, path: str) -> None:
+    """Write ``snapshot`` to ``path``, atomically replacing any previous file.
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    contents: Dict[str, List] = {}
+    position = 0
+    sections = _sections(snapshot)
+    for name, code, data in sections:
+        contents[name] = [position, len(data), code]
+        position = _align(position + len(data))
+    toc = json.dumps({"byteorder": sys.byteorder, "sections": contents}).encode()
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(toc), snapshot.built_at, len(snapshot))
+    base = _align(HEADER.size + len(toc))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix=".catalog-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(header + toc)
+            for name, _, data in sections:
+                file.seek(base + contents[name][0])
+                file.write(data)
+            file.truncate(base + position)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+
+
+def read_catalog(path: str) -> CatalogSnapshot:
+    """Map the catalog file at ``path`` read-only and return a snapshot viewing it.
+
+    Raises:
+        OSError: If the file cannot be opened
+        InvalidCatalogFileError: If the file is not a catalog of this format version and byte order
+    """
+    with open(path, "rb") as file:
+        try:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            raise InvalidCatalogFileError(f"Empty catalog file: {path}") from e
+    view = memoryview(mapping)
+    if len(view) < HEADER.size:
+        raise InvalidCatalogFileError(f"Truncated catalog file: {path}")
+    magic, version, toc_length, built_at, _ = HEADER.unpack_from(view)
+    header_end = HEADER.size
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise InvalidCatalogFileError(f"Unsupported catalog file: {path}")
+    try:
+        toc = json.loads(bytes(view[header_end:][:toc_length]))
+    except ValueError as e:
+        raise InvalidCatalogFileError(f"Corrupt catalog file: {path}") from e
+    if toc["byteorder"] != sys.byteorder:
+        raise InvalidCatalogFileError(f"Catalog file written on a {toc['byteorder']}-endian host: {path}")
+    base = _align(HEADER.size + toc_length)
+    contents = toc["sections"]
+
+    def section(name: str) -> memoryview:
+        offset, length, code = contents[name]
+        start = base + offset
+        return view[start:][:length].cast(code)
+
+    def variable(name: str, sequence=_Slices) -> Sequence:
+        return sequence(section(f"{name}.offsets"), section(f"{name}.data"))
+
+    columns: Dict[str, object] = {name: section(f"column.{name}") for name in CatalogSnapshot.NUMBER_COLUMNS}
+    for name in CatalogSnapshot.TEXT_COLUMNS:
+        columns[name] = variable(f"column.{name}", _Strings)
+    indexes = {
+        name: _Postings(variable(f"{name}.words", _Strings), variable(f"{name}.postings")) for name in INDEXES
+    }
+    return CatalogSnapshot(
+        columns,
+        variable("genre_ids", _Tuples),
+        indexes["title_index"],
+        indexes["text_index"],
+        {key: section(f"order.{key}") for key in CatalogSnapshot.SORT_KEYS},
+        built_at,
+        details=variable("details") if "details.offsets" in contents else None,
+        vocabulary=indexes["text_index"].words,
+        rows_by_id=_RowsById(columns["id"], section("rows_by_id")),
+    )
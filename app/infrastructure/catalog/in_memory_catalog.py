@@ -0,0 +1,163 @@
+"""Movie catalog kept in process memory and rebuilt from the popular movies."""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.domain.exceptions import CatalogUnavailableError
+from app.domain.ports.movie_catalog import CatalogPage, MovieCatalog
+from app.domain.ports.movie_repository import MovieRepository
+from app.infrastructure.catalog.snapshot import CatalogSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryMovieCatalog(MovieCatalog):
+    """Catalog of the first popular pages and their details, rebuilt periodically.
+
+    Every ``interval`` seconds a daemon thread fetches the first ``pages``
+    popular pages and the details of the movies on them through the
+    repository (so mostly from cache), builds a new ``CatalogSnapshot`` and
+    swaps it in. Queries read whichever snapshot is current and never wait
+    for a rebuild; a failed rebuild keeps the previous snapshot.
+
+    The thread starts with the first query, which waits up to
+    ``load_timeout`` seconds for the first snapshot.
+    """
+
+    def __init__(
+        self,
+        repository: MovieRepository,
+        pages: int = 5,
+        interval: float = 300.0,
+        load_timeout: float = 5.0,
+    ):
+        """Initialize the catalog.
+
+        Args:
+            repository: Repository the movies are fetched from
+            pages: Number of popular pages in the catalog, starting at page 1
+            interval: Seconds between rebuilds
+            load_timeout: Seconds a query waits for the first snapshot
+        """
+        self._repository = repository
+        self.pages = pages
+        self.interval = interval
+        self.load_timeout = load_timeout
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._loaded = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.errors = 0
+        self.build_seconds: Optional[float] = None
+
+    def _fetch(self) -> Tuple[List[Dict], Dict[int, Dict]]:
+        movies: Dict[int, Dict] = {}
+        for page in range(1, self.pages + 1):
+            for movie in self._repository.get_popular(page):
+                if movie.get("id") is not None:
+                    movies.setdefault(movie["id"], movie)
+        details = self._repository.get_movie_details_many(list(movies))
+        # Summaries carry genre_ids, details add the runtime and fresher counts
+        return [{**movie, **(details.get(movie_id) or {})} for movie_id, movie in movies.items()], details
+
+    def _build(self, keep_details: bool = False) -> CatalogSnapshot:
+        started = time.monotonic()
+        movies, details = self._fetch()
+        snapshot = CatalogSnapshot.build(movies, details=details if keep_details else None)
+        self.build_seconds = round(time.monotonic() - started, 3)
+        return snapshot
+
+    def _swap(self, snapshot: CatalogSnapshot) -> CatalogSnapshot:
+        with self._lock:
+            self._snapshot = snapshot
+            self.refreshes += 1
+        self._loaded.set()
+        return snapshot
+
+    def refresh(self) -> CatalogSnapshot:
+        """Rebuild the snapshot now and make it current."""
+        return self._swap(self._build())
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                self.errors += 1
+                logger.exception("Movie catalog rebuild failed")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self) -> None:
+        """Start rebuilding in a daemon thread."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="movie-catalog", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """Stop rebuilding."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.load_timeout)
+
+    def current(self) -> Optional[CatalogSnapshot]:
+        """Return the current snapshot without waiting for one, or None before the first build."""
+        return self._snapshot
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Return the current snapshot, loading the first one if needed.
+
+        Raises:
+            CatalogUnavailableError: If no snapshot is ready within ``load_timeout``
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        self.start()
+        if not self._loaded.wait(self.load_timeout):
+            raise CatalogUnavailableError("Movie catalog is still loading")
+        return self._snapshot
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> CatalogPage:
+        """Search the current snapshot; see ``MovieCatalog.search``."""
+        return self.snapshot().search(query, limit=limit, offset=offset)
+
+    def discover(
+        self,
+        sort: str = "popularity",
+        descending: bool = True,
+        min_vote_average: Optional[float] = None,
+        released_from: Optional[str] = None,
+        released_to: Optional[str] = None,
+        genre_id: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> CatalogPage:
+        """List movies from the current snapshot; see ``MovieCatalog.discover``."""
+        return self.snapshot().discover(
+            sort=sort,
+            descending=descending,
+            min_vote_average=min_vote_average,
+            released_from=released_from,
+            released_to=released_to,
+            genre_id=genre_id,
+            limit=limit,
+            offset=offset,
+        )
+
+    def stats(self) -> Dict:
+        """Return the size and age of the current snapshot and rebuild counters."""
+        snapshot = self._snapshot
+        return {
+            "movies": len(snapshot) if snapshot else 0,
+            "words": len(snapshot.text_index) if snapshot else 0,
+            "age_seconds": round(time.time() - snapshot.built_at, 3) if snapshot else None,
+            "build_seconds": self.build_seconds,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+        }
@@ -0,0 +1,118 @@
+"""Movie catalog shared by worker processes through a memory-mapped file."""
+
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from app.domain.exceptions import CatalogUnavailableError
+from app.domain.ports.movie_repository import MovieRepository
+from app.infrastructure.cache.cache_warmer import LocalLease
+from app.infrastructure.catalog.catalog_file import read_catalog, write_catalog
+from app.infrastructure.catalog.in_memory_catalog import InMemoryMovieCatalog
+from app.infrastructure.catalog.snapshot import CatalogSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class MappedMovieCatalog(InMemoryMovieCatalog):
+    """Catalog written to a file by one worker and memory-mapped by all of them.
+
+    The worker holding ``lease`` rebuilds the catalog, including the details
+    of every movie in it, and writes it to ``path`` whenever the file is
+    older than ``interval``. Every worker maps the newest file read-only, so
+    the catalog is held once per host in the page cache instead of once per
+    worker, and a restarted worker serves from the existing file at once.
+    Workers notice a replaced file within ``check_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        repository: MovieRepository,
+        path: str,
+        pages: int = 5,
+        interval: float = 300.0,
+        load_timeout: float = 5.0,
+        lease=None,
+        check_interval: float = 1.0,
+    ):
+        """Initialize the catalog.
+
+        Args:
+            repository: Repository the movies are fetched from
+            path: Catalog file shared by the workers
+            pages: Number of popular pages in the catalog, starting at page 1
+            interval: Seconds between rebuilds
+            load_timeout: Seconds a query waits for the first snapshot
+            lease: Lease of the worker writing the file (every worker writes by default)
+            check_interval: Seconds between checks for a replaced file
+        """
+        super().__init__(repository, pages=pages, interval=interval, load_timeout=load_timeout)
+        self.path = path
+        self.check_interval = check_interval
+        self._lease = lease or LocalLease()
+        self._file_id = None
+        self._checked_at = float("-inf")
+        self.writes = 0
+
+    def _reload(self, force: bool = False) -> Optional[CatalogSnapshot]:
+        """Map the catalog file if it was replaced since it was last mapped; return the current snapshot."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return self._snapshot
+        self._checked_at = now
+        try:
+            stat = os.stat(self.path)
+            file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if file_id != self._file_id:
+                snapshot = read_catalog(self.path)
+                self._file_id = file_id
+                self._swap(snapshot)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.errors += 1
+            logger.warning("Failed to map movie catalog %s: %s", self.path, e)
+        return self._snapshot
+
+    def refresh(self) -> Optional[CatalogSnapshot]:
+        """Write a new catalog file if this worker holds the lease and the file is due, then map it."""
+        snapshot = self._reload(force=True)
+        due = snapshot is None or time.time() - snapshot.built_at >= self.interval
+        if due and self._lease.acquire():
+            write_catalog(self._build(keep_details=True), self.path)
+            self.writes += 1
+            snapshot = self._reload(force=True)
+        return snapshot
+
+    def current(self) -> Optional[CatalogSnapshot]:
+        """Return the snapshot of the newest catalog file without waiting, or None if there is none."""
+        return self._reload()
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Return the snapshot of the newest catalog file, waiting for the first one if needed.
+
+        Raises:
+            CatalogUnavailableError: If no catalog file is written within ``load_timeout``
+        """
+        snapshot = self._reload()
+        if snapshot is not None:
+            return snapshot
+        self.start()
+        deadline = time.monotonic() + self.load_timeout
+        while snapshot is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise CatalogUnavailableError("Movie catalog is still loading")
+            self._loaded.wait(min(remaining, 0.05))
+            snapshot = self._reload(force=True)
+        return snapshot
+
+    def stop(self) -> None:
+        """Stop rebuilding and give up the lease."""
+        super().stop()
+        self._lease.release()
+
+    def stats(self) -> Dict:
+        """Return the size and age of the mapped snapshot and rebuild counters."""
+        return {**super().stats(), "path": self.path, "writes": self.writes}
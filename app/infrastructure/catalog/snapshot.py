@@ -0,0 +1,235 @@
+"""Columnar in-memory snapshot of the popular movies catalog."""
+
+import json
+import re
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from app.domain.ports.movie_catalog import CatalogPage, MovieCatalog
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split ``text`` into lowercase words with accents removed."""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return _WORD.findall("".join(char for char in text if not unicodedata.combining(char)))
+
+
+def _encode(document) -> bytes:
+    if document is None:
+        return b""
+    if isinstance(document, bytes):
+        return document
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class CatalogSnapshot:
+    """Immutable, column-oriented table of movies with search and sort indexes.
+
+    Each field is stored as one column: numbers in typed ``array`` columns,
+    text in lists, so a row costs a few machine words per field instead of a
+    dictionary per movie. Movie dictionaries are only built for the rows a
+    query returns. Row numbers in indexes are 32-bit (``ROW_CODE``).
+
+    Two inverted indexes map each word to the rows containing it, one for
+    titles and one for titles and overviews together. Row orders by
+    popularity, vote average and release date are precomputed, so filtered
+    listings walk an index instead of sorting.
+    """
+
+    TEXT_COLUMNS = ("title", "original_title", "overview", "poster_path", "backdrop_path", "release_date")
+    NUMBER_COLUMNS = {"id": "q", "popularity": "d", "vote_average": "d", "vote_count": "q", "runtime": "q"}
+    ROW_CODE = "i"
+    SORT_KEYS = MovieCatalog.SORT_KEYS
+
+    def __init__(
+        self,
+        columns: Dict[str, object],
+        genre_ids: List[Tuple[int, ...]],
+        title_index: Dict[str, array],
+        text_index: Dict[str, array],
+        orders: Dict[str, array],
+        built_at: float,
+        details: Sequence[bytes] = None,
+        vocabulary: Sequence[str] = None,
+        rows_by_id: Mapping[int, int] = None,
+    ):
+        """Initialize a snapshot from prebuilt columns and indexes; use ``build`` to create one.
+
+        Columns and indexes only need to be sequences and mappings, so they may
+        be views over a memory-mapped file (see ``catalog_file``), which also
+        passes the sorted ``vocabulary`` of ``text_index`` and ``rows_by_id``
+        instead of having them rebuilt here.
+        """
+        self.columns = columns
+        self.genre_ids = genre_ids
+        self.title_index = title_index
+        self.text_index = text_index
+        self.orders = orders
+        self.built_at = built_at
+        self.details = details
+        self._vocabulary = vocabulary if vocabulary is not None else sorted(text_index)
+        if rows_by_id is None:
+            rows_by_id = {movie_id: row for row, movie_id in enumerate(columns["id"])}
+        self._rows_by_id = rows_by_id
+
+    @classmethod
+    def build(
+        cls, movies: Iterable[Dict], built_at: float = None, details: Mapping[int, Dict] = None
+    ) -> "CatalogSnapshot":
+        """Build a snapshot from movie dictionaries; movies without an id are skipped.
+
+        ``details`` maps movie IDs to their full details, kept as encoded JSON
+        alongside the columns; without it the snapshot holds no details.
+        """
+        movies = [movie for movie in movies if movie.get("id") is not None]
+        columns: Dict[str, object] = {
+            name: array(
+                code,
+                (
+                    int(movie.get(name) or 0) if code == "q" else float(movie.get(name) or 0)
+                    for movie in movies
+                ),
+            )
+            for name, code in cls.NUMBER_COLUMNS.items()
+        }
+        for name in cls.TEXT_COLUMNS:
+            columns[name] = [movie.get(name) or "" for movie in movies]
+        genre_ids = [
+            tuple(movie.get("genre_ids") or (genre["id"] for genre in movie.get("genres") or ()))
+            for movie in movies
+        ]
+
+        title_postings: Dict[str, List[int]] = {}
+        text_postings: Dict[str, List[int]] = {}
+        for row, movie in enumerate(movies):
+            title_words = set(tokenize(movie.get("title"))) | set(tokenize(movie.get("original_title")))
+            for word in title_words:
+                title_postings.setdefault(word, []).append(row)
+            for word in title_words | set(tokenize(movie.get("overview"))):
+                text_postings.setdefault(word, []).append(row)
+
+        rows = range(len(movies))
+        orders = {
+            # Highest first; ties keep the catalog (popularity) order
+            key: array(
+                cls.ROW_CODE, sorted(rows, key=lambda row, column=columns[key]: column[row], reverse=True)
+            )
+            for key in cls.SORT_KEYS
+        }
+        return cls(
+            columns,
+            genre_ids,
+            {word: array(cls.ROW_CODE, postings) for word, postings in title_postings.items()},
+            {word: array(cls.ROW_CODE, postings) for word, postings in text_postings.items()},
+            orders,
+            time.time() if built_at is None else built_at,
+            details=None if details is None else [_encode(details.get(movie["id"])) for movie in movies],
+        )
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def movie(self, row: int) -> Dict:
+        """Return the movie stored at ``row`` as a dictionary."""
+        columns = self.columns
+        runtime = columns["runtime"][row]
+        return {
+            "id": columns["id"][row],
+            "title": columns["title"][row],
+            "original_title": columns["original_title"][row],
+            "overview": columns["overview"][row],
+            "poster_path": columns["poster_path"][row] or None,
+            "backdrop_path": columns["backdrop_path"][row] or None,
+            "release_date": columns["release_date"][row],
+            "popularity": columns["popularity"][row],
+            "vote_average": columns["vote_average"][row],
+            "vote_count": columns["vote_count"][row],
+            "genre_ids": list(self.genre_ids[row]),
+            "runtime": runtime or None,
+        }
+
+    def get(self, movie_id: int) -> Optional[Dict]:
+        """Return the movie with ``movie_id``, or None if it is not in the catalog."""
+        row = self._rows_by_id.get(movie_id)
+        return None if row is None else self.movie(row)
+
+    def details_raw(self, movie_id: int) -> Optional[bytes]:
+        """Return the details of ``movie_id`` as encoded JSON, or None if the snapshot has none."""
+        row = self._rows_by_id.get(movie_id)
+        if row is None or self.details is None:
+            return None
+        return bytes(self.details[row]) or None
+
+    def _prefixed(self, index: Dict[str, array], prefix: str) -> Set[int]:
+        rows: Set[int] = set()
+        position = bisect_left(self._vocabulary, prefix)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(prefix):
+            rows.update(index.get(self._vocabulary[position], ()))
+            position += 1
+        return rows
+
+    def _matches(self, index: Dict[str, array], word: str, prefix: bool) -> Set[int]:
+        return self._prefixed(index, word) if prefix else set(index.get(word, ()))
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> CatalogPage:
+        """Search titles and overviews; see ``MovieCatalog.search``."""
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return CatalogPage([], 0)
+
+        last = len(words) - 1
+        rows: Optional[Set[int]] = None
+        for position, word in enumerate(words):
+            matches = self._matches(self.text_index, word, prefix=position == last)
+            rows = matches if rows is None else rows & matches
+            if not rows:
+                return CatalogPage([], 0)
+
+        title_matches = [
+            self._matches(self.title_index, word, prefix=i == last) for i, word in enumerate(words)
+        ]
+        popularity = self.columns["popularity"]
+        ranked = sorted(
+            rows, key=lambda row: (-sum(row in matches for matches in title_matches), -popularity[row])
+        )
+        window = ranked[offset:][:limit]
+        return CatalogPage([self.movie(row) for row in window], len(ranked))
+
+    def discover(
+        self,
+        sort: str = "popularity",
+        descending: bool = True,
+        min_vote_average: Optional[float] = None,
+        released_from: Optional[str] = None,
+        released_to: Optional[str] = None,
+        genre_id: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> CatalogPage:
+        """List movies matching filters in index order; see ``MovieCatalog.discover``."""
+        order = self.orders[sort]
+        vote_average = self.columns["vote_average"]
+        release_date = self.columns["release_date"]
+        selected = []
+        total = 0
+        for row in order if descending else reversed(order):
+            if min_vote_average is not None and vote_average[row] < min_vote_average:
+                continue
+            # ISO dates compare correctly as strings; movies without a date never match a date filter
+            if released_from is not None and not (release_date[row] and release_date[row] >= released_from):
+                continue
+            if released_to is not None and not (release_date[row] and release_date[row] <= released_to):
+                continue
+            if genre_id is not None and genre_id not in self.genre_ids[row]:
+                continue
+            if offset <= total < offset + limit:
+                selected.append(row)
+            total += 1
+        return CatalogPage([self.movie(row) for row in selected], total)
@@ -0,0 +1,23 @@
+"""SQLAlchemy database handle shared by the application."""
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from flask_sqlalchemy import SQLAlchemy
+
+db = SQLAlchemy()
+
+
+@click.command("init-db")
+@with_appcontext
+def init_db_command():
+    """Create the database tables that do not exist yet.
+
+    Run once per deployment, before the workers start, rather than from every
+    worker's app factory, where concurrent starts race on creating the schema.
+    """
+    if current_app.config["FAVORITES_STORE"] != "database":
+        click.echo("Favorites are kept in memory; no tables to create")
+        return
+    db.create_all()
+    click.echo("Database tables created")
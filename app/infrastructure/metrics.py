@@ -0,0 +1,19 @@
+"""In-process metrics registry."""
+
+from typing import Callable, Dict
+
+
+class MetricsRegistry:
+    """Collects named stats callables and snapshots them on demand."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._sources: Dict[str, Callable[[], Dict]] = {}
+
+    def register(self, name: str, source: Callable[[], Dict]) -> None:
+        """Register ``source`` to be reported under ``name``."""
+        self._sources[name] = source
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return the current value of every registered source."""
+        return {name: source() for name, source in self._sources.items()}
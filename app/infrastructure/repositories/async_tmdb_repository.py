@@ -0,0 +1,104 @@
+"""Asynchronous TheMovieDB repository implementation."""
+
+import asyncio
+from typing import Dict, Iterable, List, Optional
+
+from app.domain.ports.movie_repository import (
+    ConditionalResult,
+    MovieDetailsBatch,
+    MovieRepository,
+)
+from app.infrastructure.api.async_tmdb_client import AsyncTMDBClient
+
+
+class AsyncTMDBRepository(MovieRepository):
+    """Adapter for TheMovieDB API backed by the asyncio client.
+
+    The ``*_async`` methods await the upstream without holding a thread. The
+    blocking port methods run the same coroutines on the client's event loop,
+    so batch lookups fan out over one loop instead of a thread pool.
+    """
+
+    def __init__(self, client: AsyncTMDBClient = None):
+        """Initialize repository with AsyncTMDBClient.
+
+        Args:
+            client: Asynchronous TheMovieDB API client
+        """
+        self.client = client or AsyncTMDBClient()
+
+    async def get_popular_async(self, page: int = 1) -> List[Dict]:
+        """Get popular movies from TheMovieDB.
+
+        Args:
+            page: Page number for pagination
+
+        Returns:
+            List of movie dictionaries
+        """
+        response = await self.client._get("/movie/popular", params={"page": page})
+        return response.get("results", [])
+
+    async def get_movie_details_async(self, movie_id: int) -> Dict:
+        """Get detailed information for a specific movie from TheMovieDB.
+
+        Args:
+            movie_id: The ID of the movie to retrieve
+
+        Returns:
+            Dictionary containing movie details or None if not found
+        """
+        return await self.client._get(f"/movie/{movie_id}")
+
+    async def get_movie_details_many_async(self, movie_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Get details for several movies from TheMovieDB concurrently.
+
+        Args:
+            movie_ids: IDs of the movies to retrieve; duplicates are ignored
+
+        Returns:
+            MovieDetailsBatch mapping each found movie ID to its details; failed lookups are listed in
+            ``failed`` instead of failing the batch
+        """
+        movie_ids = list(dict.fromkeys(movie_ids))
+        results = await asyncio.gather(
+            *(self.get_movie_details_async(movie_id) for movie_id in movie_ids), return_exceptions=True
+        )
+        return MovieDetailsBatch.from_results(movie_ids, results)
+
+    def get_popular(self, page: int = 1) -> List[Dict]:
+        """Get popular movies from TheMovieDB."""
+        return self.client.run(self.get_popular_async(page=page))
+
+    def get_movie_details(self, movie_id: int) -> Dict:
+        """Get detailed information for a specific movie from TheMovieDB."""
+        return self.client.run(self.get_movie_details_async(movie_id=movie_id))
+
+    def get_movie_details_many(self, movie_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Get details for several movies from TheMovieDB concurrently."""
+        return self.client.run(self.get_movie_details_many_async(movie_ids=movie_ids))
+
+    def get_popular_conditional(self, page: int = 1, validators: Dict[str, str] = None) -> ConditionalResult:
+        """Get popular movies, revalidating a cached copy with a conditional request."""
+        result = self.client.run(
+            self.client.get_conditional("/movie/popular", params={"page": page}, validators=validators)
+        )
+        if result.not_modified:
+            return result
+        return result._replace(value=result.value.get("results", []))
+
+    def get_movie_details_conditional(
+        self, movie_id: int, validators: Dict[str, str] = None, raw: bool = False
+    ) -> ConditionalResult:
+        """Get movie details, revalidating a cached copy with a conditional request."""
+        return self.client.run(
+            self.client.get_conditional(f"/movie/{movie_id}", validators=validators, raw=raw)
+        )
+
+    async def get_movie_details_raw_async(self, movie_id: int) -> Optional[bytes]:
+        """Get the details of a movie as the JSON bytes TheMovieDB returned."""
+        return (await self.client.get_conditional(f"/movie/{movie_id}", raw=True)).value
+
+    def get_movie_details_raw(self, movie_id: int) -> Optional[bytes]:
+        """Get the details of a movie as the JSON bytes TheMovieDB returned."""
+        return self.client.run(self.get_movie_details_raw_async(movie_id=movie_id))
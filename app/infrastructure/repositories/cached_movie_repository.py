@@ -0,0 +1,567 @@
+"""Caching decorator for movie repositories."""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from app.domain.entities.raw_json import RawJSON
+from app.domain.ports.movie_repository import (
+    ConditionalResult,
+    MovieDetailsBatch,
+    MovieRepository,
+    VersionedResult,
+)
+from app.infrastructure.cache import freshness
+from app.infrastructure.cache.memory_cache import MemoryCache
+from app.infrastructure.cache.negative_cache import NegativeCache
+from app.infrastructure.cache.redis_cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+
+def content_version(value) -> str:
+    """Return a short hash identifying the content of a cached value.
+
+    Encoded JSON bytes are hashed as they are, without being decoded.
+    """
+    if not isinstance(value, bytes):
+        value = json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(value, digest_size=8).hexdigest()
+
+
+class WarmResult(NamedTuple):
+    """Outcome of keeping one cache entry warm.
+
+    ``lag`` is how many seconds past its soft TTL the entry was when it was
+    refreshed: 0 when it was refreshed ahead of expiry, None when it was not
+    cached at all. ``value`` is only filled in for popular pages.
+    """
+
+    refreshed: bool = False
+    failed: bool = False
+    lag: Optional[float] = None
+    value: Any = None
+
+
+class CachedMovieRepository(MovieRepository):
+    """Two-tier read-through cache in front of another movie repository.
+
+    Lookups check a bounded per-process LRU tier first, then the shared Redis
+    tier, and only then the wrapped repository. Values found in Redis are
+    promoted into the local tier for the rest of their lifetime.
+
+    Every entry has a soft TTL (per endpoint) and a hard TTL. Until the soft
+    TTL the entry is fresh. Between the soft and hard TTL it is stale: it is
+    served immediately while a background refresh fetches a new value, so
+    callers never wait on a slow or failing upstream. After the hard TTL the
+    entry is gone and the next lookup fetches synchronously.
+
+    Entries keep the upstream validators (``ETag`` / ``Last-Modified``) next
+    to the value. Background refreshes send them with a conditional request,
+    and a "not modified" answer just extends the entry's TTLs.
+
+    Every entry also carries a content version, computed once when it is
+    stored. The versions of the entries a request is served are recorded in
+    ``freshness`` so the response's ETag can be derived without hashing it.
+
+    Movie details fetched through ``get_movie_details_raw`` are stored as the
+    JSON bytes TheMovieDB sent, and served as such without being decoded. An
+    entry is decoded (or encoded) at most once per process, the first time it
+    is read in the other form. ``get_movie_details_raw_many`` returns them as
+    ``RawJSON``, which the JSON provider splices into a response verbatim.
+
+    With a ``negative_cache``, lookups that found nothing upstream (unknown
+    movie IDs) are remembered for a short while and answered locally, before
+    either tier is checked, instead of being requested again.
+
+    ``warm_popular`` and ``warm_movie_details`` refresh an entry ahead of its
+    expiry for a cache warmer. With ``prefetch_next_page`` each popular page
+    served schedules a background fetch of the next page when it is not cached.
+    """
+
+    POPULAR = "popular"
+    DETAILS = "details"
+    # TheMovieDB serves at most this many popular pages
+    MAX_POPULAR_PAGE = 500
+
+    def __init__(
+        self,
+        repository: MovieRepository,
+        local_cache: MemoryCache = None,
+        remote_cache: Optional[RedisCache] = None,
+        ttls: Dict[str, float] = None,
+        default_ttl: float = 30,
+        hard_ttl: float = 3600,
+        refresh_executor: Executor = None,
+        prefetch_next_page: bool = False,
+        negative_cache: Optional[NegativeCache] = None,
+    ):
+        """Initialize the decorator.
+
+        Args:
+            repository: Repository used on cache misses
+            local_cache: Per-process tier (a 1024-entry MemoryCache by default)
+            remote_cache: Shared tier, or None to run with the local tier only
+            ttls: Per-endpoint soft TTLs in seconds, keyed by POPULAR / DETAILS
+            default_ttl: Soft TTL for endpoints missing from ``ttls``
+            hard_ttl: Seconds an entry may be served stale; never shorter than its soft TTL
+            refresh_executor: Executor running background refreshes and prefetches
+            prefetch_next_page: Fetch page p + 1 in the background when popular page p is served
+            negative_cache: Cache of keys found missing upstream, or None to always ask again
+        """
+        self._repository = repository
+        self._local = local_cache or MemoryCache()
+        self._remote = remote_cache
+        self._ttls = {self.POPULAR: default_ttl, self.DETAILS: default_ttl, **(ttls or {})}
+        self._hard_ttl = hard_ttl
+        self._refresh_executor = refresh_executor or ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="cache-refresh"
+        )
+        self._prefetch_next_page = prefetch_next_page
+        self._negative = negative_cache
+        self._refreshing = set()
+        self._failed_refreshes = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.revalidated = 0
+        self.prefetches = 0
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def _lookup_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """Return the cached envelopes of ``keys``.
+
+        Keys missing locally, and those whose local copy is past its soft TTL,
+        are read from the remote tier: another worker (e.g. the warmer's
+        leader) may have refreshed them there, in which case the remote copy
+        replaces the local one and no upstream refresh is needed.
+        """
+        envelopes = self._local.get_many(keys)
+        now = time.time()
+        check = [key for key in keys if key not in envelopes or now >= envelopes[key]["fresh_until"]]
+        if check and self._remote is not None:
+            for key, envelope in self._remote.get_many(check).items():
+                local = envelopes.get(key)
+                if local is not None and envelope["fresh_until"] <= local["fresh_until"]:
+                    continue
+                if isinstance(envelope.get("raw"), str):
+                    envelope["raw"] = envelope["raw"].encode()
+                self._local.set(key, envelope, envelope["stale_until"] - now)
+                envelopes[key] = envelope
+        return envelopes
+
+    def _lookup(self, key: str) -> Optional[Dict]:
+        return self._lookup_many([key]).get(key)
+
+    def _store_many(
+        self,
+        endpoint: str,
+        values: Dict[str, object],
+        validators: Dict[str, Dict] = None,
+        versions: Dict[str, str] = None,
+    ) -> Dict[str, Dict]:
+        now = time.time()
+        ttl = self._ttls[endpoint]
+        hard_ttl = max(ttl, self._hard_ttl)
+        validators = validators or {}
+        versions = versions or {}
+        envelopes = {
+            key: {
+                # Encoded JSON is kept as bytes under "raw", decoded values under "value"
+                "raw" if isinstance(value, bytes) else "value": value,
+                "validators": validators.get(key),
+                "version": versions.get(key) or content_version(value),
+                "fresh_until": now + ttl,
+                "stale_until": now + hard_ttl,
+            }
+            for key, value in values.items()
+        }
+        for key, envelope in envelopes.items():
+            self._local.set(key, envelope, hard_ttl)
+            if self._negative is not None:
+                self._negative.discard(key)
+        if self._remote is not None:
+            # Redis entries are JSON documents, so raw bytes are stored as text
+            self._remote.set_many(
+                {
+                    key: {**envelope, "raw": envelope["raw"].decode()} if "raw" in envelope else envelope
+                    for key, envelope in envelopes.items()
+                },
+                hard_ttl,
+            )
+        return envelopes
+
+    def _store(
+        self, endpoint: str, key: str, value, validators: Optional[Dict] = None, version: str = None
+    ) -> Dict:
+        return self._store_many(endpoint, {key: value}, {key: validators}, {key: version})[key]
+
+    @staticmethod
+    def _content(envelope: Dict):
+        return envelope["raw"] if "raw" in envelope else envelope["value"]
+
+    @staticmethod
+    def _value(envelope: Dict):
+        if "value" not in envelope:
+            envelope["value"] = json.loads(envelope["raw"])
+        return envelope["value"]
+
+    @staticmethod
+    def _raw(envelope: Dict) -> bytes:
+        if "raw" not in envelope:
+            envelope["raw"] = json.dumps(envelope["value"]).encode()
+        return envelope["raw"]
+
+    @classmethod
+    def _record(cls, key: str, envelope: Dict) -> str:
+        """Record the version served for ``key`` and return it as ``{key}:{version}``."""
+        # Entries written before versions were added are versioned on read
+        version = envelope.get("version") or content_version(cls._value(envelope))
+        freshness.record(key, version)
+        return f"{key}:{version}"
+
+    def _invalidate(self, key: str) -> None:
+        self._local.delete(key)
+        if self._remote is not None:
+            self._remote.delete(key)
+
+    def _known_missing(self, key: str) -> bool:
+        return self._negative is not None and self._negative.contains(key)
+
+    def _remember_missing(self, key: str) -> None:
+        if self._negative is not None:
+            self._negative.add(key)
+
+    def _refresh(self, endpoint: str, key: str, envelope: Dict, fetch) -> bool:
+        validators = envelope.get("validators")
+        try:
+            result = fetch(validators)
+        except Exception as e:
+            self._count("refresh_errors")
+            with self._lock:
+                self._failed_refreshes.add(key)
+            logger.warning("Background refresh of %s failed, serving stale data: %s", key, e)
+            return False
+        else:
+            self._count("refreshes")
+            with self._lock:
+                self._failed_refreshes.discard(key)
+            if result.not_modified:
+                # Unchanged upstream: keep the cached value, no body was downloaded or parsed
+                self._count("revalidated")
+                self._store(
+                    endpoint,
+                    key,
+                    self._content(envelope),
+                    result.validators or validators,
+                    envelope.get("version"),
+                )
+            elif result.value is None:
+                self._invalidate(key)
+                self._remember_missing(key)
+            else:
+                self._store(endpoint, key, result.value, result.validators)
+            return True
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _claim(self, key: str) -> bool:
+        """Mark ``key`` as being refreshed; False if a refresh is already under way."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _schedule_refresh(self, endpoint: str, key: str, envelope: Dict, fetch) -> None:
+        if self._claim(key):
+            self._refresh_executor.submit(self._refresh, endpoint, key, envelope, fetch)
+
+    def _warm(self, endpoint: str, key: str, envelope: Optional[Dict], fetch, lead: float) -> WarmResult:
+        now = time.time()
+        if envelope is not None and now < envelope["fresh_until"] - lead:
+            return WarmResult()
+        if not self._claim(key):
+            return WarmResult()
+        ok = self._refresh(endpoint, key, envelope or {}, fetch)
+        lag = max(0.0, now - envelope["fresh_until"]) if envelope is not None else None
+        return WarmResult(refreshed=True, failed=not ok, lag=lag)
+
+    def warm_popular(self, page: int, lead: float = 0.0) -> WarmResult:
+        """Refresh a popular page if it expires within ``lead`` seconds or is not cached.
+
+        The refresh runs in the calling thread and is conditional when the entry
+        has validators. The result carries the page's movies.
+        """
+        key = f"popular:{page}"
+        result = self._warm(self.POPULAR, key, self._lookup(key), self._popular_fetcher(page), lead)
+        envelope = self._lookup(key)
+        return result._replace(value=self._value(envelope) if envelope is not None else None)
+
+    def warm_movie_details(self, movie_id: int, lead: float = 0.0) -> WarmResult:
+        """Refresh a movie's details if they expire within ``lead`` seconds or are not cached.
+
+        Entries are kept in the form they are stored in; new ones are stored as raw bytes.
+        """
+        key = f"movie:{movie_id}"
+        envelope = self._lookup(key)
+        raw = envelope is None or "raw" in envelope
+        return self._warm(self.DETAILS, key, envelope, self._details_fetcher(movie_id, raw=raw), lead)
+
+    def _fill(self, endpoint: str, key: str, fetch) -> None:
+        try:
+            # Another worker may have fetched it already
+            if self._lookup(key) is None:
+                result = fetch(None)
+                if result.value is not None:
+                    self._store(endpoint, key, result.value, result.validators)
+        except Exception as e:
+            logger.warning("Prefetch of %s failed: %s", key, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _prefetch_page(self, page: int) -> None:
+        key = f"popular:{page}"
+        if page > self.MAX_POPULAR_PAGE or self._local.get(key) is not None or not self._claim(key):
+            return
+        self._count("prefetches")
+        self._refresh_executor.submit(self._fill, self.POPULAR, key, self._popular_fetcher(page))
+
+    def _serve(self, endpoint: str, key: str, envelope: Dict, fetch, raw: bool = False) -> VersionedResult:
+        version = self._record(key, envelope)
+        if time.time() < envelope["fresh_until"]:
+            self._count("hits")
+        else:
+            self._count("stale_hits")
+            freshness.mark(freshness.STALE)
+            if key in self._failed_refreshes:
+                freshness.mark(freshness.REVALIDATION_FAILED)
+            self._schedule_refresh(endpoint, key, envelope, fetch)
+        return VersionedResult(self._raw(envelope) if raw else self._value(envelope), version)
+
+    def _cached(self, endpoint: str, key: str, fetch, raw: bool = False) -> VersionedResult:
+        if self._known_missing(key):
+            return VersionedResult(None)
+        envelope = self._lookup(key)
+        if envelope is not None:
+            return self._serve(endpoint, key, envelope, fetch, raw)
+
+        self._count("misses")
+        result: ConditionalResult = fetch(None)
+        if result.value is None:
+            self._remember_missing(key)
+            return VersionedResult(None)
+        return VersionedResult(
+            result.value, self._record(key, self._store(endpoint, key, result.value, result.validators))
+        )
+
+    async def _cached_async(
+        self, endpoint: str, key: str, fetch, fetch_async, raw: bool = False
+    ) -> VersionedResult:
+        if self._known_missing(key):
+            return VersionedResult(None)
+        envelope = self._lookup(key)
+        if envelope is not None:
+            return self._serve(endpoint, key, envelope, fetch, raw)
+
+        # Misses store no validators; the first background refresh fetches them
+        self._count("misses")
+        value = await fetch_async()
+        if value is None:
+            self._remember_missing(key)
+            return VersionedResult(None)
+        return VersionedResult(value, self._record(key, self._store(endpoint, key, value)))
+
+    def get_popular(self, page: int = 1) -> List[Dict]:
+        """Get popular movies, served from cache when possible."""
+        return self.get_popular_versioned(page=page).value
+
+    def get_popular_versioned(self, page: int = 1) -> VersionedResult:
+        """Get popular movies with the version of the cache entry they were served from."""
+        result = self._cached(self.POPULAR, f"popular:{page}", self._popular_fetcher(page))
+        if self._prefetch_next_page:
+            self._prefetch_page(page + 1)
+        return result
+
+    def _popular_fetcher(self, page: int):
+        return lambda validators: self._repository.get_popular_conditional(page=page, validators=validators)
+
+    def _details_fetcher(self, movie_id: int, raw: bool = False):
+        return lambda validators: self._repository.get_movie_details_conditional(
+            movie_id=movie_id, validators=validators, raw=raw
+        )
+
+    def get_movie_details(self, movie_id: int) -> Dict:
+        """Get movie details, served from cache when possible."""
+        return self.get_movie_details_versioned(movie_id=movie_id).value
+
+    def get_movie_details_versioned(self, movie_id: int) -> VersionedResult:
+        """Get movie details with the version of the cache entry they were served from."""
+        return self._cached(self.DETAILS, f"movie:{movie_id}", self._details_fetcher(movie_id))
+
+    def get_movie_details_raw(self, movie_id: int) -> Optional[bytes]:
+        """Get movie details as encoded JSON, served from cache when possible.
+
+        Misses and refreshes fetch the undecoded upstream body, so an entry
+        populated here is never decoded unless a caller asks for a dictionary.
+        """
+        return self._cached(
+            self.DETAILS, f"movie:{movie_id}", self._details_fetcher(movie_id, raw=True), raw=True
+        ).value
+
+    def _lookup_details_many(self, movie_ids: Iterable[int], raw: bool = False):
+        keys = {movie_id: f"movie:{movie_id}" for movie_id in movie_ids}
+        missing = set(self._negative.missing(keys.values())) if self._negative is not None else set()
+        envelopes = self._lookup_many([key for key in keys.values() if key not in missing])
+
+        details = {}
+        misses = []
+        for movie_id, key in keys.items():
+            if key in missing:
+                continue
+            envelope = envelopes.get(key)
+            if envelope is None:
+                misses.append(movie_id)
+            elif raw:
+                details[movie_id] = RawJSON(
+                    self._serve(
+                        self.DETAILS, key, envelope, self._details_fetcher(movie_id, raw=True), raw=True
+                    ).value
+                )
+            else:
+                details[movie_id] = self._serve(
+                    self.DETAILS, key, envelope, self._details_fetcher(movie_id)
+                ).value
+        if misses:
+            self._count("misses", len(misses))
+        return keys, details, misses
+
+    def _merge_details(
+        self,
+        keys: Dict[int, str],
+        details: Dict[int, Dict],
+        misses: List[int],
+        fetched: Dict[int, Dict],
+        raw: bool = False,
+    ) -> MovieDetailsBatch:
+        # Failed lookups may exist upstream, so only movies reported as not found are remembered
+        failed = getattr(fetched, "failed", [])
+        for movie_id in misses:
+            if movie_id not in fetched and movie_id not in failed:
+                self._remember_missing(keys[movie_id])
+        stored = self._store_many(
+            self.DETAILS, {keys[movie_id]: movie for movie_id, movie in fetched.items()}
+        )
+        for key, envelope in stored.items():
+            self._record(key, envelope)
+        if raw:
+            # Encoded once here and kept on the stored entry for the next lookups
+            fetched = {movie_id: RawJSON(self._raw(stored[keys[movie_id]])) for movie_id in fetched}
+        details.update(fetched)
+        return MovieDetailsBatch(
+            {movie_id: details[movie_id] for movie_id in keys if movie_id in details}, failed=failed
+        )
+
+    def get_movie_details_many(self, movie_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Get details for several movies with one bulk cache lookup per tier.
+
+        Only the movies missing from both tiers are requested from the wrapped
+        repository, in a single batch.
+        """
+        keys, details, misses = self._lookup_details_many(movie_ids)
+        fetched = self._repository.get_movie_details_many(misses) if misses else {}
+        return self._merge_details(keys, details, misses, fetched)
+
+    def get_movie_details_raw_many(self, movie_ids: Iterable[int]) -> MovieDetailsBatch:
+        """Get details for several movies as ``RawJSON``, like get_movie_details_many.
+
+        Cached entries are returned as the bytes they hold without being
+        decoded; movies fetched from the wrapped repository are encoded once.
+        """
+        keys, details, misses = self._lookup_details_many(movie_ids, raw=True)
+        fetched = self._repository.get_movie_details_many(misses) if misses else {}
+        return self._merge_details(keys, details, misses, fetched, raw=True)
+
+    async def get_popular_async(self, page: int = 1) -> List[Dict]:
+        """Get popular movies, awaiting the wrapped repository on cache misses.
+
+        Cache lookups stay synchronous: the local tier is in memory and the
+        Redis tier is bounded by its socket timeout. Background refreshes of
+        stale entries use the blocking port methods on the refresh executor.
+        """
+        return (await self.get_popular_versioned_async(page=page)).value
+
+    async def get_popular_versioned_async(self, page: int = 1) -> VersionedResult:
+        """Get popular movies with the version of their cache entry, awaiting cache misses."""
+        result = await self._cached_async(
+            self.POPULAR,
+            f"popular:{page}",
+            self._popular_fetcher(page),
+            lambda: self._repository.get_popular_async(page=page),
+        )
+        if self._prefetch_next_page:
+            self._prefetch_page(page + 1)
+        return result
+
+    async def get_movie_details_async(self, movie_id: int) -> Dict:
+        """Get movie details, awaiting the wrapped repository on cache misses."""
+        return (await self.get_movie_details_versioned_async(movie_id=movie_id)).value
+
+    async def get_movie_details_versioned_async(self, movie_id: int) -> VersionedResult:
+        """Get movie details with the version of their cache entry, awaiting cache misses."""
+        return await self._cached_async(
+            self.DETAILS,
+            f"movie:{movie_id}",
+            self._details_fetcher(movie_id),
+            lambda: self._repository.get_movie_details_async(movie_id=movie_id),
+        )
+
+    async def get_movie_details_raw_async(self, movie_id: int) -> Optional[bytes]:
+        """Get movie details as encoded JSON, awaiting the wrapped repository on cache misses."""
+        result = await self._cached_async(
+            self.DETAILS,
+            f"movie:{movie_id}",
+            self._details_fetcher(movie_id, raw=True),
+            lambda: self._repository.get_movie_details_raw_async(movie_id=movie_id),
+            raw=True,
+        )
+        return result.value
+
+    async def get_movie_details_many_async(self, movie_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Get details for several movies, awaiting one batch for the cache misses."""
+        keys, details, misses = self._lookup_details_many(movie_ids)
+        fetched = await self._repository.get_movie_details_many_async(misses) if misses else {}
+        return self._merge_details(keys, details, misses, fetched)
+
+    async def get_movie_details_raw_many_async(self, movie_ids: Iterable[int]) -> MovieDetailsBatch:
+        """Get details for several movies as ``RawJSON``, awaiting one batch for the cache misses."""
+        keys, details, misses = self._lookup_details_many(movie_ids, raw=True)
+        fetched = await self._repository.get_movie_details_many_async(misses) if misses else {}
+        return self._merge_details(keys, details, misses, fetched, raw=True)
+
+    def stats(self) -> Dict:
+        """Return cache counters for both tiers."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "revalidated": self.revalidated,
+            "prefetches": self.prefetches,
+            "negative": self._negative.stats() if self._negative is not None else None,
+            "local": self._local.stats(),
+            "remote": self._remote.stats() if self._remote is not None else None,
+        }
@@ -0,0 +1,217 @@
+"""Repository serving movie details from the shared catalog file."""
+
+import json
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from app.domain.entities.raw_json import RawJSON
+from app.domain.ports.movie_repository import (
+    ConditionalResult,
+    MovieDetailsBatch,
+    MovieRepository,
+    VersionedResult,
+)
+from app.infrastructure.catalog.in_memory_catalog import InMemoryMovieCatalog
+
+
+class CatalogMovieRepository(MovieRepository):
+    """Decorator answering movie details from the catalog before the wrapped repository.
+
+    The catalog holds the details of every movie on its popular pages. When
+    it is backed by a memory-mapped file, those lookups read pages shared by
+    all workers instead of each worker's own cache, and work as soon as a
+    worker starts. Details are served from the catalog only while it is at
+    most ``max_age`` seconds old; anything else goes to the wrapped
+    repository, usually the cache.
+    """
+
+    def __init__(self, repository: MovieRepository, catalog: InMemoryMovieCatalog, max_age: float = 600.0):
+        """Initialize the repository.
+
+        Args:
+            repository: Repository for popular pages and movies not in the catalog
+            catalog: Catalog whose snapshots hold movie details
+            max_age: Oldest catalog, in seconds, details are served from
+        """
+        self._repository = repository
+        self._catalog = catalog
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _count(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    @staticmethod
+    def _catalog_id(movie_id) -> Optional[int]:
+        """Return ``movie_id`` as the integer the catalog is keyed by, or None if it is not numeric."""
+        try:
+            return int(movie_id)
+        except (TypeError, ValueError):
+            return None
+
+    def _snapshot(self):
+        """Return the current snapshot, or None if there is none recent enough to serve from."""
+        snapshot = self._catalog.current()
+        if snapshot is not None and time.time() - snapshot.built_at <= self.max_age:
+            return snapshot
+        return None
+
+    def _lookup(self, movie_ids: Iterable[int], snapshot=None) -> Dict[int, bytes]:
+        """Return the details found in the catalog, as encoded JSON, for ``movie_ids``.
+
+        Results are keyed by the IDs as given. IDs that are not numeric, such as
+        IMDb IDs, are never in the catalog and are left to the wrapped repository.
+        ``snapshot`` defaults to the current one.
+        """
+        movie_ids = list(dict.fromkeys(movie_ids))
+        snapshot = snapshot or self._snapshot()
+        found = {}
+        if snapshot is not None:
+            for movie_id in movie_ids:
+                catalog_id = self._catalog_id(movie_id)
+                if catalog_id is None:
+                    continue
+                document = snapshot.details_raw(catalog_id)
+                if document is not None:
+                    found[movie_id] = document
+        self._count(len(found), len(movie_ids) - len(found))
+        return found
+
+    def get_popular(self, page: int = 1) -> List[Dict]:
+        """Get popular movies from the wrapped repository."""
+        return self._repository.get_popular(page=page)
+
+    def get_movie_details(self, movie_id: int) -> Dict:
+        """Get movie details from the catalog, or the wrapped repository."""
+        document = self._lookup([movie_id]).get(movie_id)
+        if document is None:
+            return self._repository.get_movie_details(movie_id=movie_id)
+        return json.loads(document)
+
+    def _lookup_versioned(self, movie_id: int) -> Optional[VersionedResult]:
+        """Return the details of ``movie_id`` from the catalog versioned by its snapshot, or None."""
+        snapshot = self._snapshot()
+        document = self._lookup([movie_id], snapshot).get(movie_id)
+        if document is None:
+            return None
+        return VersionedResult(json.loads(document), f"catalog:{snapshot.built_at}:movie:{movie_id}")
+
+    def get_popular_versioned(self, page: int = 1) -> VersionedResult:
+        """Get popular movies and their version from the wrapped repository."""
+        return self._repository.get_popular_versioned(page=page)
+
+    def get_movie_details_versioned(self, movie_id: int) -> VersionedResult:
+        """Get movie details versioned by the catalog snapshot, or by the wrapped repository."""
+        result = self._lookup_versioned(movie_id)
+        if result is None:
+            return self._repository.get_movie_details_versioned(movie_id=movie_id)
+        return result
+
+    def get_movie_details_raw(self, movie_id: int) -> Optional[bytes]:
+        """Get movie details as encoded JSON from the catalog, or the wrapped repository."""
+        document = self._lookup([movie_id]).get(movie_id)
+        if document is None:
+            return self._repository.get_movie_details_raw(movie_id=movie_id)
+        return document
+
+    def get_movie_details_many(self, movie_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Get details for several movies, requesting only those missing from the catalog."""
+        movie_ids = list(dict.fromkeys(movie_ids))
+        found = self._lookup(movie_ids)
+        misses = [movie_id for movie_id in movie_ids if movie_id not in found]
+        fetched = self._repository.get_movie_details_many(misses) if misses else {}
+        return self._merge(movie_ids, found, fetched)
+
+    def get_movie_details_raw_many(self, movie_ids: Iterable[int]) -> MovieDetailsBatch:
+        """Get details for several movies as ``RawJSON``, the catalog's without being decoded."""
+        movie_ids = list(dict.fromkeys(movie_ids))
+        found = self._lookup(movie_ids)
+        misses = [movie_id for movie_id in movie_ids if movie_id not in found]
+        fetched = self._repository.get_movie_details_raw_many(misses) if misses else {}
+        return self._merge_raw(movie_ids, found, fetched)
+
+    @staticmethod
+    def _merge_raw(
+        movie_ids: List[int], found: Dict[int, bytes], fetched: Dict[int, bytes]
+    ) -> MovieDetailsBatch:
+        details = {movie_id: RawJSON(document) for movie_id, document in found.items()}
+        details.update(fetched)
+        return MovieDetailsBatch(
+            {movie_id: details[movie_id] for movie_id in movie_ids if movie_id in details},
+            failed=getattr(fetched, "failed", []),
+        )
+
+    @staticmethod
+    def _merge(movie_ids: List[int], found: Dict[int, bytes], fetched: Dict[int, Dict]) -> MovieDetailsBatch:
+        details = {movie_id: json.loads(document) for movie_id, document in found.items()}
+        details.update(fetched)
+        return MovieDetailsBatch(
+            {movie_id: details[movie_id] for movie_id in movie_ids if movie_id in details},
+            failed=getattr(fetched, "failed", []),
+        )
+
+    def get_popular_conditional(self, page: int = 1, validators: Dict[str, str] = None) -> ConditionalResult:
+        """Get popular movies from the wrapped repository."""
+        return self._repository.get_popular_conditional(page=page, validators=validators)
+
+    def get_movie_details_conditional(
+        self, movie_id: int, validators: Dict[str, str] = None, raw: bool = False
+    ) -> ConditionalResult:
+        """Revalidate movie details against the wrapped repository."""
+        return self._repository.get_movie_details_conditional(
+            movie_id=movie_id, validators=validators, raw=raw
+        )
+
+    async def get_popular_async(self, page: int = 1) -> List[Dict]:
+        """Get popular movies from the wrapped repository without blocking the event loop."""
+        return await self._repository.get_popular_async(page=page)
+
+    async def get_movie_details_async(self, movie_id: int) -> Dict:
+        """Get movie details from the catalog, or await the wrapped repository."""
+        document = self._lookup([movie_id]).get(movie_id)
+        if document is None:
+            return await self._repository.get_movie_details_async(movie_id=movie_id)
+        return json.loads(document)
+
+    async def get_popular_versioned_async(self, page: int = 1) -> VersionedResult:
+        """Get popular movies and their version from the wrapped repository without blocking."""
+        return await self._repository.get_popular_versioned_async(page=page)
+
+    async def get_movie_details_versioned_async(self, movie_id: int) -> VersionedResult:
+        """Get movie details versioned by the catalog snapshot, or await the wrapped repository."""
+        result = self._lookup_versioned(movie_id)
+        if result is None:
+            return await self._repository.get_movie_details_versioned_async(movie_id=movie_id)
+        return result
+
+    async def get_movie_details_raw_async(self, movie_id: int) -> Optional[bytes]:
+        """Get movie details as encoded JSON from the catalog, or await the wrapped repository."""
+        document = self._lookup([movie_id]).get(movie_id)
+        if document is None:
+            return await self._repository.get_movie_details_raw_async(movie_id=movie_id)
+        return document
+
+    async def get_movie_details_many_async(self, movie_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Get details for several movies, awaiting one batch for those missing from the catalog."""
+        movie_ids = list(dict.fromkeys(movie_ids))
+        found = self._lookup(movie_ids)
+        misses = [movie_id for movie_id in movie_ids if movie_id not in found]
+        fetched = await self._repository.get_movie_details_many_async(misses) if misses else {}
+        return self._merge(movie_ids, found, fetched)
+
+    async def get_movie_details_raw_many_async(self, movie_ids: Iterable[int]) -> MovieDetailsBatch:
+        """Get details for several movies as ``RawJSON``, awaiting those missing from the catalog."""
+        movie_ids = list(dict.fromkeys(movie_ids))
+        found = self._lookup(movie_ids)
+        misses = [movie_id for movie_id in movie_ids if movie_id not in found]
+        fetched = await self._repository.get_movie_details_raw_many_async(misses) if misses else {}
+        return self._merge_raw(movie_ids, found, fetched)
+
+    def stats(self) -> Dict:
+        """Return how many detail lookups the catalog answered."""
+        return {"hits": self.hits, "misses": self.misses, "max_age_seconds": self.max_age}
@@ -0,0 +1,141 @@
+"""In-memory favorites repository."""
+
+import threading
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.domain.entities.favorite import Favorite
+from app.domain.entities.movie_snapshot import MovieSnapshot
+from app.domain.ports.favorites_repository import FavoritesRepository
+
+
+class AtomicCounter:
+    """Thread-safe monotonically increasing id allocator."""
+
+    def __init__(self, start: int = 1):
+        self._next = start
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        """Return the next id."""
+        with self._lock:
+            value = self._next
+            self._next += 1
+            return value
+
+
+class _UserFavorites:
+    """One user's favorites indexed by favorite id and by movie id.
+
+    ``by_id`` preserves insertion order, which is the listing order. ``order``
+    holds the same ids sorted ascending for keyset pagination; removed ids are
+    dropped from it lazily and the list is compacted once they outnumber the
+    live ones.
+    """
+
+    __slots__ = ("by_id", "by_movie", "order", "removed")
+
+    def __init__(self):
+        self.by_id: Dict[int, Favorite] = {}
+        self.by_movie: Dict[int, int] = {}
+        self.order: List[int] = []
+        self.removed = 0
+
+
+class InMemoryFavoritesRepository(FavoritesRepository):
+    """Favorites kept in process memory; lost on restart and not shared between workers.
+
+    Adding, duplicate detection and removal are O(1) per user. The store is
+    safe under threaded servers: every user maps to one of ``stripes`` locks,
+    so operations on one user are serialised while other users proceed in
+    parallel, and favorite ids come from an atomic allocator.
+    """
+
+    def __init__(self, stripes: int = 64):
+        """Initialize an empty store guarded by ``stripes`` locks."""
+        self._users: Dict[int, _UserFavorites] = {}
+        self._ids = AtomicCounter()
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+
+    def _lock_for(self, user_id: int) -> threading.Lock:
+        return self._stripes[hash(user_id) % len(self._stripes)]
+
+    def add(self, user_id: int, movie_id: int, movie: Optional[MovieSnapshot] = None) -> Optional[Favorite]:
+        """Add a movie to a user's favorites."""
+        with self._lock_for(user_id):
+            favorites = self._users.get(user_id)
+            if favorites is None:
+                favorites = self._users[user_id] = _UserFavorites()
+
+            if movie_id in favorites.by_movie:
+                return None
+
+            favorite = Favorite(
+                id=self._ids.next(), movie_id=movie_id, created_at=datetime.now(timezone.utc), movie=movie
+            )
+            favorites.by_id[favorite.id] = favorite
+            favorites.by_movie[movie_id] = favorite.id
+            favorites.order.append(favorite.id)
+            return favorite
+
+    def remove(self, user_id: int, favorite_id: int) -> bool:
+        """Remove a favorite from a user's favorites."""
+        with self._lock_for(user_id):
+            favorites = self._users.get(user_id)
+            if favorites is None:
+                return False
+
+            favorite = favorites.by_id.pop(favorite_id, None)
+            if favorite is None:
+                return False
+            del favorites.by_movie[favorite.movie_id]
+            favorites.removed += 1
+            if favorites.removed > len(favorites.by_id):
+                favorites.order = list(favorites.by_id)
+                favorites.removed = 0
+            return True
+
+    def remove_all(self, user_id: int) -> int:
+        """Remove all favorites of a user."""
+        with self._lock_for(user_id):
+            favorites = self._users.pop(user_id, None)
+            return len(favorites.by_id) if favorites is not None else 0
+
+    def list_by_user(self, user_id: int) -> List[Favorite]:
+        """List a user's favorites in the order they were added."""
+        with self._lock_for(user_id):
+            favorites = self._users.get(user_id)
+            return list(favorites.by_id.values()) if favorites is not None else []
+
+    def list_page(self, user_id: int, limit: int, before_id: Optional[int] = None) -> List[Favorite]:
+        """List a page of a user's favorites, newest first."""
+        with self._lock_for(user_id):
+            favorites = self._users.get(user_id)
+            if favorites is None:
+                return []
+
+            order = favorites.order
+            index = len(order) if before_id is None else bisect_left(order, before_id)
+            page = []
+            while index > 0 and len(page) < limit:
+                index -= 1
+                favorite = favorites.by_id.get(order[index])
+                if favorite is not None:
+                    page.append(favorite)
+            return page
+
+    def update_movie_snapshots(self, user_id: int, snapshots: Dict[int, MovieSnapshot]) -> int:
+        """Replace the movie snapshots of a user's favorites."""
+        with self._lock_for(user_id):
+            favorites = self._users.get(user_id)
+            if favorites is None:
+                return 0
+
+            updated = 0
+            for movie_id, snapshot in snapshots.items():
+                favorite_id = favorites.by_movie.get(movie_id)
+                if favorite_id is not None:
+                    favorites.by_id[favorite_id].movie = snapshot
+                    updated += 1
+            return updated
@@ -0,0 +1,133 @@
+"""SQLAlchemy favorites repository."""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import Index, UniqueConstraint, delete, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.domain.entities.favorite import Favorite
+from app.domain.entities.movie_snapshot import MovieSnapshot
+from app.domain.ports.favorites_repository import FavoritesRepository
+from app.infrastructure.database import db
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:  # SQLite does not keep the timezone
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _snapshot_columns(snapshot: Optional[MovieSnapshot]) -> Dict:
+    if snapshot is None:
+        return {}
+    return {
+        "movie_tmdb_id": snapshot.id,
+        "movie_title": snapshot.title,
+        "movie_release_date": snapshot.release_date,
+        "movie_poster_path": snapshot.poster_path,
+        "movie_vote_average": snapshot.vote_average,
+        "movie_snapshot_at": snapshot.captured_at,
+    }
+
+
+class FavoriteModel(db.Model):
+    """A movie in a user's favorites, with a snapshot of the movie fields listings render."""
+
+    __tablename__ = "favorites"
+    __table_args__ = (
+        UniqueConstraint("user_id", "movie_id", name="uq_favorites_user_movie"),
+        Index("ix_favorites_user_id_id", "user_id", "id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    movie_id = db.Column(db.String(32), nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    # Movie snapshot, all null until it is captured
+    movie_tmdb_id = db.Column(db.Integer)
+    movie_title = db.Column(db.String(512))
+    movie_release_date = db.Column(db.String(10))
+    movie_poster_path = db.Column(db.String(255))
+    movie_vote_average = db.Column(db.Float)
+    movie_snapshot_at = db.Column(db.DateTime(timezone=True))
+
+    def to_entity(self) -> Favorite:
+        """Convert the row to a domain favorite."""
+        movie = None
+        if self.movie_snapshot_at is not None:
+            movie = MovieSnapshot(
+                id=self.movie_tmdb_id,
+                title=self.movie_title,
+                release_date=self.movie_release_date,
+                poster_path=self.movie_poster_path,
+                vote_average=self.movie_vote_average,
+                captured_at=_utc(self.movie_snapshot_at),
+            )
+        return Favorite(id=self.id, movie_id=self.movie_id, created_at=_utc(self.created_at), movie=movie)
+
+
+class SQLAlchemyFavoritesRepository(FavoritesRepository):
+    """Favorites persisted in the application database.
+
+    The unique (user_id, movie_id) constraint makes duplicate detection atomic
+    across worker processes, and the (user_id, id) index serves per-user listings.
+    """
+
+    def add(self, user_id: int, movie_id: int, movie: Optional[MovieSnapshot] = None) -> Optional[Favorite]:
+        """Add a movie to a user's favorites."""
+        favorite = FavoriteModel(
+            user_id=user_id,
+            movie_id=str(movie_id),
+            created_at=datetime.now(timezone.utc),
+            **_snapshot_columns(movie),
+        )
+        db.session.add(favorite)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return None
+        return favorite.to_entity()
+
+    def remove(self, user_id: int, favorite_id: int) -> bool:
+        """Remove a favorite from a user's favorites."""
+        result = db.session.execute(
+            delete(FavoriteModel).where(FavoriteModel.user_id == user_id, FavoriteModel.id == favorite_id)
+        )
+        db.session.commit()
+        return result.rowcount > 0
+
+    def remove_all(self, user_id: int) -> int:
+        """Remove all favorites of a user with a single bulk delete."""
+        result = db.session.execute(delete(FavoriteModel).where(FavoriteModel.user_id == user_id))
+        db.session.commit()
+        return result.rowcount
+
+    def list_by_user(self, user_id: int) -> List[Favorite]:
+        """List a user's favorites in the order they were added."""
+        rows = db.session.scalars(
+            select(FavoriteModel).where(FavoriteModel.user_id == user_id).order_by(FavoriteModel.id)
+        )
+        return [row.to_entity() for row in rows]
+
+    def list_page(self, user_id: int, limit: int, before_id: Optional[int] = None) -> List[Favorite]:
+        """List a page of a user's favorites, newest first, using the (user_id, id) index."""
+        query = select(FavoriteModel).where(FavoriteModel.user_id == user_id)
+        if before_id is not None:
+            query = query.where(FavoriteModel.id < before_id)
+        rows = db.session.scalars(query.order_by(FavoriteModel.id.desc()).limit(limit))
+        return [row.to_entity() for row in rows]
+
+    def update_movie_snapshots(self, user_id: int, snapshots: Dict[int, MovieSnapshot]) -> int:
+        """Replace the movie snapshots of a user's favorites in one transaction."""
+        updated = 0
+        for movie_id, snapshot in snapshots.items():
+            result = db.session.execute(
+                update(FavoriteModel)
+                .where(FavoriteModel.user_id == user_id, FavoriteModel.movie_id == str(movie_id))
+                .values(**_snapshot_columns(snapshot))
+            )
+            updated += result.rowcount
+        db.session.commit()
+        return updated
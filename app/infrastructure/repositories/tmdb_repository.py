@@ -1,17 +1,30 @@
 """TheMovieDB repository implementation."""
 
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
 
-from app.domain.ports.movie_repository import MovieRepository
+from app.domain.ports.movie_repository import (
+    ConditionalResult,
+    MovieDetailsBatch,
+    MovieRepository,
+)
 from app.infrastructure.api.tmdb_client import TMDBClient
 
 
 class TMDBRepository(MovieRepository):
     """Adapter for TheMovieDB API."""
 
-    def __init__(self, client: TMDBClient = None):
-        """Initialize repository with TMDBClient."""
+    def __init__(self, client: TMDBClient = None, batch_concurrency: int = 8):
+        """Initialize repository with TMDBClient.
+
+        Args:
+            client: TheMovieDB API client
+            batch_concurrency: Maximum concurrent lookups in get_movie_details_many
+        """
         self.client = client or TMDBClient()
+        self._batch_executor = ThreadPoolExecutor(
+            max_workers=batch_concurrency, thread_name_prefix="tmdb-batch"
+        )
 
     def get_popular(self, page: int = 1) -> List[Dict]:
         """Get popular movies from TheMovieDB.
@@ -41,3 +54,57 @@ class TMDBRepository(MovieRepository):
             if "404" in str(e):
                 return None
             raise
+
+    def get_popular_conditional(self, page: int = 1, validators: Dict[str, str] = None) -> ConditionalResult:
+        """Get popular movies, revalidating a cached copy with a conditional request.
+
+        Args:
+            page: Page number for pagination
+            validators: Validators returned with the cached copy, if any
+
+        Returns:
+            ConditionalResult holding the list of movie dictionaries
+        """
+        result = self.client.get_conditional("/movie/popular", params={"page": page}, validators=validators)
+        if result.not_modified:
+            return result
+        return result._replace(value=result.value.get("results", []))
+
+    def get_movie_details_conditional(
+        self, movie_id: int, validators: Dict[str, str] = None, raw: bool = False
+    ) -> ConditionalResult:
+        """Get movie details, revalidating a cached copy with a conditional request.
+
+        Args:
+            movie_id: The ID of the movie to retrieve
+            validators: Validators returned with the cached copy, if any
+            raw: Return the response body as TheMovieDB sent it, without decoding it
+
+        Returns:
+            ConditionalResult holding the movie details, or None if not found
+        """
+        return self.client.get_conditional(f"/movie/{movie_id}", validators=validators, raw=raw)
+
+    def get_movie_details_raw(self, movie_id: int) -> Optional[bytes]:
+        """Get the details of a movie as the JSON bytes TheMovieDB returned."""
+        return self.client.get_conditional(f"/movie/{movie_id}", raw=True).value
+
+    def get_movie_details_many(self, movie_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Get details for several movies from TheMovieDB concurrently.
+
+        Args:
+            movie_ids: IDs of the movies to retrieve; duplicates are ignored
+
+        Returns:
+            MovieDetailsBatch mapping each found movie ID to its details; failed lookups are listed in
+            ``failed`` instead of failing the batch
+        """
+        movie_ids = list(dict.fromkeys(movie_ids))
+        results = self._batch_executor.map(self._get_movie_details_or_error, movie_ids)
+        return MovieDetailsBatch.from_results(movie_ids, list(results))
+
+    def _get_movie_details_or_error(self, movie_id: int):
+        try:
+            return self.get_movie_details(movie_id)
+        except Exception as e:
+            return e
@@ -0,0 +1,6 @@
+"""Performance benchmarks.
+
+Benchmarks are plain scripts run against local stubs, e.g.::
+
+    python -m benchmarks.bench_tmdb_connection_pool
+"""
@@ -0,0 +1,60 @@
+"""Benchmark favorites listing latency against the number of favorites.
+
+Compares sequential detail lookups (concurrency 1) with the bounded fan-out,
+using a movie service that simulates TheMovieDB round-trip latency. Listings
+are hydrated (``hydrate=1``), as snapshot listings make no detail lookups.
+
+Usage::
+
+    python -m benchmarks.bench_favorites_fanout [--latency-ms 20] [--concurrency 16]
+"""
+
+import argparse
+import time
+
+from app.application.services.favorites_service import FavoritesService
+
+
+class LatentMovieService:
+    """Movie service answering after a fixed simulated upstream latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def get_movie_details(self, movie_id):
+        time.sleep(self.latency)
+        return {"id": movie_id, "title": f"Movie {movie_id}", "release_date": "2024-01-01"}
+
+    def get_movie_details_many(self, movie_ids):
+        # One lookup after the other, so a batch costs its size times the latency
+        return {movie_id: self.get_movie_details(movie_id) for movie_id in movie_ids}
+
+
+def _measure(user_id: int, concurrency: int, movie_service) -> float:
+    FavoritesService.initialize(movie_service, pool_size=64, max_concurrency=concurrency, deadline=120)
+    start = time.perf_counter()
+    FavoritesService.get_user_favorites(user_id, hydrate=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    movie_service = LatentMovieService(args.latency_ms / 1000)
+    print(f"{'favorites':>10} {'sequential ms':>15} {'fan-out ms':>12} {'speedup':>8}")
+    for user_id, count in enumerate([1, 10, 50, 100, 200], start=1):
+        # Added without a movie service, so no snapshots are captured in the background
+        FavoritesService.initialize(None)
+        for movie_id in range(count):
+            FavoritesService.add_user_favorite(user_id, movie_id)
+        sequential = _measure(user_id, 1, movie_service)
+        fan_out = _measure(user_id, args.concurrency, movie_service)
+        print(f"{count:>10} {sequential * 1000:>15.1f} {fan_out * 1000:>12.1f} {sequential / fan_out:>7.1f}x")
+    FavoritesService.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Microbenchmark favorite add/remove at large per-user list sizes.
+
+Compares the indexed in-memory store with the previous list-scan approach
+(``any(...)`` duplicate check and ``enumerate`` removal).
+
+Usage::
+
+    python -m benchmarks.bench_favorites_index [--operations 200]
+"""
+
+import argparse
+import time
+
+from app.infrastructure.repositories.in_memory_favorites_repository import (
+    InMemoryFavoritesRepository,
+)
+
+
+class IndexedFavorites(InMemoryFavoritesRepository):
+    """The indexed store with a bulk fill for benchmark setup."""
+
+    def fill(self, user_id, count):
+        for movie_id in range(count):
+            self.add(user_id, movie_id)
+
+
+class ListScanFavorites:
+    """The previous store: one list per user scanned on every add and remove."""
+
+    def __init__(self):
+        self._favorites = []
+        self._next_id = 1
+
+    def fill(self, user_id, count):
+        self._favorites = [(movie_id + 1, movie_id) for movie_id in range(count)]
+        self._next_id = count + 1
+
+    def add(self, user_id, movie_id):
+        if any(f[1] == movie_id for f in self._favorites):
+            return None
+        favorite = (self._next_id, movie_id)
+        self._next_id += 1
+        self._favorites.append(favorite)
+        return favorite
+
+    def remove(self, user_id, favorite_id):
+        for i, favorite in enumerate(self._favorites):
+            if favorite[0] == favorite_id:
+                self._favorites.pop(i)
+                return True
+        return False
+
+
+def _per_operation_us(fn, operations: int) -> float:
+    start = time.perf_counter()
+    for i in range(operations):
+        fn(i)
+    return (time.perf_counter() - start) / operations * 1_000_000
+
+
+def _measure(store, size: int, operations: int):
+    store.fill(1, size)
+    add_us = _per_operation_us(lambda i: store.add(1, size + i), operations)
+    # Favorite ids start at 1 and follow the movie ids added above
+    remove_us = _per_operation_us(lambda i: store.remove(1, size + i + 1), operations)
+    return add_us, remove_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'favorites':>10} {'store':<10} {'add us/op':>10} {'remove us/op':>13}")
+    for size in (10_000, 100_000):
+        for name, store in (("list-scan", ListScanFavorites()), ("indexed", IndexedFavorites())):
+            add_us, remove_us = _measure(store, size, args.operations)
+            print(f"{size:>10} {name:<10} {add_us:>10.2f} {remove_us:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark the in-memory favorites store against the SQLAlchemy store.
+
+The SQLAlchemy store runs on a temporary SQLite file database.
+
+Usage::
+
+    python -m benchmarks.bench_favorites_store [--favorites 2000] [--users 10]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from flask import Flask
+
+from app.infrastructure.database import db
+from app.infrastructure.repositories.in_memory_favorites_repository import (
+    InMemoryFavoritesRepository,
+)
+from app.infrastructure.repositories.sqlalchemy_favorites_repository import (
+    SQLAlchemyFavoritesRepository,
+)
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def _run(name: str, repository, users: int, per_user: int) -> None:
+    add_ms = _timed(
+        lambda: [
+            repository.add(user_id, movie_id) for user_id in range(users) for movie_id in range(per_user)
+        ]
+    )
+    duplicate_ms = _timed(lambda: [repository.add(user_id, 0) for user_id in range(users)])
+    list_ms = _timed(lambda: [repository.list_by_user(user_id) for user_id in range(users)])
+    remove_all_ms = _timed(lambda: [repository.remove_all(user_id) for user_id in range(users)])
+    print(
+        f"{name:<12} add {add_ms:>9.1f} ms  duplicate {duplicate_ms:>7.1f} ms  "
+        f"list {list_ms:>7.1f} ms  remove_all {remove_all_ms:>7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--favorites", type=int, default=2000, help="favorites per user")
+    parser.add_argument("--users", type=int, default=10)
+    args = parser.parse_args()
+
+    _run("in-memory", InMemoryFavoritesRepository(), args.users, args.favorites)
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(directory, 'favorites.db')}"
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            _run("sqlalchemy", SQLAlchemyFavoritesRepository(), args.users, args.favorites)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark JSON serialization of TheMovieDB-shaped payloads.
+
+Encodes a popular-movies page, a full movie-details document and a
+favorites listing with embedded details through Flask's default provider,
+the fast provider on the standard library, the fast provider on orjson,
+and passes the details through as already-encoded ``RawJSON`` bytes.
+
+Usage::
+
+    python -m benchmarks.bench_json [--iterations 2000]
+"""
+
+import argparse
+import json
+import time
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.infrastructure.api.json_provider import FastJSONProvider, RawJSON, orjson
+
+
+def movie_summary(movie_id: int) -> dict:
+    """Return a movie as listed in /movie/popular."""
+    return {
+        "adult": False,
+        "backdrop_path": f"/backdrop{movie_id}.jpg",
+        "genre_ids": [28, 12, 878],
+        "id": movie_id,
+        "original_language": "en",
+        "original_title": f"Original Title {movie_id}",
+        "overview": "A group of unlikely heroes sets out on a journey that will change their world. " * 3,
+        "popularity": 1234.567 + movie_id,
+        "poster_path": f"/poster{movie_id}.jpg",
+        "release_date": "2024-05-17",
+        "title": f"Movie Title {movie_id}",
+        "video": False,
+        "vote_average": 7.123,
+        "vote_count": 4567,
+    }
+
+
+def movie_details(movie_id: int) -> dict:
+    """Return a movie as returned by /movie/{id}."""
+    return {
+        **movie_summary(movie_id),
+        "belongs_to_collection": {"id": 10, "name": "Collection", "poster_path": "/c.jpg"},
+        "budget": 200000000,
+        "genres": [{"id": 28, "name": "Action"}, {"id": 12, "name": "Adventure"}],
+        "homepage": f"https://example.com/movies/{movie_id}",
+        "imdb_id": f"tt{movie_id:07d}",
+        "production_companies": [
+            {
+                "id": company,
+                "logo_path": f"/logo{company}.png",
+                "name": f"Studio {company}",
+                "origin_country": "US",
+            }
+            for company in range(6)
+        ],
+        "production_countries": [{"iso_3166_1": "US", "name": "United States of America"}],
+        "revenue": 750000000,
+        "runtime": 142,
+        "spoken_languages": [{"english_name": "English", "iso_639_1": "en", "name": "English"}],
+        "status": "Released",
+        "tagline": "Every journey begins somewhere.",
+    }
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    encoders = {
+        "flask default": DefaultJSONProvider(app),
+        "fast (json)": FastJSONProvider(app, use_orjson=False),
+    }
+    if orjson is not None:
+        encoders["fast (orjson)"] = FastJSONProvider(app)
+
+    details = movie_details(550)
+    payloads = {
+        "popular page (20)": {"movies": [movie_summary(movie_id) for movie_id in range(20)], "page": 1},
+        "movie details": details,
+        "favorites (50)": {
+            "favorites": [
+                {"id": favorite_id, "movie": movie_details(favorite_id), "created_at": "2024-01-01T00:00:00"}
+                for favorite_id in range(50)
+            ]
+        },
+    }
+
+    for name, payload in payloads.items():
+        size = len(json.dumps(payload))
+        print(f"{name} ({size / 1024:.1f} KiB)")
+        for encoder_name, provider in encoders.items():
+            if isinstance(provider, FastJSONProvider):
+                elapsed = _per_call_us(lambda: provider.dumps_bytes(payload), args.iterations)
+            else:
+                elapsed = _per_call_us(lambda: provider.dumps(payload).encode(), args.iterations)
+            print(f"  {encoder_name:<15}: {elapsed:>8.1f} us")
+
+    # Cached upstream bytes sent as they are instead of decoded and encoded again
+    provider = encoders.get("fast (orjson)", encoders["fast (json)"])
+    cached = json.dumps(details).encode()
+    decoded = _per_call_us(lambda: provider.dumps_bytes(provider.loads(cached)), args.iterations)
+    passthrough = _per_call_us(lambda: provider.dumps_bytes(RawJSON(cached)), args.iterations)
+    print("movie details from cached bytes")
+    print(f"  decode + encode: {decoded:>8.1f} us")
+    print(f"  RawJSON        : {passthrough:>8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
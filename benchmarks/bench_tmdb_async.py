@@ -0,0 +1,108 @@
+"""Benchmark the async TMDB client against the threaded sync client.
+
+Two scenarios against a stub that answers after a fixed delay:
+
+* Fan-out: one request looks up ``--requests`` movies. The sync client has
+  at most ``--threads`` lookups in flight; the async client awaits them all
+  on one event loop, bounded by its connection pool. This is the gain async
+  views bring, within a single request.
+* Workers: ``--clients`` requests, each fanning out to ``--fanout`` lookups
+  with the async client, served by ``--workers`` WSGI worker threads. Flask
+  runs async views through ``async_to_sync``, so each request still holds its
+  worker until its lookups finish: at most workers x fan-out lookups are in
+  flight, however large the connection pool is.
+
+Usage::
+
+    python -m benchmarks.bench_tmdb_async [--requests 400] [--delay-ms 100] [--threads 16] [--pool 100]
+        [--clients 64] [--fanout 8] [--workers 8]
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.infrastructure.api.async_tmdb_client import AsyncTMDBClient
+from app.infrastructure.api.tmdb_client import TMDBClient
+from tests.mocks.stub_tmdb_server import StubTMDBServer
+
+
+def _sync(stub: StubTMDBServer, total: int, threads: int) -> float:
+    client = TMDBClient(api_key="bench", pool_maxsize=threads, base_url=stub.base_url)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda movie_id: client._get(f"/movie/{movie_id}"), range(total)))
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed
+
+
+async def _fetch_all(client: AsyncTMDBClient, movie_ids) -> None:
+    await asyncio.gather(*(client._get(f"/movie/{movie_id}") for movie_id in movie_ids))
+
+
+def _async(stub: StubTMDBServer, total: int, pool: int) -> float:
+    client = AsyncTMDBClient(api_key="bench", pool_maxsize=pool, base_url=stub.base_url)
+    start = time.perf_counter()
+    client.run(_fetch_all(client, range(total)))
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed
+
+
+def _async_workers(stub: StubTMDBServer, clients: int, fanout: int, workers: int, pool: int) -> float:
+    """Serve ``clients`` requests of ``fanout`` async lookups each on ``workers`` blocking worker threads."""
+    client = AsyncTMDBClient(api_key="bench", pool_maxsize=pool, base_url=stub.base_url)
+
+    def request(index: int) -> None:
+        # Like async_to_sync, the worker thread waits for the whole request
+        client.run(_fetch_all(client, range(index * fanout, (index + 1) * fanout)))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(request, range(clients)))
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--delay-ms", type=float, default=100)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--pool", type=int, default=100)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    with StubTMDBServer(delay=args.delay_ms / 1000) as stub:
+        print(f"Fan-out: one request looking up {args.requests} movies")
+        elapsed = _sync(stub, args.requests, args.threads)
+        print(
+            f"  sync  ({args.threads:>3} threads)      : {elapsed * 1000:>8.1f} ms, "
+            f"{args.requests / elapsed:>7.1f} lookups/s"
+        )
+
+        stub.reset()
+        elapsed = _async(stub, args.requests, args.pool)
+        print(
+            f"  async (1 loop, pool {args.pool:>3}) : {elapsed * 1000:>8.1f} ms, "
+            f"{args.requests / elapsed:>7.1f} lookups/s, {stub.connections} connections"
+        )
+
+        stub.reset()
+        lookups = args.clients * args.fanout
+        elapsed = _async_workers(stub, args.clients, args.fanout, args.workers, args.pool)
+        print(
+            f"Workers: {args.clients} async requests of {args.fanout} lookups "
+            f"on {args.workers} worker threads\n"
+            f"  async (pool {args.pool:>3})         : {elapsed * 1000:>8.1f} ms, "
+            f"{lookups / elapsed:>7.1f} lookups/s, at most {args.workers * args.fanout} in flight"
+        )
+
+
+if __name__ == "__main__":
+    main()
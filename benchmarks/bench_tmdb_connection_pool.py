@@ -0,0 +1,53 @@
+"""Benchmark pooled keep-alive sessions against a connection per request.
+
+Usage::
+
+    python -m benchmarks.bench_tmdb_connection_pool [--requests 500] [--threads 8]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from app.infrastructure.api.tmdb_client import TMDBClient
+from tests.mocks.stub_tmdb_server import StubTMDBServer
+
+
+def _run(fetch, total: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: fetch(), range(total)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with StubTMDBServer() as stub:
+        url = f"{stub.base_url}/movie/1"
+
+        elapsed = _run(
+            lambda: requests.get(url, params={"api_key": "bench"}, timeout=10), args.requests, args.threads
+        )
+        print(
+            f"requests.get per call : {args.requests} requests, {stub.connections} connections opened, "
+            f"{elapsed * 1000:.1f} ms"
+        )
+
+        stub.reset()
+        client = TMDBClient(api_key="bench", pool_maxsize=args.threads, base_url=stub.base_url)
+        elapsed = _run(lambda: client._get("/movie/1"), args.requests, args.threads)
+        client.close()
+        print(
+            f"pooled TMDBClient     : {args.requests} requests, {stub.connections} connections opened, "
+            f"{elapsed * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
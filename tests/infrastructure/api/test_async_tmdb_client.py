@@ -0,0 +1,205 @@
+"""Tests for the asynchronous TheMovieDB API client."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.domain.exceptions import (
+    MovieAPIConnectionError,
+    MovieAPIResponseError,
+    RateLimitExceededError,
+    UpstreamRateLimitError,
+)
+from app.infrastructure.api.async_tmdb_client import AsyncTMDBClient
+from app.infrastructure.api.circuit_breaker import create_breakers
+from app.infrastructure.api.rate_limiter import TokenBucket
+from app.infrastructure.api.retry_policy import RetryPolicy
+from tests.mocks.stub_tmdb_server import StubTMDBServer
+
+
+@pytest.fixture
+def stub():
+    """Run a local TMDB stub for the duration of a test."""
+    with StubTMDBServer() as server:
+        yield server
+
+
+@pytest.fixture
+def client(stub):
+    """Create an AsyncTMDBClient pointed at the stub."""
+    client = AsyncTMDBClient(
+        api_key="test_key", base_url=stub.base_url, retry_policy=RetryPolicy(base_delay=0)
+    )
+    yield client
+    client.close()
+
+
+def test_get_returns_json_payload(client):
+    """Test that _get returns the decoded JSON body."""
+    assert client.run(client._get("/movie/1")) == {"id": 1, "title": "Stub Movie", "path": "/movie/1"}
+
+
+def test_get_returns_none_on_404(client, stub):
+    """Test that a 404 is returned as None without retries."""
+    stub.payload = lambda path: (404, {"status_message": "Not found"})
+
+    assert client.run(client._get("/movie/1")) is None
+    assert stub.requests == 1
+
+
+def test_get_retries_on_500_error(client, stub):
+    """Test that server errors are retried and surface as connection errors."""
+    stub.payload = lambda path: (500, {})
+
+    with pytest.raises(MovieAPIConnectionError, match="server error: 500"):
+        client.run(client._get("/movie/1"))
+    assert stub.requests == AsyncTMDBClient.MAX_RETRIES
+
+
+def test_get_includes_error_message_from_api(client, stub):
+    """Test that client errors raise with the API status message."""
+    stub.payload = lambda path: (401, {"status_message": "Invalid API key"})
+
+    with pytest.raises(MovieAPIResponseError, match="Invalid API key"):
+        client.run(client._get("/movie/1"))
+
+
+def test_non_json_client_errors_raise_response_errors(client, stub):
+    """Test that a client error with a non-JSON body is a response error that leaves the circuit alone."""
+    stub.payload = lambda path: (403, b"<html>Forbidden</html>")
+
+    with pytest.raises(MovieAPIResponseError, match="HTTP 403"):
+        client.run(client._get("/movie/1"))
+    assert stub.requests == 1
+    assert client.circuit_breakers["details"].stats()["consecutive_failures"] == 0
+
+
+def test_get_raises_connection_error_when_unreachable():
+    """Test that an unreachable upstream raises MovieAPIConnectionError."""
+    client = AsyncTMDBClient(
+        api_key="test_key", base_url="http://127.0.0.1:9", retry_policy=RetryPolicy(base_delay=0)
+    )
+
+    with pytest.raises(MovieAPIConnectionError):
+        client.run(client._get("/movie/1"))
+    client.close()
+
+
+def test_get_can_be_awaited_from_another_event_loop(client):
+    """Test that callers on their own event loop are bridged onto the client's loop."""
+    assert asyncio.run(client._get("/movie/2"))["path"] == "/movie/2"
+
+
+def test_requests_wait_concurrently_on_one_loop(client, stub):
+    """Test that many slow requests are in flight at once over a reused connection pool."""
+    stub.delay = 0.2
+
+    async def fetch_all():
+        return await asyncio.gather(*(client._get(f"/movie/{movie_id}") for movie_id in range(50)))
+
+    start = time.perf_counter()
+    results = asyncio.run(fetch_all())
+
+    assert len(results) == 50
+    assert time.perf_counter() - start < 1
+    assert stub.connections <= 50
+
+
+def test_concurrent_identical_requests_hit_upstream_once(client, stub):
+    """Test that identical requests in flight at the same time are coalesced."""
+    # Long enough that every call joins the first request even if the test process pauses
+    stub.delay = 0.5
+
+    async def fetch_all():
+        return await asyncio.gather(*(client._get("/movie/1") for _ in range(10)))
+
+    results = asyncio.run(fetch_all())
+
+    assert all(result == results[0] for result in results)
+    assert stub.requests == 1
+    assert client.stats()["executed_requests"] == 1
+    assert client.stats()["coalesced_requests"] == 9
+
+
+def test_cancelled_caller_does_not_cancel_shared_request(client, stub):
+    """Test that a caller giving up does not cancel the request for the other callers."""
+    stub.delay = 0.2
+
+    async def fetch():
+        impatient = asyncio.ensure_future(client._get("/movie/1"))
+        patient = asyncio.ensure_future(client._get("/movie/1"))
+        await asyncio.sleep(0.05)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(fetch())["path"] == "/movie/1"
+
+
+def test_get_honours_retry_after_on_429(client, stub, mocker):
+    """Test that a 429 is retried with the delay given in Retry-After."""
+    responses = iter([(429, {}, {"Retry-After": "3"}), (200, {"id": 1})])
+    stub.payload = lambda path: next(responses)
+    next_delay = mocker.patch.object(client.retry_policy, "next_delay", return_value=0)
+
+    assert client.run(client._get("/movie/1")) == {"id": 1}
+    assert stub.requests == 2
+    next_delay.assert_called_once_with(0, None, 3.0)
+
+
+def test_persistent_429s_do_not_open_the_circuit(stub):
+    """Test that a call rejected over quota raises a rate limit error and leaves the circuit closed."""
+    client = AsyncTMDBClient(
+        api_key="test_key",
+        base_url=stub.base_url,
+        retry_policy=RetryPolicy(max_attempts=1),
+        circuit_breakers=create_breakers(failure_threshold=1),
+    )
+    stub.payload = lambda path: (429, {})
+    try:
+        for _ in range(2):
+            with pytest.raises(UpstreamRateLimitError):
+                client.run(client._get("/movie/1"))
+        assert stub.requests == 2
+        assert client.circuit_breakers["details"].state == "closed"
+    finally:
+        client.close()
+
+
+def test_rate_limiter_spaces_out_a_burst_on_the_loop(stub):
+    """Test that a burst is queued on the event loop and a call past the max wait is rejected."""
+    client = AsyncTMDBClient(
+        api_key="test_key",
+        base_url=stub.base_url,
+        # The calls wait 0, 0, 1 and 2 seconds for a token, far enough from the max wait that a
+        # pause in the test process between them does not change which call is rejected
+        rate_limiter=TokenBucket(rate=1, capacity=2),
+        rate_limit_max_wait=1.5,
+    )
+
+    async def fetch_all():
+        return await asyncio.gather(
+            *(client._get(f"/movie/{movie_id}") for movie_id in range(4)), return_exceptions=True
+        )
+
+    start = time.perf_counter()
+    results = asyncio.run(fetch_all())
+
+    assert [isinstance(result, RateLimitExceededError) for result in results].count(True) == 1
+    assert stub.requests == 3
+    assert time.perf_counter() - start >= 0.9
+    client.close()
+
+
+def test_get_conditional_revalidates_against_stub(client, stub):
+    """Test that a revalidation with a matching ETag is answered 304 without a body."""
+    stub.payload = lambda path: (200, {"id": 1}, {"ETag": '"v1"'})
+
+    first = client.run(client.get_conditional("/movie/1"))
+    second = client.run(client.get_conditional("/movie/1", validators=first.validators))
+
+    assert first.value == {"id": 1}
+    assert first.validators == {"etag": '"v1"'}
+    assert second.not_modified
+    assert second.value is None
+    assert client.run(client._get("/movie/1")) == {"id": 1}
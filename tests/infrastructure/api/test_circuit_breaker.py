@@ -0,0 +1,119 @@
+"""Tests for the circuit breaker."""
+
+import pytest
+
+from app.domain.exceptions import (
+    CircuitOpenError,
+    MovieAPIConnectionError,
+    MovieAPIResponseError,
+    UpstreamRateLimitError,
+)
+from app.infrastructure.api.circuit_breaker import CircuitBreaker, endpoint_family
+
+
+@pytest.fixture
+def clock(mocker):
+    """Patch the monotonic clock."""
+    now = [1000.0]
+    mocker.patch("time.monotonic", side_effect=lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def breaker(clock):
+    """Create a breaker that opens after two failures for ten seconds."""
+    return CircuitBreaker("details", failure_threshold=2, recovery_timeout=10)
+
+
+def fail():
+    raise MovieAPIConnectionError("down")
+
+
+def test_opens_after_consecutive_failures(breaker):
+    """Test that the circuit opens after the failure threshold and then rejects calls."""
+    for _ in range(2):
+        with pytest.raises(MovieAPIConnectionError):
+            breaker.call(fail)
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: calls.append(1))
+
+    assert calls == []
+    assert breaker.stats() == {"state": "open", "consecutive_failures": 2, "opened": 1, "rejected_calls": 1}
+
+
+def test_success_resets_failure_count(breaker):
+    """Test that only consecutive failures open the circuit."""
+    with pytest.raises(MovieAPIConnectionError):
+        breaker.call(fail)
+    breaker.call(lambda: None)
+    with pytest.raises(MovieAPIConnectionError):
+        breaker.call(fail)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_client_errors_do_not_count_as_failures(breaker):
+    """Test that an upstream answering with a client error is treated as healthy."""
+
+    def rejected():
+        raise MovieAPIResponseError("Invalid API key")
+
+    for _ in range(3):
+        with pytest.raises(MovieAPIResponseError):
+            breaker.call(rejected)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_upstream_rate_limits_do_not_count_as_failures(breaker):
+    """Test that quota rejections neither open the circuit nor add to the failure count."""
+
+    def throttled():
+        raise UpstreamRateLimitError("rate limit exceeded")
+
+    with pytest.raises(MovieAPIConnectionError):
+        breaker.call(fail)
+    for _ in range(3):
+        with pytest.raises(UpstreamRateLimitError):
+            breaker.call(throttled)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_half_open_trial_success_closes(breaker, clock):
+    """Test that one trial call is allowed after the recovery timeout and closes the circuit."""
+    for _ in range(2):
+        with pytest.raises(MovieAPIConnectionError):
+            breaker.call(fail)
+
+    clock[0] += 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_admits_limited_trials_and_failure_reopens(breaker, clock):
+    """Test that concurrent calls beyond the trial limit are rejected and a failed trial re-opens."""
+    for _ in range(2):
+        with pytest.raises(MovieAPIConnectionError):
+            breaker.call(fail)
+    clock[0] += 10
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    clock[0] += 9
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["opened"] == 2
+
+
+def test_endpoint_family():
+    """Test that popular listings and movie details use separate circuits."""
+    assert endpoint_family("/movie/popular") == "popular"
+    assert endpoint_family("/movie/550") == "details"
@@ -0,0 +1,112 @@
+"""Tests for response compression."""
+
+import gzip
+
+import brotli
+import pytest
+from flask import Blueprint, Flask, jsonify
+
+from app.infrastructure.api.cache_headers import register_cache_headers
+from app.infrastructure.api.compression import ResponseCompressor, register_compression
+
+MOVIES = {
+    "movies": [{"id": movie_id, "title": f"Movie {movie_id}", "overview": "x" * 50} for movie_id in range(50)]
+}
+
+
+@pytest.fixture
+def compressor():
+    """Create a compressor with the default threshold."""
+    return ResponseCompressor(min_size=1024)
+
+
+@pytest.fixture
+def client(compressor):
+    """Create an app serving a large cacheable and a small JSON response."""
+    app = Flask(__name__)
+    register_compression(app, compressor)
+    register_cache_headers(app)
+    movies = Blueprint("movies", __name__)
+
+    @movies.route("/popular")
+    def get_popular_movies():
+        return jsonify(MOVIES)
+
+    @app.route("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    app.register_blueprint(movies, url_prefix="/api/movies")
+    return app.test_client()
+
+
+def test_gzip_is_used_when_accepted(client, compressor):
+    """Test that a large response is gzipped with a weak ETag and Vary header."""
+    response = client.get("/api/movies/popular", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) == len(response.data)
+    assert gzip.decompress(response.data) == jsonify_bytes(client)
+    assert compressor.stats()["bytes_saved"] > 0
+
+
+def test_brotli_is_preferred_when_both_are_accepted(client):
+    """Test that brotli wins over gzip at equal quality."""
+    response = client.get("/api/movies/popular", headers={"Accept-Encoding": "gzip, deflate, br"})
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(response.data) == jsonify_bytes(client)
+
+
+def test_client_quality_values_are_honoured(client):
+    """Test that the client's preference order is respected."""
+    response = client.get("/api/movies/popular", headers={"Accept-Encoding": "br;q=0.5, gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+
+
+def test_responses_are_not_compressed_without_accept_encoding(client):
+    """Test that clients not asking for compression get the identity encoding."""
+    response = client.get("/api/movies/popular", headers={"Accept-Encoding": ""})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_small_responses_are_sent_as_is(client, compressor):
+    """Test that bodies below the threshold are not compressed."""
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+    assert compressor.stats()["skipped_small"] == 1
+
+
+def test_compressed_bodies_are_cached_by_etag(client, compressor, mocker):
+    """Test that repeated hits on an unchanged response reuse the compressed bytes."""
+    encode = mocker.spy(compressor, "encode")
+
+    first = client.get("/api/movies/popular", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/api/movies/popular", headers={"Accept-Encoding": "gzip"})
+    client.get("/api/movies/popular", headers={"Accept-Encoding": "br"})
+
+    assert second.data == first.data
+    assert encode.call_count == 2
+    assert compressor.stats()["cache_hits"] == 1
+    assert compressor.stats()["compressed_responses"] == 3
+
+
+def test_weak_etag_of_compressed_response_revalidates(client):
+    """Test that the ETag of a compressed response is weak and still yields a 304."""
+    etag = client.get("/api/movies/popular", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+
+    response = client.get("/api/movies/popular", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+    assert etag.startswith("W/")
+    assert response.status_code == 304
+    assert "Content-Encoding" not in response.headers
+
+
+def jsonify_bytes(client):
+    """Return the uncompressed body of the popular movies response."""
+    return client.get("/api/movies/popular", headers={"Accept-Encoding": ""}).data
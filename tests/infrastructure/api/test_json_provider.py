@@ -0,0 +1,100 @@
+"""Tests for the fast JSON provider."""
+
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+from app.infrastructure.api import json_provider
+from app.infrastructure.api.json_provider import FastJSONProvider, RawJSON
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "json"])
+def app(request):
+    """Create an app using the provider with each backend."""
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app, use_orjson=request.param)
+    return app
+
+
+def test_backend_falls_back_to_stdlib_without_orjson(monkeypatch):
+    """Test that the provider uses the standard library when orjson is not installed."""
+    monkeypatch.setattr(json_provider, "orjson", None)
+
+    provider = FastJSONProvider(Flask(__name__))
+
+    assert provider.backend == "json"
+    assert provider.dumps({"id": 1}) == '{"id": 1}'
+
+
+def test_dumps_matches_default_provider_semantics(app):
+    """Test that values decode to what Flask's default provider produces, including dates and int keys."""
+    value = {
+        "id": 1,
+        "title": "Amélie",
+        "released": datetime(2001, 4, 25, tzinfo=timezone.utc),
+        "votes": {2: [1.5, None]},
+    }
+    default = DefaultJSONProvider(app)
+
+    assert json.loads(app.json.dumps(value)) == json.loads(default.dumps(value))
+
+
+def test_raw_json_is_embedded_verbatim(app):
+    """Test that RawJSON values are spliced in without being decoded."""
+    raw = RawJSON(b'{"id":7,"title":"Cached"}')
+
+    assert app.json.dumps_bytes(raw) == raw
+    assert json.loads(app.json.dumps({"movie": raw, "others": [raw], "page": 1})) == {
+        "movie": {"id": 7, "title": "Cached"},
+        "others": [{"id": 7, "title": "Cached"}],
+        "page": 1,
+    }
+
+
+def test_many_raw_json_values_are_spliced_in_linear_time(app):
+    """Test that a long list of RawJSON values is encoded in one pass, not one rescan per value."""
+    movie = {"id": 7, "title": "Cached", "overview": "x" * 2000}
+    movies = [RawJSON(json.dumps(dict(movie, id=index)).encode()) for index in range(1000)]
+
+    start = time.perf_counter()
+    encoded = app.json.dumps_bytes({"favorites": [{"movie": raw} for raw in movies]})
+    elapsed = time.perf_counter() - start
+
+    assert [favorite["movie"]["id"] for favorite in json.loads(encoded)["favorites"]] == list(range(1000))
+    # One rescan of the output per value took seconds here
+    assert elapsed < 0.25
+
+
+def test_strings_resembling_placeholders_are_not_replaced(app):
+    """Test that user strings containing NUL characters are left alone."""
+    value = {"title": "\x000:0\x00", "movie": RawJSON(b"[1]")}
+
+    assert json.loads(app.json.dumps(value)) == {"title": "\x000:0\x00", "movie": [1]}
+
+
+def test_jsonify_uses_the_provider(app):
+    """Test that jsonify responses are produced by the provider as application/json bytes."""
+    with app.app_context():
+        response = jsonify({"movie": RawJSON(b'{"id":7}')})
+
+    assert response.mimetype == "application/json"
+    assert response.get_json() == {"movie": {"id": 7}}
+
+
+def test_debug_responses_are_indented(app):
+    """Test that responses are pretty-printed in debug mode like Flask's default provider."""
+    app.debug = True
+    with app.app_context():
+        response = jsonify({"id": 1})
+
+    assert response.data == b'{\n  "id": 1\n}\n'
+
+
+def test_loads_accepts_bytes_and_str(app):
+    """Test that loads decodes both bytes and strings."""
+    assert app.json.loads(b'{"id": 1}') == {"id": 1}
+    assert app.json.loads('{"id": 1}') == {"id": 1}
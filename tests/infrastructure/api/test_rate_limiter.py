@@ -0,0 +1,147 @@
+"""Tests for the token-bucket rate limiters."""
+
+import multiprocessing
+
+import pytest
+
+from app.infrastructure.api.rate_limiter import (
+    FileTokenBucket,
+    RedisTokenBucket,
+    TokenBucket,
+    create_rate_limiter,
+    take_token,
+)
+
+
+@pytest.fixture
+def clock(mocker):
+    """Patch the monotonic and wall clocks."""
+    now = [1000.0]
+    mocker.patch("time.monotonic", side_effect=lambda: now[0])
+    mocker.patch("time.time", side_effect=lambda: now[0])
+    return now
+
+
+def _reserve_many(path, count, queue):
+    bucket = FileTokenBucket(path, rate=1, capacity=5)
+    queue.put([bucket.reserve(max_wait=100) for _ in range(count)])
+    bucket.close()
+
+
+def test_take_token_goes_into_debt_to_space_out_callers():
+    """Test that an empty bucket hands out tokens 1 / rate seconds apart."""
+    tokens, wait = take_token(0.0, 0.0, 0.0, rate=10, capacity=5, max_wait=1)
+    assert wait == pytest.approx(0.1)
+
+    tokens, wait = take_token(tokens, 0.0, 0.0, rate=10, capacity=5, max_wait=1)
+    assert wait == pytest.approx(0.2)
+    assert tokens == pytest.approx(-2)
+
+
+def test_take_token_refuses_reservations_past_max_wait():
+    """Test that a reservation waiting longer than max_wait is refused without taking a token."""
+    assert take_token(-5.0, 0.0, 0.0, rate=10, capacity=5, max_wait=0.5) == (-5.0, None)
+
+
+def test_take_token_refills_up_to_capacity():
+    """Test that an idle bucket refills at the rate but never beyond its capacity."""
+    tokens, wait = take_token(0.0, 0.0, 100.0, rate=10, capacity=5, max_wait=0)
+
+    assert wait == 0
+    assert tokens == 4
+
+
+def test_bucket_allows_a_burst_then_queues(clock):
+    """Test that a burst up to capacity passes and later calls are queued behind it."""
+    bucket = TokenBucket(rate=10, capacity=3)
+
+    waits = [bucket.reserve(max_wait=1) for _ in range(5)]
+
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3:] == [pytest.approx(0.1), pytest.approx(0.2)]
+    assert bucket.stats() == {"granted": 5, "delayed": 2, "rejected": 0}
+
+
+def test_bucket_rejects_when_queue_exceeds_max_wait(clock):
+    """Test that callers that would wait too long are rejected and the bucket recovers over time."""
+    bucket = TokenBucket(rate=10, capacity=1)
+    bucket.reserve(max_wait=0.15)
+    bucket.reserve(max_wait=0.15)
+
+    assert bucket.reserve(max_wait=0.15) is None
+    assert bucket.stats()["rejected"] == 1
+
+    clock[0] += 1
+    assert bucket.reserve(max_wait=0.15) == 0
+
+
+def test_file_bucket_is_shared_between_instances(tmp_path, clock):
+    """Test that two buckets on the same file draw from one balance."""
+    path = str(tmp_path / "bucket")
+    first = FileTokenBucket(path, rate=1, capacity=2)
+    second = FileTokenBucket(path, rate=1, capacity=2)
+
+    assert first.reserve(max_wait=0) == 0
+    assert second.reserve(max_wait=0) == 0
+    assert first.reserve(max_wait=0) is None
+    assert second.reserve(max_wait=5) == pytest.approx(1)
+    first.close()
+    second.close()
+
+
+def test_file_bucket_is_shared_between_processes(tmp_path):
+    """Test that worker processes hand out one capacity's worth of immediate tokens in total."""
+    path = str(tmp_path / "bucket")
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    workers = [context.Process(target=_reserve_many, args=(path, 3, queue)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    waits = queue.get(timeout=10) + queue.get(timeout=10)
+    for worker in workers:
+        worker.join()
+
+    assert sum(1 for wait in waits if wait == 0) == 5
+
+
+def test_redis_bucket_uses_the_shared_script(mocker):
+    """Test that the Redis bucket reserves through the script and maps its refusal to None."""
+    script = mocker.Mock(side_effect=["0.5", "-1"])
+    client = mocker.Mock()
+    client.register_script.return_value = script
+    bucket = RedisTokenBucket(client, rate=10, capacity=20)
+
+    assert bucket.reserve(max_wait=1) == 0.5
+    assert bucket.reserve(max_wait=1) is None
+    script.assert_called_with(keys=["tmdb:rate-limit"], args=[10, 20, 1])
+    assert bucket.stats() == {"granted": 1, "delayed": 1, "rejected": 1, "errors": 0}
+
+
+def test_redis_bucket_falls_back_to_local_bucket_on_errors(mocker, clock):
+    """Test that Redis errors fall back to per-process limiting and Redis is retried later."""
+    script = mocker.Mock(side_effect=[ConnectionError("down"), "0"])
+    client = mocker.Mock()
+    client.register_script.return_value = script
+    bucket = RedisTokenBucket(client, rate=10, capacity=20, retry_interval=5)
+
+    assert bucket.reserve(max_wait=1) == 0
+    assert bucket.reserve(max_wait=1) == 0
+    assert script.call_count == 1
+    assert bucket.stats()["errors"] == 1
+
+    clock[0] += 5
+    assert bucket.reserve(max_wait=1) == 0
+    assert script.call_count == 2
+
+
+def test_create_rate_limiter_selects_the_shared_mode(tmp_path, mocker):
+    """Test that the factory disables, shares or localises the limiter as configured."""
+    assert create_rate_limiter(0) is None
+    assert type(create_rate_limiter(10)) is TokenBucket
+
+    bucket = create_rate_limiter(10, shared="file", path=str(tmp_path / "bucket"))
+    assert isinstance(bucket, FileTokenBucket)
+    bucket.close()
+
+    mocker.patch.object(RedisTokenBucket, "from_url", return_value=None)
+    assert type(create_rate_limiter(10, shared="redis", redis_url="redis://nowhere")) is TokenBucket
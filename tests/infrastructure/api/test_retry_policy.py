@@ -0,0 +1,84 @@
+"""Tests for retry backoff and budgets."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from app.infrastructure.api.retry_policy import (
+    RetryBudget,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+
+@pytest.fixture
+def clock(mocker):
+    """Patch the monotonic clock."""
+    now = [1000.0]
+    mocker.patch("time.monotonic", side_effect=lambda: now[0])
+    return now
+
+
+def test_backoff_is_capped_and_jittered():
+    """Test that backoff grows exponentially up to max_delay before jitter is applied."""
+    policy = RetryPolicy(base_delay=0.5, max_delay=3, rng=lambda: 1.0)
+
+    assert [policy.backoff(attempt) for attempt in range(5)] == [0.5, 1.0, 2.0, 3, 3]
+    assert RetryPolicy(base_delay=0.5, rng=lambda: 0.0).backoff(3) == 0.0
+
+
+def test_next_delay_gives_up_after_max_attempts():
+    """Test that no delay is returned once all attempts are used."""
+    policy = RetryPolicy(max_attempts=2, rng=lambda: 1.0)
+
+    assert policy.next_delay(0, None) == 0.2
+    assert policy.next_delay(1, None) is None
+
+
+def test_next_delay_respects_deadline(clock):
+    """Test that a retry that would start after the deadline is not scheduled."""
+    policy = RetryPolicy(base_delay=1, deadline=2, rng=lambda: 1.0)
+    deadline = policy.start()
+
+    assert policy.next_delay(0, deadline) == 1
+    clock[0] += 1.5
+    assert policy.next_delay(0, deadline) is None
+    assert policy.remaining(deadline, 10) == 0.5
+
+
+def test_budget_limits_retries_to_fraction_of_requests(clock):
+    """Test that retries are limited to the configured ratio of requests."""
+    budget = RetryBudget(ratio=0.25, min_retries_per_second=0, max_tokens=1)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+
+    for _ in range(4):
+        budget.record_request()
+
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    assert budget.stats() == {"retries": 2, "retries_denied": 2}
+
+
+def test_budget_refills_over_time(clock):
+    """Test that the minimum retry rate refills the budget without traffic."""
+    budget = RetryBudget(ratio=0, min_retries_per_second=2, max_tokens=5)
+    for _ in range(5):
+        budget.try_spend()
+    assert not budget.try_spend()
+
+    clock[0] += 0.5
+
+    assert budget.try_spend()
+    assert not budget.try_spend()
+
+
+def test_parse_retry_after_accepts_seconds_and_dates():
+    """Test that Retry-After is parsed in both of its formats."""
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+    assert parse_retry_after("7") == 7.0
+    assert 28 <= parse_retry_after(format_datetime(later, usegmt=True)) <= 30
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,74 @@
+"""Tests for request coalescing."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.infrastructure.api.single_flight import SingleFlight
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_sequential_calls_are_not_coalesced():
+    """Test that calls which do not overlap each execute."""
+    flight = SingleFlight()
+
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.stats() == {"executed_requests": 2, "coalesced_requests": 0}
+
+
+def test_concurrent_callers_share_result():
+    """Test that overlapping callers of one key share a single execution."""
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"id": 1}
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(flight.do, "key", fetch) for _ in range(5)]
+        _wait_for(lambda: flight.coalesced == 4)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(result == {"id": 1} for result in results)
+
+
+def test_concurrent_callers_share_exception():
+    """Test that waiters receive the leader's exception."""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise ValueError("upstream failed")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(flight.do, "key", fetch) for _ in range(3)]
+        _wait_for(lambda: flight.coalesced == 2)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match="upstream failed"):
+                future.result()
+
+
+def test_different_keys_run_independently():
+    """Test that distinct keys are never coalesced."""
+    flight = SingleFlight()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(lambda key: flight.do(key, lambda: key), ["a", "b"]))
+
+    assert results == ["a", "b"]
+    assert flight.stats()["coalesced_requests"] == 0
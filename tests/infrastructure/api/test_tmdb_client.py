@@ -1,11 +1,26 @@
 """Tests for TheMovieDB API client."""
 
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 import responses
 from requests.exceptions import ConnectionError, Timeout
 
-from app.domain.exceptions import MovieAPIConnectionError, MovieAPIResponseError
+from app.domain.exceptions import (
+    CircuitOpenError,
+    MovieAPIConnectionError,
+    MovieAPIResponseError,
+    RateLimitExceededError,
+    UpstreamRateLimitError,
+)
+from app.infrastructure.api.circuit_breaker import create_breakers
+from app.infrastructure.api.rate_limiter import TokenBucket
+from app.infrastructure.api.retry_policy import RetryBudget, RetryPolicy
 from app.infrastructure.api.tmdb_client import TMDBClient
+from tests.mocks.stub_tmdb_server import StubTMDBServer
 
 
 @pytest.fixture
@@ -127,3 +142,305 @@ def test_get_includes_error_message_from_api(client):
 
     with pytest.raises(MovieAPIResponseError, match="Invalid API key"):
         client._get("/test")
+
+
+@responses.activate
+def test_get_raises_response_error_for_non_json_client_errors(client):
+    """Test that a client error with a non-JSON body raises MovieAPIResponseError with the HTTP error."""
+    responses.add(
+        responses.GET, "https://api.themoviedb.org/3/test", body="<html>Forbidden</html>", status=403
+    )
+
+    with pytest.raises(MovieAPIResponseError, match="403"):
+        client._get("/test")
+
+
+def test_client_mounts_pooled_adapter():
+    """Test that the client configures a pooled adapter for TheMovieDB."""
+    client = TMDBClient(api_key="test_key", pool_connections=4, pool_maxsize=32, pool_block=True)
+
+    adapter = client._session.get_adapter(TMDBClient.BASE_URL)
+
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_block is True
+    assert client._session.headers["Connection"] == "keep-alive"
+
+
+@responses.activate
+def test_get_reuses_client_session(client, mocker):
+    """Test that every request goes through the client's shared session."""
+    responses.add(responses.GET, "https://api.themoviedb.org/3/test", json={"success": True}, status=200)
+    session_get = mocker.spy(client._session, "get")
+
+    client._get("/test")
+    client._get("/test")
+
+    assert session_get.call_count == 2
+
+
+@responses.activate
+def test_get_does_not_store_upstream_cookies(client):
+    """Test that upstream cookies are not written to the shared session."""
+    responses.add(
+        responses.GET,
+        "https://api.themoviedb.org/3/test",
+        json={"success": True},
+        status=200,
+        headers={"Set-Cookie": "tracking=1; Path=/"},
+    )
+
+    client._get("/test")
+
+    assert len(client._session.cookies) == 0
+
+
+def test_close_closes_session(client, mocker):
+    """Test that close releases the session's pooled connections."""
+    session_close = mocker.spy(client._session, "close")
+
+    client.close()
+
+    session_close.assert_called_once()
+
+
+@responses.activate
+def test_concurrent_identical_requests_hit_upstream_once(client):
+    """Test that N concurrent identical lookups are coalesced into one upstream call."""
+    concurrency = 10
+    waiters_joined = threading.Event()
+
+    def slow_upstream(request):
+        waiters_joined.wait(5)
+        return 200, {}, json.dumps({"id": 550})
+
+    responses.add_callback(responses.GET, "https://api.themoviedb.org/3/movie/550", callback=slow_upstream)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(client._get, "/movie/550") for _ in range(concurrency)]
+        while client.stats()["coalesced_requests"] < concurrency - 1:
+            time.sleep(0.001)
+        waiters_joined.set()
+        results = [future.result() for future in futures]
+
+    assert len(responses.calls) == 1
+    assert results == [{"id": 550}] * concurrency
+    assert client.stats()["executed_requests"] == 1
+    assert client.stats()["coalesced_requests"] == concurrency - 1
+
+
+@responses.activate
+def test_requests_with_different_params_are_not_coalesced(client):
+    """Test that the coalescing key includes the query parameters."""
+    responses.add(responses.GET, "https://api.themoviedb.org/3/movie/popular", json={"results": []})
+
+    client._get("/movie/popular", params={"page": 1})
+    client._get("/movie/popular", params={"page": 2})
+
+    assert len(responses.calls) == 2
+    assert "page=2" in responses.calls[1].request.url
+
+
+@responses.activate
+def test_get_waits_for_retry_after_on_503(client, mocker):
+    """Test that a 503 with Retry-After is retried after the requested delay."""
+    sleep = mocker.patch("time.sleep")
+    responses.add(
+        responses.GET, "https://api.themoviedb.org/3/test", status=503, headers={"Retry-After": "2"}
+    )
+    responses.add(responses.GET, "https://api.themoviedb.org/3/test", json={"success": True}, status=200)
+
+    assert client._get("/test") == {"success": True}
+    sleep.assert_called_once_with(2.0)
+
+
+@responses.activate
+def test_get_raises_connection_error_when_rate_limited(mocker):
+    """Test that persistent 429 responses surface as an unavailable upstream without opening the circuit."""
+    mocker.patch("time.sleep")
+    client = TMDBClient(api_key="test_key", circuit_breakers=create_breakers(failure_threshold=1))
+    responses.add(responses.GET, "https://api.themoviedb.org/3/test", status=429)
+
+    for _ in range(2):
+        with pytest.raises(UpstreamRateLimitError, match="rate limit"):
+            client._get("/test")
+    assert len(responses.calls) == 2 * TMDBClient.MAX_RETRIES
+    assert client.circuit_breakers["details"].state == "closed"
+
+
+@responses.activate
+def test_get_backs_off_exponentially_with_full_jitter(mocker):
+    """Test that retry delays double per attempt, scaled by the jitter."""
+    sleep = mocker.patch("time.sleep")
+    client = TMDBClient(
+        api_key="test_key",
+        retry_policy=RetryPolicy(max_attempts=4, base_delay=1, max_delay=3, rng=lambda: 0.5),
+    )
+    responses.add(responses.GET, "https://api.themoviedb.org/3/test", status=500)
+
+    with pytest.raises(MovieAPIConnectionError):
+        client._get("/test")
+
+    assert [call.args[0] for call in sleep.call_args_list] == [0.5, 1.0, 1.5]
+
+
+@responses.activate
+def test_get_does_not_retry_past_deadline(mocker):
+    """Test that no retry is started when it would end after the request deadline."""
+    sleep = mocker.patch("time.sleep")
+    client = TMDBClient(api_key="test_key", retry_policy=RetryPolicy(deadline=5))
+    responses.add(
+        responses.GET, "https://api.themoviedb.org/3/test", status=503, headers={"Retry-After": "10"}
+    )
+
+    with pytest.raises(MovieAPIConnectionError, match="server error: 503"):
+        client._get("/test")
+
+    assert len(responses.calls) == 1
+    sleep.assert_not_called()
+
+
+@responses.activate
+def test_get_gives_up_on_retries_longer_than_max_retry_sleep(mocker):
+    """Test that the sync client does not block its thread for a Retry-After beyond max_retry_sleep."""
+    sleep = mocker.patch("time.sleep")
+    client = TMDBClient(api_key="test_key", max_retry_sleep=1)
+    responses.add(
+        responses.GET, "https://api.themoviedb.org/3/test", status=503, headers={"Retry-After": "3"}
+    )
+
+    with pytest.raises(MovieAPIConnectionError, match="server error: 503"):
+        client._get("/test")
+
+    assert len(responses.calls) == 1
+    sleep.assert_not_called()
+
+
+@responses.activate
+def test_get_stops_retrying_when_budget_is_exhausted(mocker):
+    """Test that retries stop once the shared retry budget runs out."""
+    mocker.patch("time.sleep")
+    budget = RetryBudget(ratio=0, min_retries_per_second=0, max_tokens=1)
+    client = TMDBClient(api_key="test_key", retry_policy=RetryPolicy(budget=budget))
+    responses.add(responses.GET, "https://api.themoviedb.org/3/test", status=500)
+
+    with pytest.raises(MovieAPIConnectionError):
+        client._get("/test")
+
+    assert len(responses.calls) == 2
+    assert client.stats()["retries"] == 1
+    assert client.stats()["retries_denied"] == 1
+
+
+def test_circuit_opens_per_endpoint_family_against_failing_stub():
+    """Test that a failing details endpoint opens its circuit without affecting popular movies."""
+    healthy = {"popular": True, "details": False}
+
+    def payload(path):
+        if path.startswith("/movie/popular"):
+            return {"results": []} if healthy["popular"] else (500, {})
+        return {"id": 1} if healthy["details"] else (500, {})
+
+    with StubTMDBServer(payload=payload) as stub:
+        client = TMDBClient(
+            api_key="test_key",
+            base_url=stub.base_url,
+            retry_policy=RetryPolicy(max_attempts=1),
+            circuit_breakers=create_breakers(failure_threshold=3, recovery_timeout=0.2),
+        )
+        for _ in range(3):
+            with pytest.raises(MovieAPIConnectionError):
+                client._get("/movie/1")
+        requests_before = stub.requests
+
+        with pytest.raises(CircuitOpenError):
+            client._get("/movie/1")
+        assert stub.requests == requests_before
+        assert client._get("/movie/popular") == {"results": []}
+
+        healthy["details"] = True
+        time.sleep(0.2)
+        assert client._get("/movie/1") == {"id": 1}
+        assert client.stats()["circuits"]["details"]["state"] == "closed"
+        client.close()
+
+
+@responses.activate
+def test_get_queues_bursts_behind_the_rate_limiter(mocker):
+    """Test that calls beyond the burst wait for a token instead of failing."""
+    mocker.patch("time.monotonic", return_value=1000.0)
+    sleep = mocker.patch("time.sleep")
+    responses.add(responses.GET, "https://api.themoviedb.org/3/test", json={"success": True}, status=200)
+    client = TMDBClient(api_key="test_key", rate_limiter=TokenBucket(rate=10, capacity=2))
+
+    for page in range(4):
+        assert client._get("/test", {"page": page}) == {"success": True}
+
+    assert len(responses.calls) == 4
+    assert [call.args[0] for call in sleep.call_args_list] == [pytest.approx(0.1), pytest.approx(0.2)]
+    assert client.stats()["rate_limiter"]["delayed"] == 2
+
+
+@responses.activate
+def test_get_raises_when_rate_limit_queue_exceeds_max_wait(mocker):
+    """Test that a call that would queue past its max wait fails without reaching the upstream."""
+    mocker.patch("time.monotonic", return_value=1000.0)
+    mocker.patch("time.sleep")
+    responses.add(responses.GET, "https://api.themoviedb.org/3/test", json={"success": True}, status=200)
+    client = TMDBClient(
+        api_key="test_key", rate_limiter=TokenBucket(rate=1, capacity=1), rate_limit_max_wait=0.5
+    )
+    client._get("/test", {"page": 1})
+
+    with pytest.raises(RateLimitExceededError):
+        client._get("/test", {"page": 2})
+    assert len(responses.calls) == 1
+    assert client.stats()["circuits"]["popular"]["consecutive_failures"] == 0
+    assert client.stats()["circuits"]["details"]["consecutive_failures"] == 0
+
+
+@responses.activate
+def test_get_conditional_returns_validators(client):
+    """Test that a full response is returned with its ETag and Last-Modified validators."""
+    responses.add(
+        responses.GET,
+        "https://api.themoviedb.org/3/movie/1",
+        json={"id": 1},
+        headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+    )
+
+    result = client.get_conditional("/movie/1")
+
+    assert result.value == {"id": 1}
+    assert result.validators == {"etag": '"v1"', "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert not result.not_modified
+    assert "If-None-Match" not in responses.calls[0].request.headers
+
+
+@responses.activate
+def test_get_conditional_revalidates_with_validators(client):
+    """Test that validators are sent as conditional headers and a 304 is reported as not modified."""
+    responses.add(responses.GET, "https://api.themoviedb.org/3/movie/1", status=304, headers={"ETag": '"v1"'})
+
+    result = client.get_conditional(
+        "/movie/1", validators={"etag": '"v1"', "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    )
+
+    assert result.not_modified
+    assert result.value is None
+    assert result.validators == {"etag": '"v1"'}
+    request = responses.calls[0].request
+    assert request.headers["If-None-Match"] == '"v1"'
+    assert request.headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+@responses.activate
+def test_get_conditional_raw_returns_the_body_unparsed(client):
+    """Test that raw requests return the response body bytes exactly as sent."""
+    body = b'{"title":"Movie 1",  "id":1}'
+    responses.add(responses.GET, "https://api.themoviedb.org/3/movie/1", body=body, headers={"ETag": '"v1"'})
+
+    result = client.get_conditional("/movie/1", raw=True)
+
+    assert result.value == body
+    assert result.validators == {"etag": '"v1"'}
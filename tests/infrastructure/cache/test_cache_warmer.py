@@ -0,0 +1,144 @@
+"""Tests for the cache warmer and its leader leases."""
+
+import pytest
+
+from app.domain.ports.movie_repository import ConditionalResult
+from app.infrastructure.cache.cache_warmer import (
+    CacheWarmer,
+    FileLease,
+    LocalLease,
+    RedisLease,
+    create_lease,
+)
+from app.infrastructure.cache.memory_cache import MemoryCache
+from app.infrastructure.repositories.cached_movie_repository import (
+    CachedMovieRepository,
+)
+from tests.mocks.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def clock(mocker):
+    """Patch the wall and monotonic clocks used for expiry."""
+    now = [1_700_000_000.0]
+    mocker.patch("time.time", side_effect=lambda: now[0])
+    mocker.patch("time.monotonic", side_effect=lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def inner(mocker):
+    """Create an upstream repository with two movies per popular page."""
+    inner = mocker.Mock()
+    inner.get_popular_conditional.side_effect = lambda page, validators: ConditionalResult(
+        [{"id": page * 10}, {"id": page * 10 + 1}]
+    )
+    inner.get_movie_details_conditional.side_effect = lambda movie_id, validators, raw: ConditionalResult(
+        b'{"id": %d}' % movie_id
+    )
+    return inner
+
+
+@pytest.fixture
+def repository(inner):
+    """Create a cached repository with a 30 second popular and 300 second details TTL."""
+    return CachedMovieRepository(
+        inner,
+        local_cache=MemoryCache(max_entries=64),
+        ttls={CachedMovieRepository.POPULAR: 30, CachedMovieRepository.DETAILS: 300},
+        hard_ttl=600,
+    )
+
+
+def test_warmer_fills_pages_and_their_movies(repository, inner, clock):
+    """Test that a cold cycle fetches the first pages and the details of every movie on them."""
+    warmer = CacheWarmer(repository, pages=2, lead=5, concurrency=1)
+
+    assert warmer.run_once()
+
+    assert inner.get_popular_conditional.call_count == 2
+    assert sorted(call.kwargs["movie_id"] for call in inner.get_movie_details_conditional.call_args_list) == [
+        10,
+        11,
+        20,
+        21,
+    ]
+    assert warmer.stats()["last_cycle"]["cold"] == 6
+    assert repository.get_movie_details_raw(movie_id=21) == b'{"id": 21}'
+    assert repository.stats()["misses"] == 0
+
+
+def test_warmer_refreshes_only_entries_about_to_expire(repository, inner, clock):
+    """Test that fresh entries are skipped and pages expiring within the lead are refreshed in time."""
+    warmer = CacheWarmer(repository, pages=1, lead=5, concurrency=1)
+    warmer.run_once()
+    inner.reset_mock()
+
+    warmer.run_once()
+    assert warmer.stats()["last_cycle"]["refreshed"] == 0
+
+    clock[0] += 26
+    warmer.run_once()
+
+    inner.get_popular_conditional.assert_called_once_with(page=1, validators=None)
+    inner.get_movie_details_conditional.assert_not_called()
+    assert warmer.stats()["last_cycle"]["refreshed"] == 1
+    assert warmer.stats()["last_cycle"]["max_lag_seconds"] == 0
+
+
+def test_warmer_reports_lag_of_late_refreshes(repository, clock):
+    """Test that entries refreshed after their soft TTL report how late they were."""
+    warmer = CacheWarmer(repository, pages=1, lead=0, concurrency=1)
+    warmer.run_once()
+    clock[0] += 40
+
+    warmer.run_once()
+
+    stats = warmer.stats()
+    assert stats["last_cycle"]["max_lag_seconds"] == 10
+    assert stats["cycles"] == 2
+    assert stats["refreshed"] == 4
+    assert stats["seconds_since_last_cycle"] == 0
+
+
+def test_only_the_lease_holder_warms(repository, inner, tmp_path):
+    """Test that a worker without the lease skips the cycle and takes over once it is released."""
+    path = str(tmp_path / "warmer.lock")
+    leader = CacheWarmer(repository, pages=1, lease=FileLease(path))
+    follower = CacheWarmer(repository, pages=1, lease=FileLease(path))
+
+    assert leader.run_once()
+    assert not follower.run_once()
+    assert follower.stats()["leader"] is False
+
+    leader.stop()
+    assert follower.run_once()
+    follower.stop()
+
+
+def test_redis_lease_is_held_by_one_worker_and_extended(clock):
+    """Test that the Redis lease admits one holder, is renewed by it and can be handed over."""
+    client = FakeRedis()
+    first = RedisLease(client, ttl=30)
+    second = RedisLease(client, ttl=30)
+
+    assert first.acquire()
+    assert not second.acquire()
+    clock[0] += 20
+    assert first.acquire()
+    clock[0] += 20
+    assert not second.acquire()
+
+    first.release()
+    assert second.acquire()
+
+
+def test_create_lease_selects_the_mode(tmp_path, mocker):
+    """Test that the factory returns a local, file or Redis lease, falling back to a file lock."""
+    assert isinstance(create_lease("none"), LocalLease)
+    assert isinstance(create_lease("file", path=str(tmp_path / "lock")), FileLease)
+
+    mocker.patch.object(RedisLease, "from_url", return_value=None)
+    assert isinstance(
+        create_lease("redis", path=str(tmp_path / "lock"), redis_url="redis://nowhere"), FileLease
+    )
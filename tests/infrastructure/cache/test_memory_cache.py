@@ -0,0 +1,75 @@
+"""Tests for the in-process LRU/TTL cache."""
+
+import pytest
+
+from app.infrastructure.cache.memory_cache import MemoryCache
+
+
+@pytest.fixture
+def clock(mocker):
+    """Patch the monotonic clock used for expiry."""
+    now = [1000.0]
+    mocker.patch("app.infrastructure.cache.memory_cache.time.monotonic", side_effect=lambda: now[0])
+    return now
+
+
+def test_get_returns_stored_value():
+    """Test that a stored value is returned and counted as a hit."""
+    cache = MemoryCache()
+    cache.set("key", {"id": 1}, ttl=30)
+
+    assert cache.get("key") == {"id": 1}
+    assert cache.stats()["hits"] == 1
+
+
+def test_get_missing_key_counts_miss():
+    """Test that a missing key returns None and counts a miss."""
+    cache = MemoryCache()
+
+    assert cache.get("missing") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    """Test that entries are dropped once their TTL has elapsed."""
+    cache = MemoryCache()
+    cache.set("key", "value", ttl=30)
+
+    clock[0] += 29
+    assert cache.get("key") == "value"
+
+    clock[0] += 2
+    assert cache.get("key") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the LRU entry is evicted when the cache is full."""
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1, ttl=30)
+    cache.set("b", 2, ttl=30)
+    cache.get("a")  # "b" is now least recently used
+
+    cache.set("c", 3, ttl=30)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_get_many_returns_only_cached_keys():
+    """Test that get_many skips keys that are not cached."""
+    cache = MemoryCache()
+    cache.set("a", 1, ttl=30)
+
+    assert cache.get_many(["a", "b"]) == {"a": 1}
+
+
+def test_non_positive_ttl_is_not_stored():
+    """Test that values with no remaining TTL are not stored."""
+    cache = MemoryCache()
+    cache.set("key", "value", ttl=0)
+
+    assert cache.get("key") is None
@@ -0,0 +1,70 @@
+"""Tests for the negative cache and its Bloom filter front."""
+
+import pytest
+
+from app.infrastructure.cache.negative_cache import BloomFilter, NegativeCache
+
+
+@pytest.fixture
+def clock(mocker):
+    """Patch the monotonic clock used for expiry and filter rotation."""
+    now = [1000.0]
+    mocker.patch("time.monotonic", side_effect=lambda: now[0])
+    return now
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test that every added key is reported present and few others are."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for movie_id in range(1000):
+        bloom.add(f"movie:{movie_id}")
+
+    assert all(f"movie:{movie_id}" in bloom for movie_id in range(1000))
+    false_positives = sum(f"movie:{movie_id}" in bloom for movie_id in range(1000, 11000))
+    assert false_positives < 300
+
+
+@pytest.mark.parametrize("bloom", [False, True])
+def test_missing_keys_expire_after_ttl(clock, bloom):
+    """Test that missing keys are remembered for the TTL only."""
+    cache = NegativeCache(ttl=60, bloom=bloom)
+    cache.add("movie:1")
+
+    assert cache.missing(["movie:1", "movie:2"]) == ["movie:1"]
+    clock[0] += 61
+    assert not cache.contains("movie:1")
+
+
+def test_cache_is_bounded():
+    """Test that the oldest missing keys are evicted beyond max_entries."""
+    cache = NegativeCache(max_entries=2)
+    for movie_id in range(3):
+        cache.add(f"movie:{movie_id}")
+
+    assert cache.missing([f"movie:{movie_id}" for movie_id in range(3)]) == ["movie:1", "movie:2"]
+
+
+def test_bloom_filter_rules_out_unseen_keys_and_rotates(clock):
+    """Test that unseen keys skip the LRU and old generations are dropped after two TTLs."""
+    cache = NegativeCache(ttl=60, bloom=True)
+    cache.add("movie:1")
+    assert not cache.contains("movie:2")
+    assert cache.stats()["bloom_skips"] == 1
+
+    for _ in range(2):
+        clock[0] += 61
+        cache.add("movie:other")
+    assert all("movie:1" not in generation for generation in cache._generations)
+
+
+def test_stats_report_the_miss_rate():
+    """Test that the miss rate counts local hits and newly found misses over all checks."""
+    cache = NegativeCache()
+    cache.contains("movie:1")
+    cache.add("movie:1")
+    cache.missing(["movie:1", "movie:2", "movie:3"])
+
+    stats = cache.stats()
+    assert (stats["checks"], stats["hits"], stats["inserts"]) == (4, 1, 1)
+    assert stats["miss_rate"] == 0.5
+    assert stats["bloom_skips"] is None
@@ -0,0 +1,49 @@
+"""Tests for the shared Redis cache tier."""
+
+from app.infrastructure.cache.redis_cache import RedisCache
+from tests.mocks.fake_redis import BrokenRedis, FakeRedis
+
+
+def test_set_and_get_round_trip_json():
+    """Test that values are stored as JSON under the key prefix."""
+    client = FakeRedis()
+    cache = RedisCache(client, prefix="test:")
+
+    cache.set("movie:1", {"id": 1, "title": "Test"}, ttl=30)
+
+    assert "test:movie:1" in client.store
+    assert cache.get("movie:1") == {"id": 1, "title": "Test"}
+    assert cache.stats()["hits"] == 1
+
+
+def test_get_many_uses_a_single_mget():
+    """Test that bulk lookups hit Redis once."""
+    client = FakeRedis()
+    cache = RedisCache(client)
+    cache.set("a", 1, ttl=30)
+    client.calls.clear()
+
+    assert cache.get_many(["a", "b"]) == {"a": 1}
+    assert client.calls == [("mget", ("movies:a", "movies:b"))]
+    assert cache.stats() == {"hits": 1, "misses": 1, "errors": 0}
+
+
+def test_redis_errors_are_reported_as_misses():
+    """Test that an unreachable Redis degrades to cache misses."""
+    cache = RedisCache(BrokenRedis())
+
+    cache.set("a", 1, ttl=30)
+    assert cache.get("a") is None
+    assert cache.stats()["errors"] == 1
+
+
+def test_tier_is_skipped_after_a_failure(mocker):
+    """Test that Redis is not retried until the retry interval passes."""
+    client = FakeRedis()
+    cache = RedisCache(client, retry_interval=5)
+    mocker.patch.object(client, "mget", side_effect=ConnectionError("down"))
+
+    cache.get("a")
+    cache.get("a")
+
+    assert client.mget.call_count == 1
@@ -0,0 +1,118 @@
+"""Tests for the memory-mapped catalog file and the catalog shared through it."""
+
+import os
+
+import pytest
+
+from app.domain.exceptions import InvalidCatalogFileError
+from app.infrastructure.cache.cache_warmer import FileLease
+from app.infrastructure.catalog.catalog_file import read_catalog, write_catalog
+from app.infrastructure.catalog.mapped_catalog import MappedMovieCatalog
+from app.infrastructure.catalog.snapshot import CatalogSnapshot
+from tests.infrastructure.catalog.test_movie_catalog import MOVIES
+
+DETAILS = {155: {"id": 155, "title": "The Dark Knight", "runtime": 152}}
+
+
+@pytest.fixture
+def path(tmp_path):
+    """Return the path of a catalog file in a temporary directory."""
+    return str(tmp_path / "catalog.bin")
+
+
+@pytest.fixture
+def snapshot():
+    """Build a snapshot of a few movies and the details of one of them."""
+    return CatalogSnapshot.build(MOVIES, built_at=1_700_000_000.0, details=DETAILS)
+
+
+def test_mapped_snapshot_answers_like_the_original(snapshot, path):
+    """Test that a snapshot read back from its file returns the same results."""
+    write_catalog(snapshot, path)
+    mapped = read_catalog(path)
+
+    assert len(mapped) == len(snapshot)
+    assert mapped.built_at == snapshot.built_at
+    for query in ("batman", "dark kni", "decouv", "千と千尋の神隠し", "nothing"):
+        assert mapped.search(query) == snapshot.search(query)
+    for filters in (
+        {},
+        {"sort": "release_date"},
+        {"descending": False},
+        {"min_vote_average": 8, "genre_id": 16},
+    ):
+        assert mapped.discover(**filters) == snapshot.discover(**filters)
+    assert mapped.get(129) == snapshot.get(129)
+    assert mapped.get(1) is None
+
+
+def test_details_are_stored_as_json(snapshot, path):
+    """Test that movie details are kept as encoded JSON and missing ones return None."""
+    write_catalog(snapshot, path)
+    mapped = read_catalog(path)
+
+    assert mapped.details_raw(155) == b'{"id":155,"title":"The Dark Knight","runtime":152}'
+    assert mapped.details_raw(272) is None
+    assert mapped.details_raw(1) is None
+
+
+def test_replacing_the_file_keeps_earlier_mappings_valid(snapshot, path):
+    """Test that files are swapped atomically and readers of the old file are unaffected."""
+    write_catalog(snapshot, path)
+    old = read_catalog(path)
+
+    write_catalog(CatalogSnapshot.build(MOVIES[:1], built_at=1_700_000_300.0), path)
+
+    assert old.search("batman").total == 3
+    assert len(read_catalog(path)) == 1
+    assert os.listdir(os.path.dirname(path)) == ["catalog.bin"]
+
+
+@pytest.mark.parametrize("content", [b"", b"MOVIECAT", b"NOTACATALOG" + bytes(64)])
+def test_invalid_files_are_rejected(path, content):
+    """Test that empty, truncated and foreign files raise InvalidCatalogFileError."""
+    with open(path, "wb") as file:
+        file.write(content)
+
+    with pytest.raises(InvalidCatalogFileError):
+        read_catalog(path)
+
+
+@pytest.fixture
+def repository(mocker):
+    """Create a repository serving the movies as one popular page."""
+    repository = mocker.Mock()
+    repository.get_popular.side_effect = lambda page: MOVIES if page == 1 else []
+    repository.get_movie_details_many.return_value = DETAILS
+    return repository
+
+
+def test_leader_writes_the_file_and_followers_map_it(repository, path):
+    """Test that only the worker holding the lease builds, and every worker reads the file."""
+    leader = MappedMovieCatalog(repository, path, pages=1, lease=FileLease(f"{path}.lock"))
+    # Every file is due for a rebuild, but the lease is taken
+    follower = MappedMovieCatalog(repository, path, pages=1, interval=0, lease=FileLease(f"{path}.lock"))
+    try:
+        leader.refresh()
+        follower.refresh()
+    finally:
+        leader.stop()
+        follower.stop()
+
+    assert leader.writes == 1
+    assert follower.writes == 0
+    assert repository.get_popular.call_count == 1
+    assert follower.current().details_raw(155) is not None
+    assert follower.search("batman").total == 3
+
+
+def test_fresh_file_is_mapped_without_rebuilding(repository, path):
+    """Test that a restarted worker serves the existing file and only rebuilds once it is due."""
+    MappedMovieCatalog(repository, path, pages=1).refresh()
+    restarted = MappedMovieCatalog(repository, path, pages=1)
+
+    restarted.refresh()
+
+    assert restarted.writes == 0
+    assert restarted.stats()["movies"] == 4
+    assert repository.get_popular.call_count == 1
@@ -0,0 +1,157 @@
+"""Tests for the columnar catalog snapshot and the in-memory movie catalog."""
+
+import pytest
+
+from app.domain.exceptions import CatalogUnavailableError
+from app.infrastructure.catalog.in_memory_catalog import InMemoryMovieCatalog
+from app.infrastructure.catalog.snapshot import CatalogSnapshot, tokenize
+
+MOVIES = [
+    {
+        "id": 155,
+        "title": "The Dark Knight",
+        "overview": "Batman raises the stakes in his war on crime.",
+        "popularity": 90.0,
+        "vote_average": 8.5,
+        "release_date": "2008-07-16",
+        "genre_ids": [18, 28],
+    },
+    {
+        "id": 49026,
+        "title": "The Dark Knight Rises",
+        "overview": "Following the death of Harvey Dent, Batman vanishes.",
+        "popularity": 70.0,
+        "vote_average": 7.8,
+        "release_date": "2012-07-16",
+        "genre_ids": [28, 80],
+    },
+    {
+        "id": 272,
+        "title": "Batman Begins",
+        "overview": "A young Bruce Wayne travels to the Far East.",
+        "popularity": 80.0,
+        "vote_average": 7.7,
+        "release_date": "2005-06-10",
+        "genre_ids": [28],
+    },
+    {
+        "id": 129,
+        "title": "Le Voyage de Chihiro",
+        "original_title": "千と千尋の神隠し",
+        "overview": "Une fillette découvre un monde d'esprits.",
+        "popularity": 60.0,
+        "vote_average": 8.5,
+        "release_date": "",
+        "genre_ids": [16],
+        "runtime": 125,
+    },
+]
+
+
+@pytest.fixture
+def snapshot():
+    """Build a snapshot of a few movies."""
+    return CatalogSnapshot.build(MOVIES, built_at=1_700_000_000.0)
+
+
+def ids(page):
+    """Return the ids of the movies on a catalog page."""
+    return [movie["id"] for movie in page.movies]
+
+
+def test_tokenize_folds_case_and_accents():
+    """Test that tokens are lowercased and stripped of accents."""
+    assert tokenize("Amélie, AMÉLIE!") == ["amelie", "amelie"]
+    assert tokenize(None) == []
+
+
+def test_search_requires_every_word_and_ranks_title_hits_first(snapshot):
+    """Test that search ANDs words and ranks title matches above overview matches."""
+    assert ids(snapshot.search("batman")) == [272, 155, 49026]
+    assert ids(snapshot.search("dark batman")) == [155, 49026]
+    assert snapshot.search("batman joker").total == 0
+
+
+def test_search_matches_last_word_as_prefix(snapshot):
+    """Test that the last query word matches as a prefix, for search-as-you-type."""
+    assert ids(snapshot.search("dark kni")) == [155, 49026]
+    assert ids(snapshot.search("decouv")) == [129]
+    assert snapshot.search("kni dark").total == 0
+
+
+def test_search_pages_results(snapshot):
+    """Test that limit and offset page through matches while total counts all of them."""
+    page = snapshot.search("batman", limit=1, offset=1)
+
+    assert ids(page) == [155]
+    assert page.total == 3
+
+
+def test_discover_sorts_and_filters(snapshot):
+    """Test that discover walks the sorted index and applies every filter."""
+    assert ids(snapshot.discover(sort="release_date")) == [49026, 155, 272, 129]
+    assert ids(snapshot.discover(sort="popularity", descending=False)) == [129, 49026, 272, 155]
+    assert ids(snapshot.discover(min_vote_average=8)) == [155, 129]
+    assert ids(snapshot.discover(genre_id=28, released_from="2006-01-01", released_to="2012-12-31")) == [
+        155,
+        49026,
+    ]
+    page = snapshot.discover(genre_id=28, limit=2, offset=1)
+    assert ids(page) == [272, 49026]
+    assert page.total == 3
+
+
+def test_rows_rebuild_movies(snapshot):
+    """Test that movies read back from the columns keep their fields."""
+    movie = snapshot.get(129)
+
+    assert movie["title"] == "Le Voyage de Chihiro"
+    assert movie["genre_ids"] == [16]
+    assert movie["runtime"] == 125
+    assert movie["poster_path"] is None
+    assert snapshot.get(1) is None
+    assert len(snapshot) == 4
+
+
+@pytest.fixture
+def repository(mocker):
+    """Create a repository serving the movies as one popular page."""
+    repository = mocker.Mock()
+    repository.get_popular.side_effect = lambda page: MOVIES if page == 1 else []
+    repository.get_movie_details_many.return_value = {155: {"id": 155, "runtime": 152}}
+    return repository
+
+
+def test_catalog_merges_details_into_popular_movies(repository):
+    """Test that a refresh builds the catalog from popular pages and their details."""
+    catalog = InMemoryMovieCatalog(repository, pages=2)
+
+    catalog.refresh()
+
+    repository.get_movie_details_many.assert_called_once_with([155, 49026, 272, 129])
+    assert catalog.snapshot().get(155)["runtime"] == 152
+    assert catalog.search("batman").total == 3
+    assert catalog.stats()["movies"] == 4
+
+
+def test_first_query_loads_the_catalog(repository):
+    """Test that the first query starts the rebuild thread and waits for the first snapshot."""
+    catalog = InMemoryMovieCatalog(repository, pages=1, load_timeout=5)
+
+    try:
+        assert ids(catalog.discover(sort="vote_average", limit=1)) == [155]
+    finally:
+        catalog.stop()
+    assert catalog.stats()["refreshes"] == 1
+
+
+def test_unloaded_catalog_is_unavailable(repository):
+    """Test that queries fail with CatalogUnavailableError when the first build fails."""
+    repository.get_popular.side_effect = RuntimeError("down")
+    catalog = InMemoryMovieCatalog(repository, load_timeout=0.05)
+
+    try:
+        with pytest.raises(CatalogUnavailableError):
+            catalog.search("batman")
+    finally:
+        catalog.stop()
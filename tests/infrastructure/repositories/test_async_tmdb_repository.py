@@ -0,0 +1,68 @@
+"""Tests for the asynchronous TheMovieDB repository."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.infrastructure.api.async_tmdb_client import AsyncTMDBClient
+from app.infrastructure.repositories.async_tmdb_repository import AsyncTMDBRepository
+from tests.mocks.stub_tmdb_server import StubTMDBServer
+
+
+def payload(path):
+    """Serve popular movies, and details for every movie except 404."""
+    if path == "/movie/popular":
+        return {"results": [{"id": 1, "title": "Popular Movie"}]}
+    movie_id = int(path.rsplit("/", 1)[1])
+    if movie_id == 404:
+        return 404, {"status_message": "Not found"}
+    if movie_id == 500:
+        return 500, {"status_message": "Internal error"}
+    return {"id": movie_id, "title": f"Movie {movie_id}"}
+
+
+@pytest.fixture
+def repository():
+    """Create an AsyncTMDBRepository backed by a local stub."""
+    with StubTMDBServer(payload=payload) as stub:
+        client = AsyncTMDBClient(api_key="test_key", base_url=stub.base_url)
+        yield AsyncTMDBRepository(client=client)
+        client.close()
+
+
+def test_get_popular_async_returns_results(repository):
+    """Test that popular movies are read from the results field."""
+    assert asyncio.run(repository.get_popular_async(page=1)) == [{"id": 1, "title": "Popular Movie"}]
+
+
+def test_blocking_port_methods_run_on_client_loop(repository):
+    """Test that the blocking port methods return the same data as the async ones."""
+    assert repository.get_popular(page=1) == [{"id": 1, "title": "Popular Movie"}]
+    assert repository.get_movie_details(7) == {"id": 7, "title": "Movie 7"}
+    assert repository.get_movie_details(404) is None
+
+
+def test_get_movie_details_many_async_omits_missing_movies(repository):
+    """Test that batch lookups fan out, skip duplicates and omit movies that were not found."""
+    details = asyncio.run(repository.get_movie_details_many_async([3, 404, 2, 3]))
+
+    assert list(details) == [3, 2]
+    assert details[2] == {"id": 2, "title": "Movie 2"}
+
+
+def test_get_movie_details_many_async_keeps_movies_when_one_lookup_fails(repository):
+    """Test that a failed lookup is listed in failed instead of failing the batch."""
+    details = asyncio.run(repository.get_movie_details_many_async([1, 500]))
+
+    assert details == {1: {"id": 1, "title": "Movie 1"}}
+    assert details.failed == [500]
+
+
+def test_get_movie_details_raw_returns_upstream_bytes(repository):
+    """Test that raw details are the undecoded response body, and None for missing movies."""
+    body = repository.get_movie_details_raw(7)
+
+    assert isinstance(body, bytes)
+    assert json.loads(body) == {"id": 7, "title": "Movie 7"}
+    assert asyncio.run(repository.get_movie_details_raw_async(404)) is None
@@ -0,0 +1,511 @@
+"""Tests for the two-tier caching movie repository."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.domain.entities.raw_json import RawJSON
+from app.domain.exceptions import MovieAPIConnectionError
+from app.domain.ports.movie_repository import ConditionalResult, MovieDetailsBatch
+from app.infrastructure.cache import freshness
+from app.infrastructure.cache.memory_cache import MemoryCache
+from app.infrastructure.cache.negative_cache import NegativeCache
+from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.repositories.cached_movie_repository import (
+    CachedMovieRepository,
+)
+from tests.mocks.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def inner(mocker):
+    """Create a mock upstream repository."""
+    inner = mocker.Mock()
+    inner.get_popular.return_value = [{"id": 1, "title": "Test Movie"}]
+    inner.get_movie_details.side_effect = lambda movie_id: {"id": movie_id, "title": f"Movie {movie_id}"}
+    # Like the port defaults, conditional lookups always fetch the full value
+    inner.get_popular_conditional.side_effect = lambda page, validators: ConditionalResult(
+        inner.get_popular(page=page)
+    )
+
+    def details_conditional(movie_id, validators, raw=False):
+        movie = inner.get_movie_details(movie_id=movie_id)
+        return ConditionalResult(json.dumps(movie).encode() if raw and movie is not None else movie)
+
+    inner.get_movie_details_conditional.side_effect = details_conditional
+    return inner
+
+
+@pytest.fixture
+def redis_client():
+    """Create an in-memory Redis stand-in."""
+    return FakeRedis()
+
+
+@pytest.fixture
+def clock(mocker):
+    """Patch the wall and monotonic clocks used for expiry."""
+    now = [1_700_000_000.0]
+    mocker.patch("time.time", side_effect=lambda: now[0])
+    mocker.patch("time.monotonic", side_effect=lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def refresh_executor():
+    """Create the executor running background refreshes."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def drain(executor):
+    """Wait for queued refreshes on a single-worker executor."""
+    executor.submit(lambda: None).result()
+
+
+@pytest.fixture(autouse=True)
+def reset_freshness():
+    """Clear staleness markers between tests."""
+    freshness.reset()
+
+
+@pytest.fixture
+def repository(inner, redis_client, refresh_executor):
+    """Create a cached repository with both tiers."""
+    return CachedMovieRepository(
+        inner,
+        local_cache=MemoryCache(max_entries=16),
+        remote_cache=RedisCache(redis_client),
+        ttls={CachedMovieRepository.POPULAR: 30, CachedMovieRepository.DETAILS: 300},
+        hard_ttl=600,
+        refresh_executor=refresh_executor,
+    )
+
+
+def test_get_popular_is_cached(repository, inner):
+    """Test that repeated popular lookups hit the upstream once."""
+    assert repository.get_popular(page=1) == [{"id": 1, "title": "Test Movie"}]
+    assert repository.get_popular(page=1) == [{"id": 1, "title": "Test Movie"}]
+
+    inner.get_popular.assert_called_once_with(page=1)
+    assert repository.stats()["hits"] == 1
+    assert repository.stats()["misses"] == 1
+
+
+def test_pages_are_cached_separately(repository, inner):
+    """Test that each page has its own cache entry."""
+    repository.get_popular(page=1)
+    repository.get_popular(page=2)
+
+    assert inner.get_popular.call_count == 2
+
+
+def test_remote_tier_is_shared_between_processes(inner, redis_client, repository):
+    """Test that a second process with a cold local tier is served from Redis."""
+    repository.get_movie_details(movie_id=7)
+    other_process = CachedMovieRepository(inner, remote_cache=RedisCache(redis_client))
+
+    assert other_process.get_movie_details(movie_id=7) == {"id": 7, "title": "Movie 7"}
+    inner.get_movie_details.assert_called_once_with(movie_id=7)
+    assert other_process.stats()["remote"]["hits"] == 1
+
+
+def test_per_endpoint_ttls_are_applied(repository, redis_client):
+    """Test that popular and details entries use their own TTLs."""
+    repository.get_popular(page=1)
+    repository.get_movie_details(movie_id=7)
+
+    popular = repository._local.get("popular:1")
+    details = repository._local.get("movie:7")
+    assert details["fresh_until"] - popular["fresh_until"] == pytest.approx(270, abs=1)
+    assert details["stale_until"] - popular["stale_until"] == pytest.approx(0, abs=1)
+
+
+def test_not_found_is_not_cached(repository, inner):
+    """Test that missing movies are not cached."""
+    inner.get_movie_details.side_effect = None
+    inner.get_movie_details.return_value = None
+
+    assert repository.get_movie_details(movie_id=404) is None
+    assert repository.get_movie_details(movie_id=404) is None
+    assert inner.get_movie_details.call_count == 2
+
+
+def test_works_without_remote_tier(inner):
+    """Test that the repository runs with the local tier only."""
+    repository = CachedMovieRepository(inner)
+
+    repository.get_movie_details(movie_id=1)
+    repository.get_movie_details(movie_id=1)
+
+    inner.get_movie_details.assert_called_once_with(movie_id=1)
+    assert repository.stats()["remote"] is None
+
+
+def test_fresh_entries_are_not_refreshed(repository, inner, clock):
+    """Test that entries within their soft TTL are served without refreshing."""
+    repository.get_popular(page=1)
+    clock[0] += 29
+
+    repository.get_popular(page=1)
+
+    inner.get_popular.assert_called_once_with(page=1)
+    assert freshness.markers() == set()
+
+
+def test_stale_entry_is_served_while_refreshing(repository, inner, clock, refresh_executor):
+    """Test that a stale entry is returned immediately and refreshed in the background."""
+    repository.get_popular(page=1)
+    clock[0] += 31
+    inner.get_popular.return_value = [{"id": 2, "title": "New Movie"}]
+
+    assert repository.get_popular(page=1) == [{"id": 1, "title": "Test Movie"}]
+    assert freshness.markers() == {freshness.STALE}
+
+    drain(refresh_executor)
+    assert inner.get_popular.call_count == 2
+    assert repository.get_popular(page=1) == [{"id": 2, "title": "New Movie"}]
+    assert repository.stats()["stale_hits"] == 1
+    assert repository.stats()["refreshes"] == 1
+
+
+def test_stale_local_entries_are_replaced_by_fresher_remote_ones(
+    inner, redis_client, clock, refresh_executor
+):
+    """Test that a worker with a stale local copy serves another worker's refresh instead of refreshing."""
+
+    def create_repository():
+        return CachedMovieRepository(
+            inner,
+            local_cache=MemoryCache(max_entries=16),
+            remote_cache=RedisCache(redis_client),
+            ttls={CachedMovieRepository.POPULAR: 30},
+            hard_ttl=600,
+            refresh_executor=refresh_executor,
+        )
+
+    leader, follower = create_repository(), create_repository()
+    leader.get_popular(page=1)
+    follower.get_popular(page=1)
+    clock[0] += 31
+    inner.get_popular.return_value = [{"id": 2, "title": "New Movie"}]
+    leader.warm_popular(page=1)
+
+    assert follower.get_popular(page=1) == [{"id": 2, "title": "New Movie"}]
+    assert follower.get_popular(page=1) == [{"id": 2, "title": "New Movie"}]
+    drain(refresh_executor)
+    assert inner.get_popular.call_count == 2
+    assert follower.stats()["stale_hits"] == 0
+    assert follower.stats()["refreshes"] == 0
+    assert follower.stats()["hits"] == 3
+
+
+def test_stale_entry_is_served_when_upstream_is_down(repository, inner, clock, refresh_executor):
+    """Test that the last good value keeps being served while refreshes fail."""
+    repository.get_movie_details(movie_id=7)
+    clock[0] += 301
+    inner.get_movie_details.side_effect = MovieAPIConnectionError("TheMovieDB is down")
+
+    assert repository.get_movie_details(movie_id=7) == {"id": 7, "title": "Movie 7"}
+    drain(refresh_executor)
+    freshness.reset()
+
+    assert repository.get_movie_details(movie_id=7) == {"id": 7, "title": "Movie 7"}
+    assert freshness.markers() == {freshness.STALE, freshness.REVALIDATION_FAILED}
+    assert repository.stats()["refresh_errors"] == 1
+
+
+def test_entries_past_hard_ttl_are_fetched_synchronously(repository, inner, clock):
+    """Test that entries older than the hard TTL are no longer served."""
+    repository.get_movie_details(movie_id=7)
+    clock[0] += 601
+    inner.get_movie_details.side_effect = MovieAPIConnectionError("TheMovieDB is down")
+
+    with pytest.raises(MovieAPIConnectionError):
+        repository.get_movie_details(movie_id=7)
+
+
+def test_refresh_of_deleted_movie_invalidates_entry(repository, inner, clock, refresh_executor):
+    """Test that a refresh returning not found drops the cached entry."""
+    repository.get_movie_details(movie_id=7)
+    clock[0] += 301
+    inner.get_movie_details.side_effect = None
+    inner.get_movie_details.return_value = None
+
+    repository.get_movie_details(movie_id=7)
+    drain(refresh_executor)
+
+    assert repository.get_movie_details(movie_id=7) is None
+
+
+def test_get_movie_details_many_fetches_only_misses(repository, inner, redis_client):
+    """Test that batch lookups check each tier in bulk and fetch only the misses."""
+    inner.get_movie_details_many.side_effect = lambda ids: {
+        movie_id: {"id": movie_id, "title": f"Movie {movie_id}"} for movie_id in ids if movie_id != 404
+    }
+    repository.get_movie_details(movie_id=1)
+    redis_client.calls.clear()
+
+    movies = repository.get_movie_details_many([1, 2, 2, 404, 3])
+
+    assert list(movies) == [1, 2, 3]
+    inner.get_movie_details_many.assert_called_once_with([2, 404, 3])
+    assert redis_client.calls[0] == ("mget", ("movies:movie:2", "movies:movie:404", "movies:movie:3"))
+    assert ("pipeline", 2) in redis_client.calls
+
+
+def test_get_movie_details_many_served_from_cache(repository, inner):
+    """Test that a repeated batch is served entirely from cache."""
+    inner.get_movie_details_many.side_effect = lambda ids: {movie_id: {"id": movie_id} for movie_id in ids}
+    repository.get_movie_details_many([1, 2])
+
+    assert repository.get_movie_details_many([2, 1]) == {2: {"id": 2}, 1: {"id": 1}}
+    inner.get_movie_details_many.assert_called_once()
+
+
+def test_get_movie_details_async_awaits_inner_on_miss_only(repository, inner, mocker):
+    """Test that async lookups await the wrapped repository once and then hit the cache."""
+    inner.get_movie_details_async = mocker.AsyncMock(return_value={"id": 5, "title": "Movie 5"})
+
+    assert asyncio.run(repository.get_movie_details_async(5)) == {"id": 5, "title": "Movie 5"}
+    assert asyncio.run(repository.get_movie_details_async(5)) == {"id": 5, "title": "Movie 5"}
+
+    inner.get_movie_details_async.assert_awaited_once_with(movie_id=5)
+    inner.get_movie_details.assert_not_called()
+
+
+def test_get_movie_details_many_async_fetches_only_misses(repository, inner, mocker):
+    """Test that async batch lookups await one batch for the movies missing from the cache."""
+    repository.get_movie_details(1)
+    inner.get_movie_details_many_async = mocker.AsyncMock(return_value={2: {"id": 2, "title": "Movie 2"}})
+
+    details = asyncio.run(repository.get_movie_details_many_async([1, 2]))
+
+    assert details == {1: {"id": 1, "title": "Movie 1"}, 2: {"id": 2, "title": "Movie 2"}}
+    inner.get_movie_details_many_async.assert_awaited_once_with([2])
+
+
+def test_stale_entry_is_revalidated_with_its_validators(repository, inner, clock, refresh_executor):
+    """Test that a refresh sends the cached validators and a 304 only extends the entry's TTLs."""
+    inner.get_movie_details_conditional.side_effect = [
+        ConditionalResult({"id": 7, "title": "Movie 7"}, {"etag": '"v1"'}),
+        ConditionalResult(None, {"etag": '"v1"'}, not_modified=True),
+    ]
+    repository.get_movie_details(movie_id=7)
+    clock[0] += 301
+
+    assert repository.get_movie_details(movie_id=7) == {"id": 7, "title": "Movie 7"}
+    drain(refresh_executor)
+
+    inner.get_movie_details_conditional.assert_called_with(movie_id=7, validators={"etag": '"v1"'}, raw=False)
+    envelope = repository._remote.get_many(["movie:7"])["movie:7"]
+    assert envelope["value"] == {"id": 7, "title": "Movie 7"}
+    assert envelope["validators"] == {"etag": '"v1"'}
+    assert envelope["fresh_until"] == pytest.approx(clock[0] + 300)
+    freshness.reset()
+    assert repository.get_movie_details(movie_id=7) == {"id": 7, "title": "Movie 7"}
+    assert freshness.markers() == set()
+    assert repository.stats()["revalidated"] == 1
+
+
+def test_changed_entry_replaces_value_and_validators(repository, inner, clock, refresh_executor):
+    """Test that a refresh answered with a new body stores it with its new validators."""
+    inner.get_popular_conditional.side_effect = [
+        ConditionalResult([{"id": 1}], {"last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        ConditionalResult([{"id": 2}], {"last_modified": "Tue, 02 Jan 2024 00:00:00 GMT"}),
+    ]
+    repository.get_popular(page=1)
+    clock[0] += 31
+
+    repository.get_popular(page=1)
+    drain(refresh_executor)
+
+    assert repository.get_popular(page=1) == [{"id": 2}]
+    assert repository._local.get("popular:1")["validators"] == {
+        "last_modified": "Tue, 02 Jan 2024 00:00:00 GMT"
+    }
+    assert repository.stats()["revalidated"] == 0
+
+
+def test_served_entries_record_their_versions(repository, inner, redis_client):
+    """Test that fetched and cached entries record the same content version for the request."""
+    repository.get_movie_details(movie_id=7)
+    fetched = freshness.versions()
+    freshness.reset()
+
+    repository.get_movie_details(movie_id=7)
+    other_process = CachedMovieRepository(inner, remote_cache=RedisCache(redis_client))
+    other_process.get_movie_details(movie_id=7)
+
+    assert len(fetched) == 1
+    assert freshness.versions() == fetched
+
+
+def test_versioned_lookups_name_the_entry_and_its_content(
+    repository, inner, redis_client, clock, refresh_executor
+):
+    """Test that every copy of an entry reports one version, and a refreshed entry a new one."""
+    fetched = repository.get_popular_versioned(page=1)
+    other_process = CachedMovieRepository(inner, remote_cache=RedisCache(redis_client))
+    promoted = other_process.get_popular_versioned(page=1)
+
+    assert fetched.version.startswith("popular:1:")
+    assert repository.get_popular_versioned(page=1).version == promoted.version == fetched.version
+    assert promoted.value is not fetched.value
+
+    inner.get_popular.return_value = [{"id": 2, "title": "Other"}]
+    clock[0] += 31
+    repository.get_popular(page=1)
+    drain(refresh_executor)
+
+    refreshed = repository.get_popular_versioned(page=1)
+    assert refreshed.value == [{"id": 2, "title": "Other"}]
+    assert refreshed.version != fetched.version
+
+
+def test_raw_details_are_passed_through_without_decoding(repository, inner, redis_client, mocker):
+    """Test that raw details are cached as the upstream bytes and served unchanged from both tiers."""
+    body = b'{"title": "Movie 7", "id": 7}'
+    inner.get_movie_details_conditional.side_effect = lambda movie_id, validators, raw: ConditionalResult(
+        body
+    )
+    loads = mocker.spy(json, "loads")
+
+    assert repository.get_movie_details_raw(movie_id=7) == body
+    assert repository.get_movie_details_raw(movie_id=7) is body
+    other_process = CachedMovieRepository(inner, remote_cache=RedisCache(redis_client))
+    assert other_process.get_movie_details_raw(movie_id=7) == body
+
+    inner.get_movie_details_conditional.assert_called_once_with(movie_id=7, validators=None, raw=True)
+    assert all(call.args[0] != body for call in loads.call_args_list)
+    assert repository.get_movie_details(movie_id=7) == {"id": 7, "title": "Movie 7"}
+
+
+def test_raw_batches_return_cached_entries_as_raw_json(repository, inner, mocker):
+    """Test that raw batches serve hits as RawJSON without decoding and encode fetched movies once."""
+    inner.get_movie_details_many.side_effect = lambda ids: {movie_id: {"id": movie_id} for movie_id in ids}
+    repository.get_movie_details_many([1])
+    loads = mocker.spy(json, "loads")
+
+    movies = repository.get_movie_details_raw_many([1, 2])
+
+    assert all(isinstance(movie, RawJSON) for movie in movies.values())
+    assert {movie_id: json.loads(movie) for movie_id, movie in movies.items()} == {1: {"id": 1}, 2: {"id": 2}}
+    assert loads.call_count == 2
+    assert repository.get_movie_details_raw_many([2]) == {2: movies[2]}
+    assert [call.args[0] for call in inner.get_movie_details_many.call_args_list] == [[1], [2]]
+
+
+def test_raw_and_decoded_reads_share_one_entry(repository, inner):
+    """Test that an entry stored decoded is encoded once for raw reads and keeps its version."""
+    repository.get_movie_details(movie_id=7)
+    version = freshness.versions()
+
+    raw = repository.get_movie_details_raw(movie_id=7)
+
+    assert json.loads(raw) == {"id": 7, "title": "Movie 7"}
+    assert repository.get_movie_details_raw(movie_id=7) is raw
+    assert freshness.versions() == version
+    inner.get_movie_details_conditional.assert_called_once()
+
+
+def test_revalidated_raw_entry_keeps_its_bytes(repository, inner, clock, refresh_executor):
+    """Test that a 304 on a raw entry keeps the cached bytes and content version."""
+    body = b'{"id": 7}'
+    inner.get_movie_details_conditional.side_effect = [
+        ConditionalResult(body, {"etag": '"v1"'}),
+        ConditionalResult(None, {"etag": '"v1"'}, not_modified=True),
+    ]
+    repository.get_movie_details_raw(movie_id=7)
+    version = repository._local.get("movie:7")["version"]
+    clock[0] += 301
+
+    repository.get_movie_details_raw(movie_id=7)
+    drain(refresh_executor)
+
+    inner.get_movie_details_conditional.assert_called_with(movie_id=7, validators={"etag": '"v1"'}, raw=True)
+    envelope = repository._local.get("movie:7")
+    assert envelope["raw"] == body
+    assert envelope["version"] == version
+    assert envelope["fresh_until"] == pytest.approx(clock[0] + 300)
+
+
+def test_get_movie_details_raw_async_awaits_inner_on_miss_only(repository, inner, mocker):
+    """Test that raw async lookups await the inner repository once and then hit the cache."""
+    inner.get_movie_details_raw_async = mocker.AsyncMock(return_value=b'{"id": 1}')
+
+    assert asyncio.run(repository.get_movie_details_raw_async(1)) == b'{"id": 1}'
+    assert asyncio.run(repository.get_movie_details_raw_async(1)) == b'{"id": 1}'
+
+    inner.get_movie_details_raw_async.assert_awaited_once_with(movie_id=1)
+
+
+def test_serving_a_page_prefetches_the_next_one(inner, redis_client, refresh_executor):
+    """Test that with prefetching on, page p + 1 is fetched in the background once."""
+    repository = CachedMovieRepository(
+        inner,
+        remote_cache=RedisCache(redis_client),
+        refresh_executor=refresh_executor,
+        prefetch_next_page=True,
+    )
+
+    repository.get_popular(page=1)
+    drain(refresh_executor)
+    repository.get_popular(page=1)
+    drain(refresh_executor)
+
+    assert [call.kwargs["page"] for call in inner.get_popular_conditional.call_args_list] == [1, 2]
+    assert repository.stats()["prefetches"] == 1
+    repository.get_popular(page=2)
+    assert repository.stats()["misses"] == 1
+
+
+@pytest.fixture
+def negative_repository(inner, redis_client, refresh_executor):
+    """Create a cached repository remembering movies TheMovieDB does not know."""
+    inner.get_movie_details.side_effect = lambda movie_id: None if movie_id >= 900 else {"id": movie_id}
+    inner.get_movie_details_many.side_effect = lambda movie_ids: {
+        movie_id: {"id": movie_id} for movie_id in movie_ids if movie_id < 900
+    }
+    return CachedMovieRepository(
+        inner,
+        remote_cache=RedisCache(redis_client),
+        refresh_executor=refresh_executor,
+        negative_cache=NegativeCache(ttl=60),
+    )
+
+
+def test_missing_movies_are_not_requested_again(negative_repository, inner):
+    """Test that repeated lookups of an unknown movie are answered without upstream calls."""
+    assert negative_repository.get_movie_details(movie_id=999) is None
+
+    assert negative_repository.get_movie_details(movie_id=999) is None
+    assert negative_repository.get_movie_details_raw(movie_id=999) is None
+    assert asyncio.run(negative_repository.get_movie_details_async(movie_id=999)) is None
+    inner.get_movie_details.assert_called_once_with(movie_id=999)
+    assert negative_repository.stats()["negative"]["hits"] == 3
+
+
+def test_batches_skip_and_remember_missing_movies(negative_repository, inner):
+    """Test that batch lookups request missing movies once and keep the others in order."""
+    assert negative_repository.get_movie_details_many([901, 1]) == {1: {"id": 1}}
+    assert negative_repository.get_movie_details_many([2, 901]) == {2: {"id": 2}}
+
+    assert [call.args[0] for call in inner.get_movie_details_many.call_args_list] == [[901, 1], [2]]
+
+
+def test_batches_do_not_remember_failed_lookups(negative_repository, inner):
+    """Test that movies whose lookup failed are reported as failed and requested again."""
+    inner.get_movie_details_many.side_effect = lambda movie_ids: MovieDetailsBatch(
+        {movie_id: {"id": movie_id} for movie_id in movie_ids if movie_id != 2}, failed=[2]
+    )
+
+    movies = negative_repository.get_movie_details_many([1, 2])
+    negative_repository.get_movie_details_many([2])
+
+    assert movies == {1: {"id": 1}}
+    assert movies.failed == [2]
+    assert inner.get_movie_details_many.call_args.args[0] == [2]
@@ -0,0 +1,110 @@
+"""Tests for the repository serving movie details from the catalog."""
+
+import asyncio
+
+import pytest
+
+from app.domain.ports.movie_repository import VersionedResult
+from app.infrastructure.catalog.catalog_file import read_catalog, write_catalog
+from app.infrastructure.catalog.snapshot import CatalogSnapshot
+from app.infrastructure.repositories.catalog_movie_repository import (
+    CatalogMovieRepository,
+)
+
+
+@pytest.fixture
+def clock(mocker):
+    """Patch the wall clock used for the catalog age."""
+    now = [1_700_000_000.0]
+    mocker.patch("time.time", side_effect=lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def inner(mocker):
+    """Create a mock wrapped repository."""
+    inner = mocker.Mock()
+    inner.get_movie_details.side_effect = lambda movie_id: {"id": movie_id, "source": "cache"}
+    inner.get_movie_details_many.side_effect = lambda movie_ids: {
+        movie_id: {"id": movie_id, "source": "cache"} for movie_id in movie_ids
+    }
+    inner.get_movie_details_raw_async = mocker.AsyncMock(return_value=b'{"id": 2}')
+    return inner
+
+
+@pytest.fixture
+def catalog(mocker, clock):
+    """Create a catalog holding the details of movie 1."""
+    catalog = mocker.Mock()
+    catalog.current.return_value = CatalogSnapshot.build(
+        [{"id": 1, "title": "One"}, {"id": 2, "title": "Two"}],
+        built_at=clock[0],
+        details={1: {"id": 1, "source": "catalog"}},
+    )
+    return catalog
+
+
+def test_details_in_the_catalog_skip_the_wrapped_repository(inner, catalog):
+    """Test that details found in the catalog are served from it."""
+    repository = CatalogMovieRepository(inner, catalog)
+
+    assert repository.get_movie_details(1) == {"id": 1, "source": "catalog"}
+    assert repository.get_movie_details_raw(1) == b'{"id":1,"source":"catalog"}'
+    assert repository.get_movie_details(2) == {"id": 2, "source": "cache"}
+    assert asyncio.run(repository.get_movie_details_raw_async(2)) == b'{"id": 2}'
+    inner.get_movie_details.assert_called_once_with(movie_id=2)
+    assert repository.stats()["hits"] == 2
+
+
+def test_batches_request_only_movies_missing_from_the_catalog(inner, catalog):
+    """Test that batch lookups merge catalog hits with one batch for the rest, in request order."""
+    repository = CatalogMovieRepository(inner, catalog)
+
+    details = repository.get_movie_details_many([3, 1, 3])
+
+    assert list(details) == [3, 1]
+    assert details[1]["source"] == "catalog"
+    inner.get_movie_details_many.assert_called_once_with([3])
+
+
+def test_catalog_details_are_versioned_by_their_snapshot(inner, catalog):
+    """Test that catalog hits carry the snapshot's version and misses the wrapped repository's."""
+    inner.get_movie_details_versioned.return_value = VersionedResult({"id": 2}, "movie:2:abc")
+    repository = CatalogMovieRepository(inner, catalog)
+
+    first = repository.get_movie_details_versioned(1)
+    second = repository.get_movie_details_versioned(1)
+
+    assert first.value == second.value == {"id": 1, "source": "catalog"}
+    assert first.version == second.version == "catalog:1700000000.0:movie:1"
+    assert repository.get_movie_details_versioned(2).version == "movie:2:abc"
+
+
+def test_old_catalogs_are_not_served(inner, catalog, clock):
+    """Test that details come from the wrapped repository once the catalog is older than max_age."""
+    repository = CatalogMovieRepository(inner, catalog, max_age=60)
+    clock[0] += 61
+
+    assert repository.get_movie_details(1) == {"id": 1, "source": "cache"}
+    assert repository.stats()["misses"] == 1
+
+
+def test_missing_catalog_falls_back(inner, catalog):
+    """Test that lookups go to the wrapped repository before the catalog is loaded."""
+    catalog.current.return_value = None
+    repository = CatalogMovieRepository(inner, catalog)
+
+    assert repository.get_movie_details_many([1]) == {1: {"id": 1, "source": "cache"}}
+
+
+def test_string_ids_are_looked_up_in_a_mapped_catalog(inner, catalog, tmp_path):
+    """Test that numeric string IDs are found in a mapped catalog file and other IDs fall back."""
+    path = str(tmp_path / "catalog.bin")
+    write_catalog(catalog.current.return_value, path)
+    catalog.current.return_value = read_catalog(path)
+    repository = CatalogMovieRepository(inner, catalog)
+
+    assert repository.get_movie_details("1") == {"id": 1, "source": "catalog"}
+    assert repository.get_movie_details("tt0111161") == {"id": "tt0111161", "source": "cache"}
+    assert list(repository.get_movie_details_many(["2", "1"])) == ["2", "1"]
+    inner.get_movie_details_many.assert_called_once_with(["2"])
@@ -0,0 +1,174 @@
+"""Tests for the in-memory favorites repository."""
+
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+
+from app.domain.entities.movie_snapshot import MovieSnapshot
+from app.infrastructure.repositories.in_memory_favorites_repository import (
+    InMemoryFavoritesRepository,
+)
+
+
+@pytest.fixture
+def repository():
+    """Create an empty repository."""
+    return InMemoryFavoritesRepository()
+
+
+def test_add_assigns_increasing_ids(repository):
+    """Test that favorites get unique, increasing ids across users."""
+    first = repository.add(1, 550)
+    second = repository.add(2, 550)
+
+    assert second.id == first.id + 1
+
+
+def test_add_duplicate_returns_none(repository):
+    """Test that a movie can only be added once per user."""
+    repository.add(1, 550)
+
+    assert repository.add(1, 550) is None
+
+
+def test_favorite_records_use_slots(repository):
+    """Test that favorites are compact slotted records."""
+    favorite = repository.add(1, 550)
+
+    assert not hasattr(favorite, "__dict__")
+
+
+def test_list_by_user_keeps_insertion_order_after_removal(repository):
+    """Test that listing order survives removals."""
+    favorites = [repository.add(1, movie_id) for movie_id in (3, 1, 2)]
+    repository.remove(1, favorites[1].id)
+
+    assert [f.movie_id for f in repository.list_by_user(1)] == [3, 2]
+
+
+def test_removed_movie_can_be_added_again(repository):
+    """Test that removal also clears the movie index."""
+    favorite = repository.add(1, 550)
+    repository.remove(1, favorite.id)
+
+    assert repository.add(1, 550) is not None
+
+
+def test_remove_unknown_favorite_returns_false(repository):
+    """Test removing favorites that do not exist or belong to someone else."""
+    favorite = repository.add(1, 550)
+
+    assert repository.remove(2, favorite.id) is False
+    assert repository.remove(1, favorite.id + 1) is False
+
+
+def test_remove_all_returns_number_removed(repository):
+    """Test that remove_all clears a user's favorites."""
+    repository.add(1, 1)
+    repository.add(1, 2)
+
+    assert repository.remove_all(1) == 2
+    assert repository.remove_all(1) == 0
+    assert repository.list_by_user(1) == []
+
+
+def test_concurrent_adds_and_removes_keep_invariants():
+    """Stress add/remove from many threads and check ids and indexes stay consistent."""
+    repository = InMemoryFavoritesRepository(stripes=4)
+    users = range(8)
+    movies = range(50)
+    threads = 16
+    rounds = 500
+    added = []
+    start = threading.Barrier(threads)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        start.wait()
+        for _ in range(rounds):
+            user_id = rng.choice(users)
+            favorite = repository.add(user_id, rng.choice(movies))
+            if favorite is not None:
+                added.append(favorite.id)
+            favorites = repository.list_by_user(user_id)
+            if favorites and rng.random() < 0.5:
+                repository.remove(user_id, rng.choice(favorites).id)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, range(threads)))
+
+    assert len(added) == len(set(added))
+    for user_id in users:
+        favorites = repository.list_by_user(user_id)
+        movie_ids = [f.movie_id for f in favorites]
+        assert len(movie_ids) == len(set(movie_ids))
+        assert [f.id for f in favorites] == sorted(f.id for f in favorites)
+        bucket = repository._users.get(user_id)
+        if bucket is not None:
+            assert bucket.by_movie == {f.movie_id: f.id for f in favorites}
+
+
+def test_concurrent_duplicate_adds_create_one_favorite():
+    """Test that racing adds of the same movie produce exactly one favorite."""
+    repository = InMemoryFavoritesRepository()
+    threads = 32
+    start = threading.Barrier(threads)
+
+    def worker(_):
+        start.wait()
+        return repository.add(1, 550)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(worker, range(threads)))
+
+    assert sum(result is not None for result in results) == 1
+    assert len(repository.list_by_user(1)) == 1
+
+
+def test_busy_user_does_not_block_other_users():
+    """Test that holding one user's stripe does not block writes for users on other stripes."""
+    repository = InMemoryFavoritesRepository(stripes=2)
+
+    with repository._lock_for(1):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            favorite = executor.submit(repository.add, 2, 550).result(timeout=1)
+
+    assert favorite is not None
+
+
+def test_list_page_seeks_by_id_newest_first(repository):
+    """Test that list_page returns the user's favorites below the cursor id in descending order."""
+    ids = [repository.add(1, movie_id).id for movie_id in range(5)]
+    repository.add(2, 99)
+
+    first = repository.list_page(1, 2)
+    second = repository.list_page(1, 2, before_id=first[-1].id)
+
+    assert [f.id for f in first] == [ids[4], ids[3]]
+    assert [f.id for f in second] == [ids[2], ids[1]]
+    assert repository.list_page(1, 10, before_id=ids[0]) == []
+    assert repository.list_page(3, 10) == []
+
+
+def test_list_page_skips_removed_favorites(repository):
+    """Test that list_page skips removed favorites and survives compaction of the id index."""
+    ids = [repository.add(1, movie_id).id for movie_id in range(10)]
+    for favorite_id in ids[1:8]:
+        repository.remove(1, favorite_id)
+
+    assert [f.id for f in repository.list_page(1, 10)] == [ids[9], ids[8], ids[0]]
+    assert [f.id for f in repository.list_page(1, 1, before_id=ids[8])] == [ids[0]]
+
+
+def test_update_movie_snapshots_replaces_user_snapshots(repository):
+    """Test that snapshots are replaced for the user's favorites only."""
+    repository.add(1, 550)
+    repository.add(2, 550)
+    snapshot = MovieSnapshot(550, "Fight Club", "1999-10-15", "/poster.jpg", 8.4, datetime.now(timezone.utc))
+
+    assert repository.update_movie_snapshots(1, {550: snapshot, 13: snapshot}) == 1
+    assert repository.list_by_user(1)[0].movie == snapshot
+    assert repository.list_by_user(2)[0].movie is None
@@ -0,0 +1,132 @@
+"""Tests for the SQLAlchemy favorites repository."""
+
+from datetime import datetime, timezone
+
+import pytest
+from flask import Flask
+from sqlalchemy import inspect
+
+from app.domain.entities.movie_snapshot import MovieSnapshot
+from app.infrastructure.database import db, init_db_command
+from app.infrastructure.repositories.sqlalchemy_favorites_repository import (
+    SQLAlchemyFavoritesRepository,
+)
+
+
+@pytest.fixture
+def app():
+    """Create an app bound to an in-memory SQLite database."""
+    app = Flask(__name__)
+    app.config.update({"SQLALCHEMY_DATABASE_URI": "sqlite://", "TESTING": True})
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def repository(app):
+    """Create the repository under test."""
+    return SQLAlchemyFavoritesRepository()
+
+
+def test_add_returns_persisted_favorite(repository):
+    """Test that adding a favorite returns it with an id and timestamp."""
+    favorite = repository.add(1, "550")
+
+    assert favorite.id is not None
+    assert favorite.movie_id == "550"
+    assert favorite.created_at.tzinfo is not None
+    assert repository.list_by_user(1) == [favorite]
+
+
+def test_add_duplicate_returns_none(repository):
+    """Test that the unique (user_id, movie_id) index rejects duplicates."""
+    repository.add(1, 550)
+
+    assert repository.add(1, 550) is None
+    assert len(repository.list_by_user(1)) == 1
+
+
+def test_same_movie_for_different_users(repository):
+    """Test that different users can favorite the same movie."""
+    assert repository.add(1, 550) is not None
+    assert repository.add(2, 550) is not None
+
+
+def test_list_by_user_keeps_insertion_order(repository):
+    """Test that listing returns only the user's favorites in insertion order."""
+    repository.add(1, 3)
+    repository.add(2, 9)
+    repository.add(1, 1)
+
+    assert [f.movie_id for f in repository.list_by_user(1)] == ["3", "1"]
+
+
+def test_remove_only_removes_own_favorite(repository):
+    """Test that a user cannot remove another user's favorite."""
+    favorite = repository.add(1, 550)
+
+    assert repository.remove(2, favorite.id) is False
+    assert repository.remove(1, favorite.id) is True
+    assert repository.remove(1, favorite.id) is False
+    assert repository.list_by_user(1) == []
+
+
+def test_remove_all_bulk_deletes_user_favorites(repository):
+    """Test that remove_all deletes every favorite of one user."""
+    for movie_id in range(5):
+        repository.add(1, movie_id)
+    repository.add(2, 1)
+
+    assert repository.remove_all(1) == 5
+    assert repository.list_by_user(1) == []
+    assert len(repository.list_by_user(2)) == 1
+
+
+def test_favorites_table_is_indexed(app):
+    """Test that the listing index and unique constraint exist."""
+    inspector = inspect(db.engine)
+
+    assert {"ix_favorites_user_id_id"} <= {index["name"] for index in inspector.get_indexes("favorites")}
+    assert [c["column_names"] for c in inspector.get_unique_constraints("favorites")] == [
+        ["user_id", "movie_id"]
+    ]
+
+
+def test_list_page_seeks_by_id_newest_first(repository):
+    """Test that list_page returns the user's favorites below the cursor id in descending order."""
+    ids = [repository.add(1, movie_id).id for movie_id in range(5)]
+    repository.add(2, 99)
+
+    first = repository.list_page(1, 2)
+    second = repository.list_page(1, 2, before_id=first[-1].id)
+
+    assert [f.id for f in first] == [ids[4], ids[3]]
+    assert [f.id for f in second] == [ids[2], ids[1]]
+    assert [f.id for f in repository.list_page(1, 10, before_id=ids[0])] == []
+
+
+def test_movie_snapshots_are_persisted(repository):
+    """Test that a snapshot stored on add, and one replaced later, are read back."""
+    captured_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    snapshot = MovieSnapshot(550, "Fight Club", "1999-10-15", "/poster.jpg", 8.4, captured_at)
+    repository.add(1, 550, movie=snapshot)
+    repository.add(1, 13)
+    refreshed = MovieSnapshot(13, "Forrest Gump", "1994-06-23", None, 8.5, captured_at)
+
+    assert repository.update_movie_snapshots(1, {13: refreshed, 680: refreshed}) == 1
+    assert [favorite.movie for favorite in repository.list_by_user(1)] == [snapshot, refreshed]
+
+
+def test_init_db_command_creates_tables(app):
+    """Test that flask init-db creates the favorites table when the database store is selected."""
+    db.drop_all()
+    app.config["FAVORITES_STORE"] = "database"
+    app.cli.add_command(init_db_command)
+
+    result = app.test_cli_runner().invoke(args=["init-db"])
+
+    assert result.exit_code == 0
+    assert "favorites" in inspect(db.engine).get_table_names()
@@ -2,6 +2,8 @@
 
 import pytest
 
+from app.domain.exceptions import MovieAPIConnectionError
+from app.domain.ports.movie_repository import ConditionalResult
 from app.infrastructure.repositories.tmdb_repository import TMDBRepository
 
 
@@ -43,3 +45,50 @@ def test_get_popular_returns_empty_list_when_no_results(repository, mock_client)
     movies = repository.get_popular()
 
     assert movies == []
+
+
+def test_get_movie_details_many_dedupes_and_skips_missing(repository, mock_client):
+    """Test that batch lookups fetch each id once and leave out missing movies."""
+    mock_client._get.side_effect = lambda endpoint: None if endpoint == "/movie/3" else {"endpoint": endpoint}
+
+    movies = repository.get_movie_details_many([1, 2, 1, 3])
+
+    assert movies == {1: {"endpoint": "/movie/1"}, 2: {"endpoint": "/movie/2"}}
+    assert mock_client._get.call_count == 3
+
+
+def test_get_movie_details_many_returns_partial_results_on_failures(repository, mock_client):
+    """Test that one failed lookup is reported in failed and only a batch where all fail raises."""
+
+    def get(endpoint):
+        if endpoint == "/movie/2":
+            raise MovieAPIConnectionError("TheMovieDB is down")
+        return {"endpoint": endpoint}
+
+    mock_client._get.side_effect = get
+
+    movies = repository.get_movie_details_many([1, 2, 3])
+
+    assert movies == {1: {"endpoint": "/movie/1"}, 3: {"endpoint": "/movie/3"}}
+    assert movies.failed == [2]
+    with pytest.raises(MovieAPIConnectionError):
+        repository.get_movie_details_many([2])
+
+
+def test_get_popular_conditional_unwraps_results_and_keeps_validators(repository, mock_client):
+    """Test that conditional popular lookups return the results list with the response validators."""
+    mock_client.get_conditional.return_value = ConditionalResult({"results": [{"id": 1}]}, {"etag": '"v1"'})
+
+    result = repository.get_popular_conditional(page=2, validators={"etag": '"v0"'})
+
+    assert result == ConditionalResult([{"id": 1}], {"etag": '"v1"'})
+    mock_client.get_conditional.assert_called_once_with(
+        "/movie/popular", params={"page": 2}, validators={"etag": '"v0"'}
+    )
+
+
+def test_get_popular_conditional_passes_not_modified_through(repository, mock_client):
+    """Test that a not-modified answer is returned as is."""
+    mock_client.get_conditional.return_value = ConditionalResult(None, {"etag": '"v1"'}, not_modified=True)
+
+    assert repository.get_popular_conditional(validators={"etag": '"v1"'}).not_modified
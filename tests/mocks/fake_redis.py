@@ -0,0 +1,83 @@
+"""In-memory stand-in for the subset of redis-py used by the caches."""
+
+import time
+
+
+class FakeRedis:
+    """Minimal redis-py compatible client backed by a dict."""
+
+    def __init__(self):
+        self.store = {}
+        self.calls = []
+
+    def _alive(self, name):
+        entry = self.store.get(name)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self.store[name]
+            return None
+        return value
+
+    def get(self, name):
+        self.calls.append(("get", name))
+        return self._alive(name)
+
+    def mget(self, names):
+        self.calls.append(("mget", tuple(names)))
+        return [self._alive(name) for name in names]
+
+    def set(self, name, value, ex=None, px=None, nx=False):
+        self.calls.append(("set", name))
+        if nx and self._alive(name) is not None:
+            return None
+        if isinstance(value, str):
+            value = value.encode()
+        ttl = px / 1000 if px is not None else ex
+        self.store[name] = (value, time.time() + ttl if ttl is not None else None)
+        return True
+
+    def pexpire(self, name, px):
+        self.calls.append(("pexpire", name))
+        value = self._alive(name)
+        if value is None:
+            return False
+        self.store[name] = (value, time.time() + px / 1000)
+        return True
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def delete(self, *names):
+        self.calls.append(("delete", names))
+        return sum(self.store.pop(name, None) is not None for name in names)
+
+
+class FakePipeline:
+    """Buffers commands and runs them against a FakeRedis on execute."""
+
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, name):
+        def buffer(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return buffer
+
+    def execute(self):
+        self._client.calls.append(("pipeline", len(self._commands)))
+        return [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in self._commands]
+
+
+class BrokenRedis:
+    """Client whose every command fails as if Redis were unreachable."""
+
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("Redis is down")
+
+        return fail
@@ -1,5 +1,7 @@
 """Mock movie service for testing."""
 
+import json
+
 from ..test_data.movie_data import MOCK_MOVIE_DETAILS
 
 
@@ -17,11 +19,36 @@ class MockMovieService:
                 return MOCK_MOVIE_DETAILS[movie_id]
             return MOCK_MOVIE_DETAILS["tt0111161"]  # Default to Shawshank
 
-        # For non-IMDB IDs (e.g., TMDB), return a generic response
+        # For non-IMDB IDs (e.g., TMDB), return a generic response; TheMovieDB IDs are integers
         return {
-            "id": movie_id,
+            "id": int(movie_id),
             "title": f"Movie {movie_id}",
             "release_date": "2024-01-01",
             "overview": "A generic movie description...",
             "vote_average": 7.5,
         }
+
+    def get_movie_details_many(self, movie_ids) -> dict:
+        """Get mock movie details for several movies."""
+        return {movie_id: self.get_movie_details(movie_id) for movie_id in movie_ids}
+
+    async def get_movie_details_many_async(self, movie_ids) -> dict:
+        """Get mock movie details for several movies."""
+        return self.get_movie_details_many(movie_ids)
+
+    def get_movie_details_raw_many(self, movie_ids) -> dict:
+        """Get mock movie details for several movies as encoded JSON."""
+        return {
+            movie_id: json.dumps(movie).encode()
+            for movie_id, movie in self.get_movie_details_many(movie_ids).items()
+        }
+
+    async def get_movie_details_raw_many_async(self, movie_ids) -> dict:
+        """Get mock movie details for several movies as encoded JSON."""
+        return self.get_movie_details_raw_many(movie_ids)
+
+    def project_movie(self, movie: dict, fields) -> dict:
+        """Trim mock movie details to the selected fields."""
+        if movie is None or fields is None:
+            return movie
+        return {key: value for key, value in movie.items() if key in fields}
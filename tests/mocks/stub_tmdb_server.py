@@ -0,0 +1,110 @@
+"""Local stub of TheMovieDB API, shared by the tests and the benchmarks."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+
+def default_payload(path: str) -> Dict:
+    """Return a small TMDB-like payload for the requested path."""
+    return {"id": 1, "title": "Stub Movie", "path": path}
+
+
+class StubTMDBServer:
+    """Threaded HTTP/1.1 stub that counts accepted connections and requests.
+
+    Args:
+        payload: Callable mapping a request path to the JSON body to return, or
+            to a ``(status, body)`` or ``(status, body, headers)`` tuple; bodies
+            given as bytes are sent as they are
+        delay: Seconds to sleep before answering each request
+
+    A response carrying an ``ETag`` is answered with a bodyless 304 when the
+    request's ``If-None-Match`` matches it, like TheMovieDB's CDN.
+    """
+
+    def __init__(self, payload: Callable[[str], Dict] = default_payload, delay: float = 0.0):
+        self.payload = payload
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the running stub."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, attr: str) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def reset(self) -> None:
+        """Reset the connection and request counters."""
+        with self._lock:
+            self.connections = 0
+            self.requests = 0
+
+    def start(self) -> "StubTMDBServer":
+        """Start serving on an ephemeral localhost port."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                stub._count("connections")
+                super().setup()
+
+            def do_GET(self):
+                stub._count("requests")
+                if stub.delay:
+                    time.sleep(stub.delay)
+                payload = stub.payload(self.path.split("?", 1)[0])
+                status, payload, headers = (
+                    (payload + ({},))[:3] if isinstance(payload, tuple) else (200, payload, {})
+                )
+                if headers.get("ETag") and self.headers.get("If-None-Match") == headers["ETag"]:
+                    status = 304
+                if status == 304:
+                    body = b""
+                else:
+                    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            # Let bursts of concurrent clients connect without waiting on the accept loop
+            request_queue_size = 256
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubTMDBServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
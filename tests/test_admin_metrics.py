@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the app."""
+    app = create_app()
+    app.config.update({"TESTING": True})
+    return app.test_client()
+
+
+def test_get_metrics_reports_movie_cache(client):
+    """Test that the metrics endpoint reports cache counters."""
+    response = client.get("/api/admin/metrics")
+    assert response.status_code == HTTPStatus.OK
+
+    data = response.get_json()
+    assert data["movie_cache"]["hits"] == 0
+    assert data["movie_cache"]["local"]["evictions"] == 0
+
+
+def test_get_metrics_reports_tmdb_retries(client):
+    """Test that the metrics endpoint reports the shared retry budget counters."""
+    data = client.get("/api/admin/metrics").get_json()
+
+    assert data["tmdb_client"]["retries"] == 0
+    assert data["tmdb_client"]["retries_denied"] == 0
+
+
+def test_get_metrics_reports_circuit_states(client):
+    """Test that the metrics endpoint reports one closed circuit per endpoint family."""
+    circuits = client.get("/api/admin/metrics").get_json()["tmdb_client"]["circuits"]
+
+    assert set(circuits) == {"popular", "details"}
+    assert circuits["details"]["state"] == "closed"
+
+
+def test_get_metrics_reports_compression(client):
+    """Test that the metrics endpoint reports compression savings."""
+    compression = client.get("/api/admin/metrics").get_json()["compression"]
+
+    assert compression["bytes_saved"] == 0
+    assert compression["cpu_seconds"] == 0
+    assert "gzip" in compression["encodings"]
@@ -2,21 +2,21 @@
 
 MOCK_MOVIE_DETAILS = {
     "tt0111161": {  # The Shawshank Redemption
-        "id": "tt0111161",
+        "id": 278,
         "title": "The Shawshank Redemption",
         "release_date": "1994-09-23",
         "overview": "Framed in the 1940s for double murder...",
         "vote_average": 8.7,
     },
     "tt0068646": {  # The Godfather
-        "id": "tt0068646",
+        "id": 238,
         "title": "The Godfather",
         "release_date": "1972-03-14",
         "overview": "Spanning the years 1945 to 1955...",
         "vote_average": 8.7,
     },
     "tt0071562": {  # The Godfather Part II
-        "id": "tt0071562",
+        "id": 240,
         "title": "The Godfather Part II",
         "release_date": "1974-12-20",
         "overview": "In the continuing saga of the Corleone crime family...",
@@ -11,6 +11,9 @@ class MockMovieService:
     def get_movie_details(self, movie_id):
         return {"id": movie_id, "title": f"Test Movie {movie_id}", "release_date": "2023-01-01"}
 
+    def get_movie_details_many(self, movie_ids):
+        return {movie_id: self.get_movie_details(movie_id) for movie_id in movie_ids}
+
 
 @pytest.fixture
 def app():
@@ -108,3 +111,14 @@ def test_admin_delete_user_favorites(client):
     # Verify favorites were cleared
     favorites = FavoritesService.get_user_favorites(1)
     assert len(favorites) == 0
+
+
+def test_remove_favorite_by_position(client):
+    """Test that favorite ids follow insertion order."""
+    FavoritesService._favorites.clear()
+    for movie_id in ("300", "100", "200"):
+        FavoritesService.add_favorite(movie_id)
+
+    response = client.delete("/api/movies/favorites/2")
+    assert response.status_code == HTTPStatus.NO_CONTENT
+    assert FavoritesService.get_favorites() == ["300", "200"]
@@ -4,6 +4,9 @@ import pytest
 
 from app import create_app
 from app.application.services.favorites_service import FavoritesService
+from app.infrastructure.repositories.in_memory_favorites_repository import (
+    InMemoryFavoritesRepository,
+)
 
 from .mocks.mock_movie_service import MockMovieService
 
@@ -35,10 +38,14 @@ def clear_favorites(app):
     """Clear favorites before each test."""
     with app.app_context():
         FavoritesService._favorites.clear()
-        FavoritesService._user_favorites.clear()
-        FavoritesService._next_id = 1
         FavoritesService._movie_service = None
-        FavoritesService.initialize(app.movie_service)
+        FavoritesService.initialize(app.movie_service, repository=InMemoryFavoritesRepository())
+
+
+def wait_for_snapshots(app):
+    """Wait for the snapshot captures queued by added favorites."""
+    FavoritesService.shutdown()
+    FavoritesService.initialize(app.movie_service)
 
 
 def test_get_user_favorites(client):
@@ -56,7 +63,7 @@ def test_get_user_favorites(client):
     assert len(favorites) == 1
 
     favorite = favorites[0]
-    assert favorite["movie"]["id"] == "tt0111161"
+    assert favorite["movie"]["id"] == 278
     assert favorite["movie"]["title"] == "The Shawshank Redemption"
     assert "created_at" in favorite
 
@@ -118,3 +125,122 @@ def test_admin_remove_user_favorites(client):
     assert response.status_code == HTTPStatus.OK
     data = response.get_json()
     assert len(data["favorites"]) == 0
+
+
+def test_get_user_favorites_paginated(client):
+    """Test that limit and cursor page through favorites newest first without gaps or repeats."""
+    for movie_id in range(1, 6):
+        client.post("/api/users/1/favorites", json={"movie_id": movie_id})
+
+    seen = []
+    cursor = None
+    while True:
+        query = "/api/users/1/favorites?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(query)
+        assert response.status_code == HTTPStatus.OK
+        data = response.get_json()
+        seen.extend(favorite["movie"]["id"] for favorite in data["favorites"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [5, 4, 3, 2, 1]
+
+
+def test_get_user_favorites_page_is_stable_across_inserts(client):
+    """Test that favorites added after the first page do not shift the next page."""
+    for movie_id in range(1, 5):
+        client.post("/api/users/1/favorites", json={"movie_id": movie_id})
+
+    first = client.get("/api/users/1/favorites?limit=2").get_json()
+    client.post("/api/users/1/favorites", json={"movie_id": 9})
+    second = client.get(f"/api/users/1/favorites?limit=2&cursor={first['next_cursor']}").get_json()
+
+    assert [f["movie"]["id"] for f in second["favorites"]] == [2, 1]
+    assert second["next_cursor"] is None
+
+
+def test_get_user_favorites_page_fetches_only_page_details(client, app, mocker):
+    """Test that hydrated movie details are only fetched for favorites on the requested page."""
+    for movie_id in range(1, 6):
+        client.post("/api/users/1/favorites", json={"movie_id": movie_id})
+    wait_for_snapshots(app)
+    spy = mocker.spy(app.movie_service, "get_movie_details")
+
+    client.get("/api/users/1/favorites?limit=2&hydrate=1")
+
+    assert sorted(call.args[0] for call in spy.call_args_list) == ["4", "5"]
+
+
+def test_get_user_favorites_lists_snapshots_without_lookups(client, app, mocker):
+    """Test that favorites are listed from the snapshots captured when they were added."""
+    client.post("/api/users/1/favorites", json={"movie_id": "tt0068646"})
+    client.post("/api/users/1/favorites", json={"movie_id": "tt0111161"})
+    wait_for_snapshots(app)
+    spy = mocker.spy(app.movie_service, "get_movie_details")
+
+    favorites = client.get("/api/users/1/favorites").get_json()["favorites"]
+    hydrated = client.get("/api/users/1/favorites?hydrate=1").get_json()["favorites"]
+
+    assert [favorite["movie"]["title"] for favorite in favorites] == [
+        "The Shawshank Redemption",
+        "The Godfather",
+    ]
+    assert "overview" not in favorites[0]["movie"]
+    assert hydrated[0]["movie"]["overview"] == "Framed in the 1940s for double murder..."
+    assert spy.call_count == 2
+
+
+def test_snapshot_and_hydrated_listings_report_the_same_movie_ids(client):
+    """Test that snapshot movies carry TheMovieDB's integer ID, as hydrated details do."""
+    client.post("/api/users/1/favorites", json={"movie_id": "5"})
+    client.post("/api/users/1/favorites", json={"movie_id": "tt0111161"})
+
+    favorites = client.get("/api/users/1/favorites").get_json()["favorites"]
+    hydrated = client.get("/api/users/1/favorites?hydrate=1").get_json()["favorites"]
+
+    assert [favorite["movie"]["id"] for favorite in favorites] == [5, 278]
+    assert [favorite["movie"]["id"] for favorite in hydrated] == [5, 278]
+
+
+@pytest.mark.parametrize(
+    "query", ["limit=0", "limit=101", "limit=abc", "cursor=not-a-cursor", "limit=2&cursor=djE6LTE"]
+)
+def test_get_user_favorites_invalid_page_request(client, query):
+    """Test that invalid limit or cursor values are rejected."""
+    response = client.get(f"/api/users/1/favorites?{query}")
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.get_json()["error"]["code"] == "INVALID_REQUEST"
+
+
+def test_get_user_favorites_supports_conditional_requests(client):
+    """Test that the favorites listing is private, has an ETag and answers a matching poll with 304."""
+    client.post("/api/users/1/favorites", json={"movie_id": "tt0111161"})
+    response = client.get("/api/users/1/favorites")
+    etag = response.headers["ETag"]
+
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert client.get("/api/users/1/favorites", headers={"If-None-Match": etag}).status_code == (
+        HTTPStatus.NOT_MODIFIED
+    )
+
+    client.post("/api/users/1/favorites", json={"movie_id": "tt0068646"})
+    assert client.get("/api/users/1/favorites", headers={"If-None-Match": etag}).status_code == HTTPStatus.OK
+
+
+def test_get_user_favorites_projects_movie_fields(client):
+    """Test that fields= trims each favorite's movie and unknown fields are rejected."""
+    client.post("/api/users/1/favorites", json={"movie_id": "tt0111161"})
+
+    response = client.get("/api/users/1/favorites?fields=id,title")
+    paginated = client.get("/api/users/1/favorites?limit=1&fields=id")
+    invalid = client.get("/api/users/1/favorites?fields=id,credits")
+
+    assert response.get_json()["favorites"][0]["movie"] == {
+        "id": 278,
+        "title": "The Shawshank Redemption",
+    }
+    assert paginated.get_json()["favorites"][0]["movie"] == {"id": 278}
+    assert invalid.status_code == HTTPStatus.BAD_REQUEST
+    assert invalid.get_json()["error"]["code"] == "INVALID_REQUEST"
@@ -0,0 +1,408 @@
+"""Unit tests for movie controller."""
+
+import pytest
+from flask import Flask
+
+from app.application.controllers.movie_controller import (
+    create_async_movie_blueprint,
+    create_movie_blueprint,
+)
+from app.domain.exceptions import (
+    CatalogUnavailableError,
+    CircuitOpenError,
+    MovieAPIConnectionError,
+)
+from app.domain.ports.movie_repository import MovieDetailsBatch
+from app.infrastructure.api.cache_headers import register_cache_headers
+from app.infrastructure.api.json_provider import FastJSONProvider
+from app.infrastructure.cache import freshness
+
+
+@pytest.fixture
+def movie_service(mocker):
+    """Create a mock movie service."""
+    return mocker.Mock()
+
+
+@pytest.fixture
+def client(movie_service):
+    """Create a test client with the movie blueprint registered."""
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    register_cache_headers(app)
+    app.register_blueprint(create_movie_blueprint(), url_prefix="/api/movies")
+    app.movie_service = movie_service
+    return app.test_client()
+
+
+def test_get_movie_details_returns_movie(client, movie_service):
+    """Test that movie details are returned without stale warnings."""
+    movie_service.get_movie_details.return_value = {"id": 1, "title": "Test Movie"}
+
+    response = client.get("/api/movies/1")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"id": 1, "title": "Test Movie"}
+    assert "Warning" not in response.headers
+
+
+def test_stale_data_is_marked_with_warning_header(client, movie_service):
+    """Test that responses built from stale cache entries carry a Warning header."""
+
+    def stale_details(movie_id, fields=None):
+        freshness.mark(freshness.STALE)
+        freshness.mark(freshness.REVALIDATION_FAILED)
+        return {"id": movie_id, "title": "Test Movie"}
+
+    movie_service.get_movie_details.side_effect = stale_details
+
+    response = client.get("/api/movies/1")
+
+    assert response.status_code == 200
+    assert response.headers.getlist("Warning") == ['110 - "Response is Stale"', '111 - "Revalidation Failed"']
+
+
+def test_staleness_does_not_leak_into_next_request(client, movie_service):
+    """Test that markers are reset between requests."""
+    freshness.mark(freshness.STALE)
+    movie_service.get_popular_movies.return_value = {"movies": [], "page": 1}
+
+    response = client.get("/api/movies/popular")
+
+    assert "Warning" not in response.headers
+
+
+def test_upstream_unavailable_returns_503(client, movie_service):
+    """Test that connection failures with nothing cached return 503."""
+    movie_service.get_popular_movies.side_effect = MovieAPIConnectionError("Timeout")
+
+    response = client.get("/api/movies/popular")
+
+    assert response.status_code == 503
+    assert response.get_json() == {"error": "Movie service unavailable"}
+
+
+def test_get_movies_returns_movies_in_request_order(client, movie_service):
+    """Test that batch lookups return found movies in order and list the missing ids."""
+    movie_service.get_movie_details_many.return_value = {3: {"id": 3}, 1: {"id": 1}}
+
+    response = client.get("/api/movies?ids=1,2,3,1")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"movies": [{"id": 1}, {"id": 3}], "not_found": [2], "failed": []}
+    movie_service.get_movie_details_many.assert_called_once_with([1, 2, 3])
+
+
+def test_get_movies_reports_failed_lookups(client, movie_service):
+    """Test that movies whose lookup failed are listed apart from those not found."""
+    movie_service.get_movie_details_many.return_value = MovieDetailsBatch({1: {"id": 1}}, failed=[3])
+
+    response = client.get("/api/movies?ids=1,2,3")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"movies": [{"id": 1}], "not_found": [2], "failed": [3]}
+
+
+@pytest.mark.parametrize(
+    "query, expected_error",
+    [
+        ("", "ids is required"),
+        ("?ids=", "ids is required"),
+        ("?ids=1,abc", "Invalid movie ids"),
+        ("?ids=0", "Movie ids must be positive"),
+        ("?ids=" + ",".join(str(i) for i in range(1, 52)), "At most 50 ids can be requested"),
+    ],
+)
+def test_get_movies_validates_ids(client, query, expected_error):
+    """Test that invalid id lists are rejected."""
+    response = client.get(f"/api/movies{query}")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": expected_error}
+
+
+@pytest.fixture
+def async_client(movie_service):
+    """Create a test client with the async movie blueprint registered."""
+    app = Flask(__name__)
+    register_cache_headers(app)
+    app.register_blueprint(create_async_movie_blueprint(), url_prefix="/api/movies")
+    app.movie_service = movie_service
+    return app.test_client()
+
+
+def test_async_get_movie_details_returns_movie(async_client, movie_service, mocker):
+    """Test that the async view awaits the movie service."""
+    movie_service.get_movie_details_async = mocker.AsyncMock(return_value={"id": 1, "title": "Test Movie"})
+
+    response = async_client.get("/api/movies/1")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"id": 1, "title": "Test Movie"}
+
+
+def test_async_get_movies_validates_and_keeps_order(async_client, movie_service, mocker):
+    """Test that the async batch view shares validation and response shape with the sync view."""
+    movie_service.get_movie_details_many_async = mocker.AsyncMock(return_value={3: {"id": 3}, 1: {"id": 1}})
+
+    assert async_client.get("/api/movies?ids=0").status_code == 400
+    response = async_client.get("/api/movies?ids=1,2,3")
+
+    assert response.get_json() == {"movies": [{"id": 1}, {"id": 3}], "not_found": [2], "failed": []}
+
+
+def test_async_upstream_unavailable_returns_503(async_client, movie_service, mocker):
+    """Test that connection errors map to 503 in the async views."""
+    movie_service.get_popular_movies_async = mocker.AsyncMock(side_effect=MovieAPIConnectionError("down"))
+
+    response = async_client.get("/api/movies/popular")
+
+    assert response.status_code == 503
+    assert response.get_json() == {"error": "Movie service unavailable"}
+
+
+def test_open_circuit_returns_503(client, movie_service):
+    """Test that an open TheMovieDB circuit fails fast with 503."""
+    movie_service.get_movie_details.side_effect = CircuitOpenError("TheMovieDB details circuit is open")
+
+    response = client.get("/api/movies/1")
+
+    assert response.status_code == 503
+    assert response.get_json() == {"error": "Movie service unavailable"}
+
+
+def test_movie_responses_carry_validators_and_cache_control(client, movie_service):
+    """Test that movie responses have an ETag, a max-age matching the cache TTL and Vary."""
+    client.application.config["CACHE_POPULAR_TTL_SECONDS"] = 30
+    movie_service.get_popular_movies.return_value = {"movies": [], "page": 1}
+
+    response = client.get("/api/movies/popular")
+
+    assert response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "public, max-age=30"
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_unchanged_content_is_answered_with_304(client, movie_service):
+    """Test that If-None-Match with the current content hash returns 304 without a body."""
+    movie_service.get_movie_details.return_value = {"id": 1, "title": "Test Movie"}
+    etag = client.get("/api/movies/1").headers["ETag"]
+
+    response = client.get("/api/movies/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_cached_versions_answer_304_before_serialising(client, movie_service, mocker):
+    """Test that the ETag comes from the served cache entry versions and a match skips jsonify."""
+
+    def cached_details(movie_id, fields=None):
+        freshness.record(f"movie:{movie_id}", "v1")
+        return {"id": movie_id}
+
+    movie_service.get_movie_details.side_effect = cached_details
+    etag = client.get("/api/movies/1").headers["ETag"]
+    jsonify = mocker.patch("app.application.controllers.movie_controller.jsonify")
+
+    response = client.get("/api/movies/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    jsonify.assert_not_called()
+    assert client.get("/api/movies/2", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_stale_responses_are_not_cached_downstream(client, movie_service):
+    """Test that responses built from stale data get max-age=0."""
+
+    def stale_popular(page, fields=None):
+        freshness.mark(freshness.STALE)
+        return {"movies": [], "page": page}
+
+    movie_service.get_popular_movies.side_effect = stale_popular
+
+    assert client.get("/api/movies/popular").headers["Cache-Control"] == "public, max-age=0"
+
+
+def test_errors_are_not_given_validators(client, movie_service):
+    """Test that error responses have no ETag."""
+    movie_service.get_movie_details.return_value = None
+
+    response = client.get("/api/movies/1")
+
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
+
+
+def test_async_views_answer_304_from_cached_versions(async_client, movie_service, mocker):
+    """Test that versions recorded while awaiting the service are used by the async views."""
+
+    async def cached_popular(page, fields=None):
+        freshness.record(f"popular:{page}", "v1")
+        return {"movies": [], "page": page}
+
+    movie_service.get_popular_movies_async = mocker.AsyncMock(side_effect=cached_popular)
+    etag = async_client.get("/api/movies/popular").headers["ETag"]
+
+    assert async_client.get("/api/movies/popular", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_passthrough_sends_cached_bytes_unchanged(client, movie_service, mocker):
+    """Test that in passthrough mode the encoded details are sent as is, with validators and 304s."""
+    client.application.config["MOVIE_DETAILS_PASSTHROUGH"] = True
+    body = b'{"title": "Test Movie", "id": 1}'
+    movie_service.get_movie_details_raw.return_value = body
+    jsonify = mocker.patch("app.application.controllers.movie_controller.jsonify")
+
+    response = client.get("/api/movies/1")
+
+    assert response.data == body
+    assert response.mimetype == "application/json"
+    jsonify.assert_not_called()
+    movie_service.get_movie_details.assert_not_called()
+    assert client.get("/api/movies/1", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+
+def test_passthrough_embeds_cached_bytes_in_batches(client, movie_service):
+    """Test that in passthrough mode batch lookups embed the encoded details unchanged."""
+    client.application.config["MOVIE_DETAILS_PASSTHROUGH"] = True
+    movie_service.get_movie_details_raw_many.return_value = MovieDetailsBatch(
+        {1: b'{"id":1,"title":"Test Movie"}'}, failed=[3]
+    )
+
+    response = client.get("/api/movies?ids=1,2,3")
+
+    assert response.data.startswith(b'{"movies":[{"id":1,"title":"Test Movie"}]')
+    assert response.get_json() == {
+        "movies": [{"id": 1, "title": "Test Movie"}],
+        "not_found": [2],
+        "failed": [3],
+    }
+    movie_service.get_movie_details_many.assert_not_called()
+
+
+def test_passthrough_not_found_returns_404(client, movie_service):
+    """Test that a missing movie is still reported as 404 in passthrough mode."""
+    client.application.config["MOVIE_DETAILS_PASSTHROUGH"] = True
+    movie_service.get_movie_details_raw.return_value = None
+
+    response = client.get("/api/movies/1")
+
+    assert response.status_code == 404
+    assert response.get_json() == {"error": "Movie not found"}
+
+
+def test_async_passthrough_sends_cached_bytes_unchanged(async_client, movie_service, mocker):
+    """Test that the async view awaits the raw details in passthrough mode."""
+    async_client.application.config["MOVIE_DETAILS_PASSTHROUGH"] = True
+    movie_service.get_movie_details_raw_async = mocker.AsyncMock(return_value=b'{"id": 1}')
+
+    response = async_client.get("/api/movies/1")
+
+    assert response.data == b'{"id": 1}'
+    assert response.mimetype == "application/json"
+
+
+def test_fields_are_parsed_and_passed_to_the_service(client, movie_service):
+    """Test that fields= is validated and handed to the service, bypassing the passthrough."""
+    client.application.config["MOVIE_DETAILS_PASSTHROUGH"] = True
+    movie_service.get_movie_details.return_value = {"id": 1}
+    movie_service.get_popular_movies.return_value = {"movies": [], "page": 1}
+
+    assert client.get("/api/movies/1?fields=id,title").get_json() == {"id": 1}
+    client.get("/api/movies/popular?fields=id")
+
+    movie_service.get_movie_details.assert_called_once_with(movie_id=1, fields=frozenset({"id", "title"}))
+    movie_service.get_movie_details_raw.assert_not_called()
+    movie_service.get_popular_movies.assert_called_once_with(page=1, fields=frozenset({"id"}))
+
+
+@pytest.mark.parametrize("path", ["/api/movies/1", "/api/movies/popular"])
+def test_unknown_fields_are_rejected(client, movie_service, path):
+    """Test that fields outside the whitelist return 400 without calling the service."""
+    response = client.get(f"{path}?fields=id,credits")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Unknown fields: credits"}
+    assert movie_service.method_calls == []
+
+
+def test_search_parses_query_and_window(client, mocker):
+    """Test that search passes the query, limit and offset to the catalog service."""
+    catalog_service = client.application.catalog_service = mocker.Mock()
+    catalog_service.search_movies.return_value = {"movies": [], "total": 0}
+
+    response = client.get("/api/movies/search?q=dark+kni&limit=5&offset=10")
+
+    assert response.status_code == 200
+    assert "ETag" in response.headers
+    catalog_service.search_movies.assert_called_once_with("dark kni", limit=5, offset=10)
+
+
+@pytest.mark.parametrize(
+    "query, expected_error",
+    [
+        ("", "q is required"),
+        ("q=a&limit=0", "limit must be between 1 and 100"),
+        ("q=a&offset=-1", "offset must not be negative"),
+        ("q=a&limit=x", "Invalid limit or offset"),
+    ],
+)
+def test_search_validates_parameters(client, query, expected_error):
+    """Test that invalid search parameters return 400."""
+    response = client.get(f"/api/movies/search?{query}")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": expected_error}
+
+
+def test_discover_parses_filters(async_client, mocker):
+    """Test that discover converts sort order and filters, also on the async blueprint."""
+    catalog_service = async_client.application.catalog_service = mocker.Mock()
+    catalog_service.discover_movies.return_value = {"movies": [], "total": 0}
+
+    response = async_client.get(
+        "/api/movies/discover?sort=release_date&order=asc&min_vote_average=7.5&genre=28"
+        "&released_from=2020-01-01&released_to=2020-12-31"
+    )
+
+    assert response.status_code == 200
+    catalog_service.discover_movies.assert_called_once_with(
+        limit=20,
+        offset=0,
+        sort="release_date",
+        descending=False,
+        min_vote_average=7.5,
+        genre_id=28,
+        released_from="2020-01-01",
+        released_to="2020-12-31",
+    )
+
+
+@pytest.mark.parametrize(
+    "query, expected_error",
+    [
+        ("sort=title", "sort must be one of: popularity, vote_average, release_date"),
+        ("order=up", "order must be asc or desc"),
+        ("genre=action", "Invalid min_vote_average or genre"),
+        ("released_from=2020-13-01", "released_from must be a date (YYYY-MM-DD)"),
+    ],
+)
+def test_discover_validates_filters(client, query, expected_error):
+    """Test that invalid discover filters return 400."""
+    response = client.get(f"/api/movies/discover?{query}")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": expected_error}
+
+
+def test_loading_catalog_returns_503(client, mocker):
+    """Test that queries while the catalog is loading return 503."""
+    catalog_service = client.application.catalog_service = mocker.Mock()
+    catalog_service.search_movies.side_effect = CatalogUnavailableError("loading")
+
+    response = client.get("/api/movies/search?q=batman")
+
+    assert response.status_code == 503
+    assert response.get_json() == {"error": "Movie catalog is loading, try again shortly"}
@@ -0,0 +1,299 @@
+"""Unit tests for favorites service."""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.application.services.favorites_service import FavoritesService
+from app.domain.entities.movie_snapshot import MovieSnapshot
+from app.domain.entities.raw_json import RawJSON
+from app.domain.ports.movie_repository import MovieDetailsBatch
+from app.infrastructure.repositories.in_memory_favorites_repository import (
+    InMemoryFavoritesRepository,
+)
+
+
+class SlowMovieService:
+    """Movie service that records how many lookups run concurrently."""
+
+    def __init__(self, delay=0.01, slow_ids=(), failing_ids=()):
+        self.delay = delay
+        self.slow_ids = set(slow_ids)
+        self.failing_ids = set(failing_ids)
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def get_movie_details(self, movie_id):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(1 if movie_id in self.slow_ids else self.delay)
+            if movie_id in self.failing_ids:
+                raise ConnectionError("TheMovieDB is down")
+            return {"id": movie_id, "title": f"Movie {movie_id}", "release_date": f"2000-01-{movie_id:02d}"}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def get_movie_details_many(self, movie_ids):
+        results = []
+        for movie_id in movie_ids:
+            try:
+                results.append(self.get_movie_details(movie_id))
+            except ConnectionError as e:
+                results.append(e)
+        return MovieDetailsBatch.from_results(movie_ids, results)
+
+    def get_movie_details_raw_many(self, movie_ids):
+        return {
+            movie_id: json.dumps(movie).encode()
+            for movie_id, movie in self.get_movie_details_many(movie_ids).items()
+        }
+
+    async def get_movie_details_async(self, movie_id):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(1 if movie_id in self.slow_ids else self.delay)
+            if movie_id in self.failing_ids:
+                raise ConnectionError("TheMovieDB is down")
+            return {"id": movie_id, "title": f"Movie {movie_id}", "release_date": f"2000-01-{movie_id:02d}"}
+        finally:
+            self.active -= 1
+
+    async def get_movie_details_many_async(self, movie_ids):
+        results = await asyncio.gather(
+            *(self.get_movie_details_async(movie_id) for movie_id in movie_ids), return_exceptions=True
+        )
+        return MovieDetailsBatch.from_results(movie_ids, results)
+
+
+@pytest.fixture(autouse=True)
+def clear_favorites():
+    """Reset the service state before each test."""
+    FavoritesService.initialize(None, repository=InMemoryFavoritesRepository(), passthrough=False)
+    yield
+    FavoritesService.initialize(None, max_concurrency=8, deadline=5.0, snapshot_max_age=3600)
+
+
+def wait_for_snapshots():
+    """Wait for the snapshot captures queued by added favorites."""
+    FavoritesService.shutdown()
+    FavoritesService.initialize(FavoritesService._movie_service)
+
+
+def add_favorites(user_id, movie_ids):
+    for movie_id in movie_ids:
+        FavoritesService.add_user_favorite(user_id, movie_id)
+    wait_for_snapshots()
+
+
+def test_get_user_favorites_respects_concurrency_cap():
+    """Test that no more than the per-request cap of lookups run at once."""
+    movie_service = SlowMovieService()
+    FavoritesService.initialize(movie_service, max_concurrency=4, deadline=5)
+    add_favorites(1, range(1, 21))
+
+    favorites = FavoritesService.get_user_favorites(1, hydrate=True)
+
+    assert len(favorites) == 20
+    assert 1 < movie_service.max_active <= 4
+
+
+def test_get_user_favorites_sorted_by_release_date():
+    """Test that fanned-out results keep the release date ordering."""
+    FavoritesService.initialize(SlowMovieService(), max_concurrency=8, deadline=5)
+    add_favorites(1, [3, 1, 2])
+
+    favorites = FavoritesService.get_user_favorites(1)
+
+    assert [f["movie"]["id"] for f in favorites] == [3, 2, 1]
+
+
+def test_get_user_favorites_returns_partial_results_at_deadline():
+    """Test that lookups still running at the deadline are dropped."""
+    FavoritesService.initialize(SlowMovieService(slow_ids={2}), max_concurrency=8, deadline=0.2)
+    add_favorites(1, [1, 2, 3])
+
+    start = time.monotonic()
+    favorites = FavoritesService.get_user_favorites(1, hydrate=True)
+
+    assert time.monotonic() - start < 0.9
+    assert [f["movie"]["id"] for f in favorites] == [3, 1]
+
+
+def test_get_user_favorites_skips_failed_lookups():
+    """Test that a failing lookup does not fail the whole listing."""
+    FavoritesService.initialize(SlowMovieService(failing_ids={2}), max_concurrency=8, deadline=5)
+    add_favorites(1, [1, 2, 3])
+
+    favorites = FavoritesService.get_user_favorites(1, hydrate=True)
+
+    assert [f["movie"]["id"] for f in favorites] == [3, 1]
+
+
+def test_get_user_favorites_async_runs_all_lookups_concurrently():
+    """Test that async lookups are not capped by the threaded fan-out limit."""
+    movie_service = SlowMovieService(delay=0.1)
+    FavoritesService.initialize(movie_service, max_concurrency=4, deadline=5)
+    add_favorites(1, range(1, 21))
+
+    favorites = asyncio.run(FavoritesService.get_user_favorites_async(1, hydrate=True))
+
+    assert [f["movie"]["id"] for f in favorites] == list(range(20, 0, -1))
+    assert movie_service.max_active == 20
+
+
+def test_get_user_favorites_async_drops_failed_and_late_lookups():
+    """Test that the async listing keeps the deadline and skips failures."""
+    FavoritesService.initialize(SlowMovieService(slow_ids={2}, failing_ids={3}), deadline=0.2)
+    add_favorites(1, [1, 2, 3, 4])
+
+    start = time.monotonic()
+    favorites = asyncio.run(FavoritesService.get_user_favorites_async(1, hydrate=True))
+
+    assert time.monotonic() - start < 0.9
+    assert [f["movie"]["id"] for f in favorites] == [4, 1]
+
+
+def test_get_user_favorites_page_async_matches_sync_page():
+    """Test that the async page returns the same favorites and cursor as the sync page."""
+    FavoritesService.initialize(SlowMovieService(delay=0), deadline=5)
+    add_favorites(1, range(1, 6))
+
+    page = asyncio.run(FavoritesService.get_user_favorites_page_async(1, 2))
+
+    assert page == FavoritesService.get_user_favorites_page(1, 2)
+
+
+def test_get_user_favorites_serves_snapshots_without_lookups(mocker):
+    """Test that favorites added with a snapshot are listed, sorted and trimmed with no lookups."""
+    movie_service = SlowMovieService(delay=0)
+    FavoritesService.initialize(movie_service, deadline=5)
+    add_favorites(1, [3, 1, 2])
+    spy = mocker.spy(movie_service, "get_movie_details")
+
+    favorites = FavoritesService.get_user_favorites(1)
+    trimmed = FavoritesService.get_user_favorites(1, fields=frozenset({"id", "release_date"}))
+
+    assert favorites[0]["movie"] == {
+        "id": 3,
+        "title": "Movie 3",
+        "release_date": "2000-01-03",
+        "poster_path": None,
+        "vote_average": None,
+    }
+    assert [f["movie"]["id"] for f in favorites] == [3, 2, 1]
+    assert trimmed[0]["movie"] == {"id": 3, "release_date": "2000-01-03"}
+    spy.assert_not_called()
+
+
+def test_get_user_favorites_captures_missing_snapshots(mocker):
+    """Test that favorites without a snapshot are looked up once and their snapshots stored."""
+    repository = InMemoryFavoritesRepository()
+    movie_service = SlowMovieService(delay=0)
+    FavoritesService.initialize(movie_service, repository=repository, deadline=5)
+    repository.add(1, 1)
+    spy = mocker.spy(movie_service, "get_movie_details")
+
+    first = FavoritesService.get_user_favorites(1)
+    second = FavoritesService.get_user_favorites(1)
+
+    assert first == second
+    assert repository.list_by_user(1)[0].movie.title == "Movie 1"
+    assert spy.call_count == 1
+
+
+def test_get_user_favorites_hydrates_fields_beyond_snapshots(mocker):
+    """Test that fields snapshots do not hold are served from full movie details."""
+    movie_service = SlowMovieService(delay=0)
+    FavoritesService.initialize(movie_service, deadline=5)
+    movie_service.project_movie = lambda movie, fields: {key: movie.get(key) for key in fields}
+    add_favorites(1, [1])
+    spy = mocker.spy(movie_service, "get_movie_details")
+
+    favorites = FavoritesService.get_user_favorites_page(1, 10, fields=frozenset({"id", "overview"}))
+
+    assert favorites["favorites"][0]["movie"] == {"id": 1, "overview": None}
+    spy.assert_called_once_with(1)
+
+
+def test_hydrated_favorites_embed_encoded_details_in_passthrough_mode(mocker):
+    """Test that passthrough listings embed the encoded details, sorted by the snapshots without decoding."""
+    FavoritesService.initialize(SlowMovieService(), passthrough=True)
+    add_favorites(1, [1, 3, 2])
+    loads = mocker.spy(json, "loads")
+
+    favorites = FavoritesService.get_user_favorites(1, hydrate=True)
+
+    assert all(isinstance(favorite["movie"], RawJSON) for favorite in favorites)
+    assert [json.loads(favorite["movie"])["id"] for favorite in favorites] == [3, 2, 1]
+    assert loads.call_count == 3
+
+
+def test_add_user_favorite_captures_the_snapshot_in_the_background():
+    """Test that adding a favorite does not wait on the movie lookup and duplicates make none."""
+    repository = InMemoryFavoritesRepository()
+    FavoritesService.initialize(SlowMovieService(slow_ids={1}), repository=repository, deadline=5)
+
+    start = time.monotonic()
+    favorite = FavoritesService.add_user_favorite(1, 1)
+    duplicate = FavoritesService.add_user_favorite(1, 1)
+    elapsed = time.monotonic() - start
+    wait_for_snapshots()
+
+    assert elapsed < 0.5
+    assert favorite.movie_id == 1
+    assert duplicate is None
+    assert repository.list_by_user(1)[0].movie.title == "Movie 1"
+    assert FavoritesService.snapshot_stats()["fetched"] >= 1
+
+
+@pytest.mark.parametrize("pool", ["shut_down", "missing"])
+def test_snapshot_work_is_skipped_without_a_running_snapshot_pool(pool):
+    """Test that adds and listings succeed without a snapshot pool and leave no user marked refreshing."""
+    repository = InMemoryFavoritesRepository()
+    FavoritesService.initialize(
+        SlowMovieService(delay=0), repository=repository, deadline=5, snapshot_max_age=60
+    )
+    captured_at = datetime.now(timezone.utc) - timedelta(seconds=61)
+    repository.add(1, 1, movie=MovieSnapshot(1, "Old title", "2000-01-01", None, None, captured_at))
+    FavoritesService._refresh_executor.shutdown(wait=True)
+    if pool == "missing":
+        FavoritesService._refresh_executor = None
+
+    assert FavoritesService.add_user_favorite(1, 2).movie_id == 2
+    favorites = FavoritesService.get_user_favorites(1)
+
+    assert [favorite["movie"]["title"] for favorite in favorites] == ["Movie 2", "Old title"]
+    assert FavoritesService.snapshot_stats()["refreshing"] == 0
+    FavoritesService._refresh_executor = None
+    FavoritesService.initialize(FavoritesService._movie_service)
+    assert FavoritesService._refresh_snapshots(1, [1])
+    wait_for_snapshots()
+    assert repository.list_by_user(1)[0].movie.title == "Movie 1"
+
+
+def test_stale_snapshots_are_refreshed_in_the_background():
+    """Test that old snapshots are served as they are and replaced by a background refresh."""
+    repository = InMemoryFavoritesRepository()
+    FavoritesService.initialize(
+        SlowMovieService(delay=0), repository=repository, deadline=5, snapshot_max_age=60
+    )
+    captured_at = datetime.now(timezone.utc) - timedelta(seconds=61)
+    repository.add(1, 1, movie=MovieSnapshot(1, "Old title", "2000-01-01", None, None, captured_at))
+
+    favorites = FavoritesService.get_user_favorites(1)
+    deadline = time.monotonic() + 5
+    while repository.list_by_user(1)[0].movie.title == "Old title" and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert favorites[0]["movie"]["title"] == "Old title"
+    assert repository.list_by_user(1)[0].movie.title == "Movie 1"
+    assert FavoritesService.snapshot_stats()["refreshed"] >= 1
@@ -5,6 +5,9 @@ from unittest.mock import MagicMock
 import pytest
 
 from app.application.services.movie_service import MovieService
+from app.domain.exceptions import InvalidFieldsError
+from app.domain.ports.movie_repository import VersionedResult
+from app.infrastructure.cache.memory_cache import MemoryCache
 
 
 @pytest.fixture
@@ -50,3 +53,76 @@ def test_get_movie_details():
 
     assert result == expected_movie
     mock_repository.get_movie_details.assert_called_once_with(movie_id=123)
+
+
+def test_get_movie_details_many(service, mock_repository):
+    """Test getting details for several movies."""
+    mock_repository.get_movie_details_many.return_value = {1: {"id": 1}}
+
+    result = service.get_movie_details_many([1, 2])
+
+    assert result == {1: {"id": 1}}
+    mock_repository.get_movie_details_many.assert_called_once_with(movie_ids=[1, 2])
+
+
+def test_get_movie_details_raw(service, mock_repository):
+    """Test getting movie details as encoded JSON."""
+    mock_repository.get_movie_details_raw.return_value = b'{"id": 1}'
+
+    assert service.get_movie_details_raw(movie_id=1) == b'{"id": 1}'
+    mock_repository.get_movie_details_raw.assert_called_once_with(movie_id=1)
+
+
+def test_parse_fields_validates_against_whitelist():
+    """Test that fields are parsed into a set and unknown or empty selections are rejected."""
+    assert MovieService.parse_fields(None) is None
+    assert MovieService.parse_fields(" id, title ,id") == frozenset({"id", "title"})
+
+    with pytest.raises(InvalidFieldsError, match="Unknown fields: credits, secret"):
+        MovieService.parse_fields("id,secret,credits")
+    with pytest.raises(InvalidFieldsError):
+        MovieService.parse_fields(" , ")
+
+
+def test_get_movie_details_projects_fields(service, mock_repository):
+    """Test that details are trimmed to the selected fields in their original order."""
+    mock_repository.get_movie_details_versioned.return_value = VersionedResult(
+        {"id": 1, "title": "Movie", "overview": "Long text"}
+    )
+
+    result = service.get_movie_details(movie_id=1, fields=frozenset({"title", "id"}))
+
+    assert list(result.items()) == [("id", 1), ("title", "Movie")]
+    mock_repository.get_movie_details_versioned.assert_called_once_with(movie_id=1)
+
+
+def test_projections_are_cached_per_version_and_field_set(mock_repository):
+    """Test that a version is projected once per field set and a new version is projected again."""
+    service = MovieService(mock_repository, projection_cache=MemoryCache(max_entries=16))
+    fields = frozenset({"id"})
+    mock_repository.get_popular_versioned.side_effect = lambda page: VersionedResult(
+        [{"id": 1, "title": "Movie", "overview": "Long text"}], "popular:1:v1"
+    )
+
+    first = service.get_popular_movies(page=1, fields=fields)["movies"]
+    assert service.get_popular_movies(page=1, fields=fields)["movies"] is first
+    assert service.get_popular_movies(page=1, fields=frozenset({"title"}))["movies"] == [{"title": "Movie"}]
+
+    mock_repository.get_popular_versioned.side_effect = lambda page: VersionedResult(
+        [{"id": 2, "title": "Other"}], "popular:1:v2"
+    )
+    assert service.get_popular_movies(page=1, fields=fields)["movies"] == [{"id": 2}]
+    assert first == [{"id": 1}]
+
+
+def test_unversioned_values_are_projected_without_caching(mock_repository):
+    """Test that values served without a version are projected on every request and never cached."""
+    projections = MemoryCache(max_entries=16)
+    service = MovieService(mock_repository, projection_cache=projections)
+    mock_repository.get_movie_details_versioned.return_value = VersionedResult({"id": 1, "title": "Movie"})
+
+    first = service.get_movie_details(movie_id=1, fields=frozenset({"id"}))
+
+    assert service.get_movie_details(movie_id=1, fields=frozenset({"id"})) == first == {"id": 1}
+    assert service.get_movie_details(movie_id=1, fields=frozenset({"id"})) is not first
+    assert projections.stats()["size"] == 0